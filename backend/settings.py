@@ -41,6 +41,8 @@ CSRF_TRUSTED_ORIGINS   = config('CSRF_TRUSTED_ORIGINS', default='http://localhos
 SECURE_SSL_REDIRECT = config("SECURE_SSL_REDIRECT", default=True, cast=bool)
 RECAPTCHA_SITE_KEY = config('RECAPTCHA_SITE_KEY')
 RECAPTCHA_SECRET_KEY = config('RECAPTCHA_SECRET_KEY')
+# woodtech.recaptcha.FakeRecaptchaBackend skips Google, for local load tests
+RECAPTCHA_BACKEND = config('RECAPTCHA_BACKEND', default='woodtech.recaptcha.GoogleRecaptchaBackend')
 GEMINI_API_KEY = config('GEMINI_API_KEY')
 GEMINI_URL = config('GEMINI_URL')
 MAX_DAILY_TOKENS = 50000
@@ -212,6 +214,27 @@ MEDIA_URL = f"https://{AWS_S3_CUSTOM_DOMAIN}/{AWS_LOCATION}/"
 # MEDIA_ROOT = BASE_DIR / 'media'
 
 
+# Cache
+# Response caches and render locks need a cache shared by every worker process;
+# without REDIS_URL each process keeps its own local-memory cache.
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+
+
+# Catalogue snapshots (see woodtech/snapshots.py): publish static JSON copies of the
+# public magazine endpoints to storage, and optionally redirect the API to them.
+# Published by the page worker (process_page_jobs), which must share the cache (REDIS_URL);
+# a system check (woodtech/checks.py) flags a process-local cache.
+CATALOGUE_SNAPSHOTS = config('CATALOGUE_SNAPSHOTS', default=False, cast=bool)
+CATALOGUE_SNAPSHOT_REDIRECT = config('CATALOGUE_SNAPSHOT_REDIRECT', default=False, cast=bool)
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.0/topics/i18n/
 
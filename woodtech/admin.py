@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.forms import ModelForm, ValidationError
-from .models import Magazine, ContactMessage, Banner
+from .models import Magazine, MagazinePageJob, ContactMessage, Banner
 from datetime import timedelta
 from django.utils import timezone
 
@@ -33,13 +33,43 @@ class MagazineAdmin(admin.ModelAdmin):
     # Fields to display in the edit form
     fields = (
         'title', 'description', 'year', 'season', 
-        'date_uploaded', 'pdf_file', 'cover_image', 'is_published'
+        'date_uploaded', 'pdf_file', 'cover_image', 'is_published', 'page_images_status'
     )
-    list_display = ('title', 'year', 'season', 'date_uploaded', 'is_published')
+    readonly_fields = ('page_images_status',)
+    list_display = ('title', 'year', 'season', 'date_uploaded', 'is_published', 'page_images_status')
     list_editable = ('date_uploaded', 'is_published')  # Make date editable in list view
-    list_filter = ('is_published', 'year', 'season')
+    list_filter = ('is_published', 'year', 'season', 'page_images_status')
     search_fields = ('title',)
     date_hierarchy = 'date_uploaded'  # Add date-based navigation
+    actions = ['regenerate_page_images']
+
+    @admin.action(description="Regenerate page images")
+    def regenerate_page_images(self, request, queryset):
+        for magazine in queryset:
+            MagazinePageJob.enqueue(magazine, force=True)
+        self.message_user(request, f"Queued page rendering for {queryset.count()} magazine(s).")
+
+
+@admin.register(MagazinePageJob)
+class MagazinePageJobAdmin(admin.ModelAdmin):
+    list_display = ('magazine', 'status', 'render_pages', 'attempts', 'max_attempts', 'run_after', 'created_at', 'updated_at')
+    list_filter = ('status', 'render_pages')
+    readonly_fields = ('magazine', 'render_pages', 'attempts', 'locked_at', 'last_error', 'created_at', 'updated_at')
+    actions = ['retry_jobs']
+
+    def has_add_permission(self, request):
+        return False  # Jobs are created when a magazine PDF or cover changes
+
+    @admin.action(description="Retry selected jobs")
+    def retry_jobs(self, request, queryset):
+        retryable = queryset.exclude(status='running')
+        magazine_ids = set(retryable.filter(render_pages=True).values_list('magazine_id', flat=True))
+        updated = retryable.update(
+            status='queued', attempts=0, run_after=timezone.now(), last_error=''
+        )
+        for magazine_id in magazine_ids:
+            MagazinePageJob._set_magazine_status(magazine_id, 'queued')
+        self.message_user(request, f"{updated} job(s) re-queued.")
 
 
 # articles/admin.py
@@ -6,4 +6,5 @@ class WoodtechConfig(AppConfig):
     name = 'woodtech'
 
     def ready(self):
+        import woodtech.checks
         import woodtech.signals 
@@ -0,0 +1,60 @@
+"""
+System checks for settings that only go wrong once the app is deployed.
+
+The web service and the page worker (process_page_jobs) are separate
+processes, usually on separate machines, and talk to each other through the
+default cache. The worker marks the catalogue snapshot as changed there
+(see snapshots.py), and bumps the version of the cached magazine responses
+and their ETags when it stores new pages or covers (see response_cache.py).
+With a process-local cache both stay in the worker: nothing is published,
+and the web service serves the old pages until its cached responses expire.
+So both services need the same shared cache (REDIS_URL).
+
+The response-cache check is a deployment check (`check --deploy`), since a
+development server with a local cache is fine; the page worker also runs it
+when it starts.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Error, Tags, Warning, register
+
+# Backends that can't carry anything from one process to another
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+# Tag of the checks process_page_jobs runs when it starts
+PAGE_WORKER_TAG = "page_worker"
+
+
+def shared_cache():
+    """Whether the default cache is shared between processes (and so between services)."""
+    return not isinstance(caches["default"], PROCESS_LOCAL_CACHES)
+
+
+@register(Tags.caches)
+def check_snapshot_cache(app_configs, **kwargs):
+    if not getattr(settings, "CATALOGUE_SNAPSHOTS", False) or shared_cache():
+        return []
+    message = (
+        "CATALOGUE_SNAPSHOTS is set but the default cache is process-local, so changes "
+        "never reach the page worker and the catalogue snapshot is never published."
+    )
+    hint = "Set REDIS_URL for both the web service and the page worker (process_page_jobs)."
+    if getattr(settings, "CATALOGUE_SNAPSHOT_REDIRECT", False):
+        # Clients would be redirected to a snapshot that stays stale forever
+        return [Error(message, hint=hint, id="woodtech.E001")]
+    return [Warning(message, hint=hint, id="woodtech.W001")]
+
+
+@register(PAGE_WORKER_TAG, deploy=True)
+def check_response_cache(app_configs, **kwargs):
+    if shared_cache():
+        return []
+    return [Warning(
+        "The default cache is process-local, so the page worker's invalidations of cached "
+        "magazine responses never reach the web service: new pages and covers only show up "
+        "as its cached responses and ETags expire (MAGAZINE_CACHE_TIMEOUT).",
+        hint="Set REDIS_URL for both the web service and the page worker (process_page_jobs).",
+        id="woodtech.W002",
+    )]
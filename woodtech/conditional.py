@@ -0,0 +1,77 @@
+"""
+Validators for conditional GETs on the read-only API endpoints.
+
+Each endpoint gets an ETag (and Last-Modified where one exists) computed
+without the response body, so If-None-Match / If-Modified-Since requests can
+be answered with 304 before anything is serialized. The views wire these in
+with django.views.decorators.http.condition.
+
+The magazine endpoints use the response cache's version (see
+response_cache.py), which every change to a magazine bumps, so checking them
+takes no query. They send no Last-Modified: unpublishing or deleting an issue
+changes the list without any newer `updated_at` to report. The season and
+banner endpoints use their active row's `updated_at`.
+"""
+import hashlib
+from functools import lru_cache
+
+from django.utils import timezone
+from django_countries import countries
+
+from . import response_cache
+from .models import Banner, SeasonalSubmissionConfig
+
+
+def _etag(*parts):
+    return '"{}"'.format(hashlib.sha256(":".join(map(str, parts)).encode()).hexdigest()[:32])
+
+
+def _memoized(request, name, compute):
+    # etag_func and last_modified_func both need the same row; query it once per request
+    attr = f"_conditional_{name}"
+    if not hasattr(request, attr):
+        setattr(request, attr, compute())
+    return getattr(request, attr)
+
+
+def magazines_etag(request, *args, **kwargs):
+    return _etag("magazines", response_cache.validator())
+
+
+def _active_season(request):
+    return _memoized(
+        request,
+        "season",
+        lambda: SeasonalSubmissionConfig.objects.filter(is_active=True).values_list("pk", "updated_at").first(),
+    )
+
+
+def active_season_etag(request, *args, **kwargs):
+    active = _active_season(request)
+    if active is None:
+        return None
+    # is_submissions_open depends on today's date
+    return _etag("season", active[0], active[1].timestamp(), timezone.now().date())
+
+
+def active_season_last_modified(request, *args, **kwargs):
+    active = _active_season(request)
+    return active[1] if active else None
+
+
+def active_banner_etag(request, *args, **kwargs):
+    active = Banner.objects.filter(is_active=True).values_list("pk", "updated_at", "auto_deactivate_at").first()
+    if active is None:
+        return _etag("banner", None)
+    pk, updated_at, auto_deactivate_at = active
+    expired = bool(auto_deactivate_at and timezone.now() > auto_deactivate_at)
+    return _etag("banner", pk, updated_at.timestamp(), expired)
+
+
+@lru_cache(maxsize=None)
+def countries_etag_value():
+    return _etag("countries", *(f"{code}={name}" for code, name in countries))
+
+
+def countries_etag(request, *args, **kwargs):
+    return countries_etag_value()
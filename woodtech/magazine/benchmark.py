@@ -0,0 +1,112 @@
+"""
+Benchmark harness for the PDF -> page image pipeline.
+
+Builds synthetic PDFs and runs them through the same download and
+render_page_images() path as Magazine.generate_page_images(). The source PDF
+and the output go to throwaway FileSystemStorage locations that stand in for
+S3. Used by the `benchmark_page_images` command and the benchmark tests.
+
+Peak RSS (ru_maxrss) only ever grows within a process, and the process
+running a benchmark has usually just built the synthetic PDF. The command
+therefore runs every configuration through in_fresh_process(), so each one
+reports its own peak.
+"""
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from PIL import Image, ImageDraw
+
+from woodtech.magazine import rendering
+
+# Share of each page covered by photo-like (hard to compress) content
+DENSITIES = {"text": 0.0, "mixed": 0.4, "photo": 1.0}
+
+PAGE_SIZE = (1275, 1650)  # US letter at 150 dpi
+
+
+def make_synthetic_pdf(path, pages, density="mixed", page_size=PAGE_SIZE, seed=0):
+    """
+    Write a `pages`-page PDF to `path`. Pages mix text-like line blocks with
+    noisy image blocks; `density` (a DENSITIES name or a 0-1 fraction) sets how
+    much of each page is image.
+    """
+    fraction = DENSITIES.get(density, density)
+    rng = random.Random(seed)
+    width, height = page_size
+
+    def page(number):
+        image = Image.new("RGB", page_size, "white")
+        draw = ImageDraw.Draw(image)
+        photo_height = int(height * float(fraction))
+        if photo_height:
+            noise = Image.frombytes("RGB", (width // 4, photo_height // 4), rng.randbytes(width // 4 * (photo_height // 4) * 3))
+            image.paste(noise.resize((width, photo_height), Image.BILINEAR), (0, 0))
+        for top in range(photo_height + 40, height - 40, 28):
+            draw.rectangle((80, top, 80 + rng.randint(width // 2, width - 160), top + 12), fill=(40, 40, 40))
+        draw.text((width // 2, height - 30), str(number), fill="black")
+        return image
+
+    first = page(1)
+    first.save(path, "PDF", resolution=150, save_all=True, append_images=(page(n) for n in range(2, pages + 1)))
+    return path
+
+
+def run_benchmark(pdf_path, pages=1000, dpi=rendering.PAGE_IMAGE_DPI, quality=rendering.PAGE_IMAGE_QUALITY,
+                  render_threads=rendering.PAGE_RENDER_THREADS,
+                  upload_concurrency=rendering.PAGE_UPLOAD_CONCURRENCY):
+    """
+    Copy `pdf_path` in from a stand-in storage, render up to `pages` pages and
+    upload them to another one. Returns wall time, per-stage times, output
+    size and the peak RSS of the calling process.
+    """
+    root = tempfile.mkdtemp(prefix="page-bench-")
+    try:
+        source = FileSystemStorage(location=os.path.join(root, "source"))
+        output = FileSystemStorage(location=os.path.join(root, "output"), base_url="/bench/")
+        with open(pdf_path, "rb") as f:
+            name = source.save("issue.pdf", File(f))
+        workdir = os.path.join(root, "work")
+        os.makedirs(workdir)
+        local_path = os.path.join(workdir, "source.pdf")
+
+        timings = rendering.StageTimings()
+        started = time.perf_counter()
+        with timings.measure("download"):
+            rendering.fetch_pdf(name, local_path, storage=source)
+        manifest = rendering.render_page_images(
+            local_path,
+            "magazines/pages/benchmark",
+            last_page=pages,
+            storage=output,
+            dpi=dpi,
+            quality=quality,
+            render_threads=render_threads,
+            upload_concurrency=upload_concurrency,
+            timings=timings,
+        )
+        elapsed = time.perf_counter() - started
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        "pages": len(manifest),
+        "wall_time": elapsed,
+        "stages": {stage: timings.seconds[stage] for stage in ("download", "render", "encode", "upload")},
+        "output_bytes": sum(v["bytes"] for page in manifest for v in page["variants"]),
+        "peak_rss_mb": rendering.peak_rss_mb(),
+    }
+
+
+def in_fresh_process(function, *args, **kwargs):
+    """Call `function` in a newly spawned interpreter (with Django set up) and return its result."""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context, initializer=django.setup) as pool:
+        return pool.submit(function, *args, **kwargs).result()
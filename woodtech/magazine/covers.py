@@ -0,0 +1,108 @@
+"""
+Optimized cover images for magazines.
+
+Uploaded covers are often multi-megabyte PNGs, so they are not served as-is.
+Each cover is re-encoded into a few fixed widths as WebP and JPEG, with
+metadata stripped. Issues without an uploaded cover get one derived from the
+first rendered page. The result is stored in Magazine.cover_images:
+
+    {"source": "...", "variants": [
+        {"format": "webp", "url": "...", "width": 320, "height": 427, "bytes": 8120},
+        ...
+    ]}
+
+`source` names what the variants were built from (a SHA-256 of the uploaded
+file, or page 1's fingerprint), so unchanged covers are not re-encoded. The
+upload is identified by content rather than name because a replacement cover
+is stored under the same name as the one it replaces.
+
+Encoding runs in the magazine's page job (see MagazinePageJob), not in the
+request that uploaded the cover.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from woodtech.magazine import rendering
+
+COVER_IMAGE_WIDTHS = getattr(settings, "COVER_IMAGE_WIDTHS", (320, 640, 1280))
+COVER_IMAGE_FORMATS = getattr(settings, "COVER_IMAGE_FORMATS", ("webp", "jpeg"))
+COVER_IMAGE_QUALITY = getattr(settings, "COVER_IMAGE_QUALITY", 80)
+# Width of the JPEG used in emails, where WebP support is patchy
+COVER_EMAIL_WIDTH = getattr(settings, "COVER_EMAIL_WIDTH", 640)
+
+
+def build_cover_variants(source_file, base, source, storage=None,
+                         widths=None, formats=None, quality=COVER_IMAGE_QUALITY):
+    """
+    Encode the image in `source_file` into every cover width and format and store
+    them as `{base}_{digest}_{width}.{ext}`. Returns the `cover_images` value.
+    """
+    storage = storage or default_storage
+    widths = widths or COVER_IMAGE_WIDTHS
+    formats = formats or COVER_IMAGE_FORMATS
+
+    with Image.open(source_file) as original:
+        # Apply the EXIF rotation before the metadata is dropped
+        image = ImageOps.exif_transpose(original)
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+        else:
+            image = image.convert("RGB")
+
+    digest = hashlib.sha256(image.tobytes()).hexdigest()[:12]
+    # Never upscale; a cover narrower than every width is kept at its own size
+    targets = sorted({min(width, image.width) for width in widths})
+    variants = []
+    for width in targets:
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        for fmt in formats:
+            # Re-encoding from pixels carries no EXIF/ICC/XMP over
+            data = rendering.encode_image(resized, fmt, quality)
+            name = storage.save(
+                f"{base}_{digest}_{width}.{rendering.FORMAT_EXTENSIONS[fmt]}", ContentFile(data)
+            )
+            variants.append({
+                "format": fmt,
+                "url": storage.url(name),
+                "width": width,
+                "height": height,
+                "bytes": len(data),
+            })
+    return {"source": source, "variants": variants}
+
+
+def content_source(source_file):
+    """`source` for an uploaded cover: a SHA-256 of its content. The file is left rewound."""
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: source_file.read(rendering.DOWNLOAD_CHUNK_SIZE), b""):
+        digest.update(chunk)
+    source_file.seek(0)
+    return f"upload:{digest.hexdigest()}"
+
+
+def cover_url(cover_images, width=COVER_EMAIL_WIDTH, fmt="jpeg"):
+    """URL of the smallest variant at least `width` wide in `fmt` (else the widest one)."""
+    variants = [v for v in cover_variants(cover_images) if v["format"] == fmt]
+    if not variants:
+        return None
+    wide_enough = [v for v in variants if v["width"] >= width]
+    if wide_enough:
+        return min(wide_enough, key=lambda v: v["width"])["url"]
+    return max(variants, key=lambda v: v["width"])["url"]
+
+
+def cover_variants(cover_images):
+    return list((cover_images or {}).get("variants", []))
+
+
+def iter_urls(cover_images):
+    for variant in cover_variants(cover_images):
+        yield variant["url"]
@@ -0,0 +1,99 @@
+"""
+HTTP delivery of stored magazine PDFs with Range and conditional request support.
+
+PDF.js-style readers ask for the document size first, then fetch byte ranges
+as pages are viewed. Each range is streamed straight from storage (a ranged
+GET on S3), so neither the server nor the reader has to download the whole
+issue before showing the first page.
+"""
+import re
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+from woodtech import storage
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header, size):
+    """
+    (start, end) for a single-range `Range` header, or None to serve the whole
+    file (unsupported units, multiple ranges or a malformed header).
+    Raises RangeNotSatisfiable when the range lies outside the file.
+    """
+    match = RANGE_RE.match(header.replace(" ", ""))
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable()
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or (last and int(last) < start):
+        raise RangeNotSatisfiable()
+    return start, end
+
+
+def if_range_matches(request, etag, last_modified):
+    """Whether a Range header may be honoured given the request's If-Range validator."""
+    validator = request.META.get("HTTP_IF_RANGE")
+    if not validator:
+        return True
+    if validator.startswith(('"', 'W/"')):
+        # Strong comparison only: a weak validator never matches
+        return validator == etag and not etag.startswith("W/")
+    return parse_http_date_safe(validator) == last_modified
+
+
+def serve(request, name, filename, content_type="application/pdf", cache_control="public, max-age=300"):
+    """Response for a GET/HEAD of the stored object `name`."""
+    info = storage.stat(name)
+    last_modified = int(info.last_modified.timestamp())
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": info.etag,
+        "Last-Modified": http_date(last_modified),
+        "Cache-Control": cache_control,
+    }
+
+    conditional = get_conditional_response(request, etag=info.etag, last_modified=last_modified)
+    if conditional is not None:  # 304 Not Modified or 412 Precondition Failed
+        for header, value in headers.items():
+            conditional[header] = value
+        return conditional
+
+    start, end, status = 0, info.size - 1, 200
+    range_header = request.META.get("HTTP_RANGE")
+    if range_header and if_range_matches(request, info.etag, last_modified):
+        try:
+            byte_range = parse_range(range_header, info.size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416, headers=headers)
+            response["Content-Range"] = f"bytes */{info.size}"
+            return response
+        if byte_range:
+            start, end = byte_range
+            status = 206
+            headers["Content-Range"] = f"bytes {start}-{end}/{info.size}"
+
+    length = max(end - start + 1, 0)
+    if request.method == "HEAD" or length == 0:
+        body = []
+    else:
+        body = storage.iter_range(name, start, end)
+    response = StreamingHttpResponse(body, status=status, content_type=content_type, headers=headers)
+    response["Content-Length"] = str(length)
+    response["Content-Disposition"] = f'inline; filename="{filename}"'
+    return response
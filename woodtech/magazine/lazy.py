@@ -0,0 +1,129 @@
+"""
+On-demand rendering of single magazine pages.
+
+Background jobs only render the first PAGE_IMAGE_LIMIT pages of an issue.
+Any other page is rendered the first time a reader asks for it, uploaded,
+and merged into the magazine's manifest, so later requests just redirect
+to the stored object. Concurrent requests for the same page wait on one
+render instead of each starting their own (the lock lives in the default
+cache, so it spans workers when a shared cache is configured).
+"""
+import glob
+import hashlib
+import os
+import tempfile
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from woodtech import response_cache
+from woodtech.magazine import manifest, rendering, tiles
+
+# Local copies of recently rendered PDFs, so a run of page requests downloads the PDF once
+PAGE_RENDER_CACHE_DIR = getattr(
+    settings, "PAGE_RENDER_CACHE_DIR", os.path.join(tempfile.gettempdir(), "woodtech-pdf-cache")
+)
+PAGE_RENDER_CACHE_FILES = getattr(settings, "PAGE_RENDER_CACHE_FILES", 4)
+# Seconds a render lock is held at most, and how long other requests wait for it
+PAGE_RENDER_LOCK_TIMEOUT = getattr(settings, "PAGE_RENDER_LOCK_TIMEOUT", 120)
+PAGE_RENDER_WAIT = getattr(settings, "PAGE_RENDER_WAIT", 20)
+
+
+class PageNotFound(Exception):
+    pass
+
+
+class PageRenderBusy(Exception):
+    """Another request is rendering this page and did not finish in time."""
+
+
+def find_page(magazine, page_number):
+    for entry in manifest.page_entries(magazine.page_images):
+        if entry["page"] == page_number:
+            return entry
+    return None
+
+
+def get_or_render_page(magazine, page_number):
+    """Return the manifest entry for a page, rendering and storing it if needed."""
+    entry = find_page(magazine, page_number)
+    if entry:
+        return entry
+
+    lock_key = f"magazine-page-render:{magazine.pk}:{page_number}"
+    if cache.add(lock_key, 1, PAGE_RENDER_LOCK_TIMEOUT):
+        try:
+            # Another request may have finished between our read and taking the lock
+            magazine.refresh_from_db(fields=["page_images"])
+            return find_page(magazine, page_number) or _render_and_store(magazine, page_number)
+        finally:
+            cache.delete(lock_key)
+
+    deadline = time.monotonic() + PAGE_RENDER_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(0.25)
+        magazine.refresh_from_db(fields=["page_images"])
+        entry = find_page(magazine, page_number)
+        if entry:
+            return entry
+        if cache.get(lock_key) is None:
+            break  # the other render gave up
+    raise PageRenderBusy()
+
+
+def _render_and_store(magazine, page_number):
+    pdf_path = local_pdf(magazine)
+    with tempfile.TemporaryDirectory() as workdir:
+        entry = rendering.render_single_page(pdf_path, page_number, workdir, magazine.page_folder)
+        if entry is None:
+            raise PageNotFound()
+        if tiles.PAGE_TILES_ENABLED:
+            tiles.add_tiles(pdf_path, [entry], magazine.page_folder, workdir=workdir)
+
+    Magazine = type(magazine)
+    with transaction.atomic():
+        # Merge under a row lock so concurrent renders of different pages don't drop each other
+        current = Magazine.objects.select_for_update().only("page_images", "page_count").get(pk=magazine.pk)
+        pages = [e for e in manifest.page_entries(current.page_images) if e["page"] != page_number]
+        pages.append(entry)
+        pages.sort(key=lambda e: e["page"])
+        fields = {"page_images": pages, "updated_at": timezone.now()}
+        if current.page_count is None:
+            fields["page_count"] = rendering.get_page_count(pdf_path)
+        Magazine.objects.filter(pk=magazine.pk).update(**fields)
+    response_cache.invalidate()
+
+    for name, value in fields.items():
+        setattr(magazine, name, value)
+    return entry
+
+
+def local_pdf(magazine):
+    """Path to a local copy of the magazine's PDF, fetching it from storage on a cache miss."""
+    os.makedirs(PAGE_RENDER_CACHE_DIR, exist_ok=True)
+    key = magazine.pdf_sha256 or hashlib.sha256(magazine.pdf_file.name.encode()).hexdigest()
+    path = os.path.join(PAGE_RENDER_CACHE_DIR, f"{key}.pdf")
+
+    if os.path.exists(path):
+        os.utime(path)  # keep recently used PDFs from being evicted
+        return path
+
+    partial = f"{path}.{uuid.uuid4().hex}.part"
+    try:
+        rendering.fetch_pdf(magazine.pdf_file.name, partial)
+        os.replace(partial, path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+
+    cached = sorted(glob.glob(os.path.join(PAGE_RENDER_CACHE_DIR, "*.pdf")), key=os.path.getmtime, reverse=True)
+    for stale in cached[PAGE_RENDER_CACHE_FILES:]:
+        try:
+            os.remove(stale)
+        except FileNotFoundError:
+            pass
+    return path
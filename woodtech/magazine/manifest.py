@@ -0,0 +1,47 @@
+"""
+Helpers for the page manifest stored in Magazine.page_images.
+
+Each entry describes one rendered page and its responsive variants:
+
+    {"page": 1, "width": 1275, "height": 1650, "sha256": "...",
+     "placeholder": "data:image/webp;base64,...", "variants": [
+        {"name": "thumb", "format": "webp", "url": "...", "width": 320, "height": 414, "bytes": 10240},
+        ...
+    ]}
+
+`width`/`height` let clients reserve layout space before anything loads, and
+`placeholder` is a tiny inline image to show meanwhile. With tiling enabled
+an entry also carries a `tiles` pyramid (see tiles.py).
+`sha256` fingerprints the rendered page so unchanged pages can be reused
+when the PDF is replaced. Magazines rendered before variants existed store
+a plain list of JPEG URLs; every helper here accepts both shapes.
+"""
+from woodtech.magazine.tiles import tile_urls
+
+
+def page_entries(page_images):
+    """Return the manifest as a list of page entries, upgrading legacy URL lists."""
+    entries = []
+    for index, item in enumerate(page_images or [], start=1):
+        if isinstance(item, str):
+            item = {"page": index, "variants": [{"name": "full", "format": "jpeg", "url": item}]}
+        entries.append(item)
+    return entries
+
+
+def page_url(entry, name="full", fmt="jpeg"):
+    """URL of one variant of a page, falling back to the widest one available."""
+    variants = entry["variants"]
+    for variant in variants:
+        if variant["name"] == name and variant["format"] == fmt:
+            return variant["url"]
+    return max(variants, key=lambda v: v.get("width") or 0)["url"]
+
+
+def iter_urls(page_images):
+    """Every stored object URL referenced by the manifest."""
+    for entry in page_entries(page_images):
+        for variant in entry["variants"]:
+            yield variant["url"]
+        if entry.get("tiles"):
+            yield from tile_urls(entry["tiles"])
@@ -0,0 +1,290 @@
+"""
+Streaming PDF -> page image pipeline used by Magazine.generate_page_images().
+
+The PDF is streamed from storage to disk in chunks. pdftoppm then renders a
+small window of pages at a time into temporary files, split across
+PAGE_RENDER_THREADS pdftoppm processes. Rendered pages are handed to a bounded thread pool that
+encodes and uploads them while the next window renders; results are put back
+in page order at the end. Only a fixed number of pages is ever in flight, so
+peak memory stays roughly constant no matter how many pages the issue has.
+
+Every page is stored in several widths (PAGE_IMAGE_VARIANTS) and formats
+(PAGE_IMAGE_FORMATS); the result is the manifest described in manifest.py.
+
+Rendered pages are fingerprinted (raw pixels + render settings). When a
+previous manifest is passed in, pages whose fingerprint is unchanged are
+reused as-is, and only changed pages are encoded and uploaded. Object names
+embed the fingerprint, so a changed page never overwrites a cached one.
+"""
+import base64
+import hashlib
+import logging
+import os
+import resource
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from pdf2image import convert_from_path, pdfinfo_from_path
+from PIL import Image
+
+from woodtech.storage import iter_object
+
+logger = logging.getLogger(__name__)
+
+PAGE_IMAGE_DPI = getattr(settings, "PAGE_IMAGE_DPI", 150)
+PAGE_IMAGE_QUALITY = getattr(settings, "PAGE_IMAGE_QUALITY", 75)
+# Variant name -> target width in pixels (None keeps the rendered width)
+PAGE_IMAGE_VARIANTS = getattr(settings, "PAGE_IMAGE_VARIANTS", {"thumb": 320, "medium": 960, "full": None})
+PAGE_IMAGE_FORMATS = getattr(settings, "PAGE_IMAGE_FORMATS", ("webp", "jpeg"))
+# Tiny inline preview per page (a data: URI), shown while the real image loads
+PAGE_PLACEHOLDER_WIDTH = getattr(settings, "PAGE_PLACEHOLDER_WIDTH", 16)
+PAGE_PLACEHOLDER_FORMAT = getattr(settings, "PAGE_PLACEHOLDER_FORMAT", "webp")
+PAGE_PLACEHOLDER_QUALITY = getattr(settings, "PAGE_PLACEHOLDER_QUALITY", 30)
+# Pages rendered per pdftoppm batch (at least one per render thread)
+PAGE_RENDER_WINDOW = getattr(settings, "PAGE_RENDER_WINDOW", 4)
+# Parallel pdftoppm processes per batch
+PAGE_RENDER_THREADS = getattr(settings, "PAGE_RENDER_THREADS", min(4, os.cpu_count() or 1))
+# Threads encoding and uploading pages to storage
+PAGE_UPLOAD_CONCURRENCY = getattr(settings, "PAGE_UPLOAD_CONCURRENCY", 4)
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+FORMAT_EXTENSIONS = {"jpeg": "jpg", "webp": "webp"}
+
+
+class StageTimings:
+    """
+    Seconds spent per pipeline stage (download, render, encode, upload).
+    Encode and upload run on several threads at once, so their totals are
+    thread-seconds and can exceed the wall time.
+    """
+
+    def __init__(self):
+        self.seconds = defaultdict(float)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.seconds[stage] += elapsed
+
+
+def fetch_pdf(name, path, storage=None):
+    """Stream the PDF stored as `name` into `path` chunk by chunk and return its SHA-256."""
+    return write_chunks(iter_object(name, storage, DOWNLOAD_CHUNK_SIZE), path)
+
+
+def write_chunks(chunks, path):
+    digest = hashlib.sha256()
+    with open(path, "wb") as out:
+        for chunk in chunks:
+            digest.update(chunk)
+            out.write(chunk)
+    return digest.hexdigest()
+
+
+def render_signature(dpi, quality):
+    """Settings that change the encoded output; part of every page fingerprint."""
+    return f"{dpi}:{quality}:{sorted(PAGE_IMAGE_VARIANTS.items(), key=str)}:{list(PAGE_IMAGE_FORMATS)}"
+
+
+def fingerprint_file(path, signature):
+    digest = hashlib.sha256(signature.encode())
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_page_count(pdf_path):
+    return int(pdfinfo_from_path(pdf_path)["Pages"])
+
+
+def iter_page_files(pdf_path, workdir, last_page, dpi=PAGE_IMAGE_DPI, window=PAGE_RENDER_WINDOW, thread_count=1):
+    """
+    Yield (page_number, path) for pages 1..last_page, rendered by pdftoppm into
+    `workdir` one window at a time. The caller owns each yielded file and must
+    remove it once the page has been processed.
+    """
+    for first in range(1, last_page + 1, window):
+        last = min(first + window - 1, last_page)
+        paths = convert_from_path(
+            pdf_path,
+            dpi=dpi,
+            first_page=first,
+            last_page=last,
+            output_folder=workdir,
+            fmt="ppm",
+            paths_only=True,
+            thread_count=thread_count,
+        )
+        yield from enumerate(paths, start=first)
+
+
+def encode_image(image, fmt, quality=PAGE_IMAGE_QUALITY):
+    buffer = BytesIO()
+    if fmt == "webp":
+        image.save(buffer, format="WEBP", quality=quality, method=4)
+    else:
+        image.save(buffer, format="JPEG", quality=quality, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def make_placeholder(path, width=PAGE_PLACEHOLDER_WIDTH, fmt=PAGE_PLACEHOLDER_FORMAT):
+    """A few-hundred-byte data: URI of the page, for blurred placeholders (LQIP)."""
+    with Image.open(path) as page:
+        page.draft("RGB", (width, width))  # lets JPEG sources decode at reduced size
+        page = page.convert("RGB")
+        height = max(1, round(page.height * width / page.width))
+        data = encode_image(page.resize((width, height), Image.BILINEAR), fmt, PAGE_PLACEHOLDER_QUALITY)
+    return f"data:image/{fmt};base64,{base64.b64encode(data).decode('ascii')}"
+
+
+def encode_variants(path, quality=PAGE_IMAGE_QUALITY, variants=None, formats=None):
+    """
+    Encode a rendered page file into every configured width and format.
+    Returns (width, height, [(name, fmt, width, height, bytes), ...]).
+    """
+    variants = variants or PAGE_IMAGE_VARIANTS
+    formats = formats or PAGE_IMAGE_FORMATS
+    encoded = []
+    with Image.open(path) as page:
+        page = page.convert("RGB")
+        full_width, full_height = page.size
+        for name, width in variants.items():
+            if width and width < full_width:
+                height = max(1, round(full_height * width / full_width))
+                image = page.resize((width, height), Image.LANCZOS)
+            else:
+                image = page
+            for fmt in formats:
+                encoded.append((name, fmt, image.width, image.height, encode_image(image, fmt, quality)))
+    return full_width, full_height, encoded
+
+
+def store_page(path, page_number, folder, storage, signature, quality=PAGE_IMAGE_QUALITY, previous_entry=None,
+               timings=None):
+    """
+    Fingerprint, encode and upload one rendered page file, then remove it.
+    Returns `previous_entry` untouched if the fingerprint matches, otherwise a new manifest entry.
+    """
+    timings = timings or StageTimings()
+    try:
+        with timings.measure("encode"):
+            sha256 = fingerprint_file(path, signature)
+            if previous_entry and previous_entry.get("sha256") == sha256:
+                if previous_entry.get("placeholder"):
+                    return previous_entry
+                # Rendered before placeholders existed: add one without re-uploading
+                return {**previous_entry, "placeholder": make_placeholder(path)}
+            width, height, encoded = encode_variants(path, quality=quality)
+            placeholder = make_placeholder(path)
+    finally:
+        os.remove(path)
+
+    entry = {
+        "page": page_number, "width": width, "height": height, "sha256": sha256,
+        "placeholder": placeholder, "variants": [],
+    }
+    for name, fmt, variant_width, variant_height, data in encoded:
+        with timings.measure("upload"):
+            filename = storage.save(
+                f"{folder}/page_{page_number}_{sha256[:12]}_{name}.{FORMAT_EXTENSIONS[fmt]}", ContentFile(data)
+            )
+        entry["variants"].append({
+            "name": name,
+            "format": fmt,
+            "url": storage.url(filename),
+            "width": variant_width,
+            "height": variant_height,
+            "bytes": len(data),
+        })
+    return entry
+
+
+def render_single_page(pdf_path, page_number, workdir, folder, storage=None, dpi=PAGE_IMAGE_DPI, quality=PAGE_IMAGE_QUALITY):
+    """Render and upload one page. Returns its manifest entry, or None if the PDF has no such page."""
+    paths = convert_from_path(
+        pdf_path,
+        dpi=dpi,
+        first_page=page_number,
+        last_page=page_number,
+        output_folder=workdir,
+        fmt="ppm",
+        paths_only=True,
+    )
+    if not paths:
+        return None
+    return store_page(paths[0], page_number, folder, storage or default_storage, render_signature(dpi, quality), quality)
+
+
+def render_page_images(
+    pdf_path,
+    folder,
+    last_page,
+    storage=None,
+    dpi=PAGE_IMAGE_DPI,
+    quality=PAGE_IMAGE_QUALITY,
+    render_threads=PAGE_RENDER_THREADS,
+    upload_concurrency=PAGE_UPLOAD_CONCURRENCY,
+    previous=None,
+    timings=None,
+):
+    """
+    Render pages 1..last_page of a local PDF and upload every variant under `folder`.
+    `previous` is the current manifest; its entries are reused for pages whose
+    fingerprint has not changed. Pass a StageTimings to collect per-stage times.
+    Returns the new manifest in page order.
+    """
+    storage = storage or default_storage
+    timings = timings or StageTimings()
+    workdir = os.path.dirname(pdf_path)
+    last_page = min(last_page, get_page_count(pdf_path))
+    window = max(PAGE_RENDER_WINDOW, render_threads)
+    signature = render_signature(dpi, quality)
+    previous_by_page = {entry["page"]: entry for entry in previous or [] if entry.get("sha256")}
+
+    def process(page_number, path):
+        return page_number, store_page(
+            path, page_number, folder, storage, signature, quality, previous_by_page.get(page_number), timings
+        )
+
+    pages = {}
+    with ThreadPoolExecutor(max_workers=upload_concurrency, thread_name_prefix="page-upload") as pool:
+        pending = set()
+        rendered = iter_page_files(pdf_path, workdir, last_page, dpi=dpi, window=window, thread_count=render_threads)
+        while True:
+            with timings.measure("render"):
+                page = next(rendered, None)
+            if page is None:
+                break
+            page_number, path = page
+            pending.add(pool.submit(process, page_number, path))
+            # Keep the number of rendered-but-not-uploaded pages bounded
+            if len(pending) >= upload_concurrency * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                pages.update(future.result() for future in done)
+        pages.update(future.result() for future in wait(pending).done)
+
+    logger.info("Rendered %s page(s) into %s, peak RSS %.1f MB", len(pages), folder, peak_rss_mb())
+    return [pages[n] for n in sorted(pages)]
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process and its pdftoppm children, in MB."""
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is reported in kilobytes on Linux
+    return max(own, children) / 1024
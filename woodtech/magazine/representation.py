@@ -0,0 +1,122 @@
+"""
+Fast path for the read-only magazine API representation.
+
+MagazineSerializer spends most of a list response in DRF's per-field
+machinery and in request.build_absolute_uri, which is called for every
+variant of every page. The functions here build the same dicts from
+QuerySet.values() rows, and absolute_url_builder() turns storage URLs into
+absolute ones with a single string join when that gives the same result
+as build_absolute_uri (it falls back to it otherwise).
+
+The output must stay identical to MagazineSerializer's: the test suite
+renders both and compares the bytes. MagazineSerializer remains the
+reference implementation (and handles writes); change both together.
+"""
+import re
+
+from django.utils import timezone
+
+from woodtech.magazine import covers, manifest
+
+# Characters django.utils.encoding.iri_to_uri leaves untouched, so a URL made of
+# only these comes out of build_absolute_uri unchanged apart from the host prefix
+_URI_CHARS = r"[A-Za-z0-9\-._~/#%\[\]=:;$&()+,!?*@']*"
+ROOT_RELATIVE_URL_RE = re.compile(rf"^/(?!/){_URI_CHARS}$")
+ABSOLUTE_URL_RE = re.compile(rf"^https?://[^/?#]+{_URI_CHARS}$")
+
+# Serializer field -> the model columns it is built from
+FIELD_COLUMNS = {
+    "id": ["id"],
+    "title": ["title"],
+    "publish_date": ["date_uploaded"],
+    "year": ["year"],
+    "season": ["season"],
+    "season_display": ["season"],
+    "pdf_file": ["pdf_file"],
+    "cover_image": ["cover_image"],
+    "cover_images": ["cover_images"],
+    "description": ["description"],
+    "is_published": ["is_published"],
+    "page_images": ["page_images"],
+    "pages": ["page_images"],
+    "page_count": ["page_count"],
+    "page_images_status": ["page_images_status"],
+}
+
+
+def absolute_url_builder(request):
+    """A function equivalent to request.build_absolute_uri for stored media URLs, but cheaper."""
+    host = request.build_absolute_uri("/")[:-1]
+
+    def absolute_url(url):
+        if ROOT_RELATIVE_URL_RE.match(url) and "/./" not in url and "/../" not in url:
+            return host + url
+        if ABSOLUTE_URL_RE.match(url):
+            return url
+        return request.build_absolute_uri(url)
+
+    return absolute_url
+
+
+def columns(fields):
+    """Model columns to select with values() to represent `fields`."""
+    return list(dict.fromkeys(column for field in fields for column in FIELD_COLUMNS[field]))
+
+
+def _file_url(name, field, absolute_url):
+    # Same as DRF's FileField: None for an empty file, otherwise an absolute URL
+    if not name:
+        return None
+    return absolute_url(field.storage.url(name))
+
+
+def _pages(page_images, absolute_url):
+    pages = []
+    for entry in manifest.page_entries(page_images):
+        pages.append({
+            "width": None,
+            "height": None,
+            "placeholder": None,
+            **entry,
+            "variants": [{**variant, "url": absolute_url(variant["url"])} for variant in entry["variants"]],
+        })
+    return pages
+
+
+def represent(rows, request, fields, model):
+    """
+    Representations of magazines given as values() rows holding `columns(fields)`,
+    in the shape MagazineSerializer(fields=fields) produces.
+    """
+    absolute_url = absolute_url_builder(request)
+    pdf_field = model._meta.get_field("pdf_file")
+    cover_field = model._meta.get_field("cover_image")
+    season_labels = {str(value): str(label) for value, label in model.SEASON_CHOICES}
+    current_timezone = timezone.get_current_timezone()
+
+    builders = {
+        "id": lambda row: row["id"],
+        "title": lambda row: row["title"],
+        "publish_date": lambda row: (
+            row["date_uploaded"].astimezone(current_timezone).strftime("%Y-%m-%d")
+            if row["date_uploaded"] is not None else None
+        ),
+        "year": lambda row: row["year"],
+        "season": lambda row: row["season"],
+        "season_display": lambda row: season_labels.get(row["season"], row["season"]),
+        "pdf_file": lambda row: _file_url(row["pdf_file"], pdf_field, absolute_url),
+        "cover_image": lambda row: _file_url(row["cover_image"], cover_field, absolute_url),
+        "cover_images": lambda row: [
+            {**variant, "url": absolute_url(variant["url"])} for variant in covers.cover_variants(row["cover_images"])
+        ],
+        "description": lambda row: row["description"],
+        "is_published": lambda row: row["is_published"],
+        "page_images": lambda row: [
+            absolute_url(manifest.page_url(entry)) for entry in manifest.page_entries(row["page_images"])
+        ],
+        "pages": lambda row: _pages(row["page_images"], absolute_url),
+        "page_count": lambda row: row["page_count"],
+        "page_images_status": lambda row: row["page_images_status"],
+    }
+    selected = [(field, builders[field]) for field in fields]
+    return [{field: build(row) for field, build in selected} for row in rows]
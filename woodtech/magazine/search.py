@@ -0,0 +1,152 @@
+"""
+Full-text search over the text of magazine pages.
+
+Page text is extracted with poppler's pdftotext while an issue is ingested and
+stored one row per page in MagazinePageText. The database does the indexing:
+PostgreSQL through a generated tsvector column with a GIN index, and SQLite
+(local development) through an FTS5 table. Other backends fall back to a
+case-insensitive substring scan.
+"""
+import logging
+import re
+import subprocess
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils.html import escape
+
+logger = logging.getLogger(__name__)
+
+PAGE_TEXT_TIMEOUT = getattr(settings, "PAGE_TEXT_TIMEOUT", 120)
+SEARCH_MAX_RESULTS = getattr(settings, "SEARCH_MAX_RESULTS", 50)
+SEARCH_SNIPPET_WORDS = getattr(settings, "SEARCH_SNIPPET_WORDS", 24)
+
+TABLE = "woodtech_magazinepagetext"
+FTS_TABLE = "woodtech_magazinepagetext_fts"
+HIGHLIGHT_START, HIGHLIGHT_STOP = "<mark>", "</mark>"
+
+
+def extract_page_texts(pdf_path):
+    """Text of every page of a local PDF, in page order."""
+    result = subprocess.run(
+        ["pdftotext", "-enc", "UTF-8", pdf_path, "-"],
+        capture_output=True,
+        check=True,
+        timeout=PAGE_TEXT_TIMEOUT,
+    )
+    # pdftotext ends every page with a form feed
+    pages = result.stdout.decode("utf-8", errors="replace").split("\f")
+    if pages and not pages[-1].strip():
+        pages.pop()
+    return [" ".join(page.split()) for page in pages]
+
+
+def index_pages(magazine, texts):
+    """Replace the magazine's indexed page text."""
+    from woodtech.models import MagazinePageText
+
+    with transaction.atomic():
+        MagazinePageText.objects.filter(magazine=magazine).delete()
+        MagazinePageText.objects.bulk_create(
+            MagazinePageText(magazine=magazine, page=number, text=text)
+            for number, text in enumerate(texts, start=1)
+            if text
+        )
+
+
+def index_pdf(magazine, pdf_path):
+    """Extract and index the text of a local PDF. Failures are logged, not raised."""
+    try:
+        texts = extract_page_texts(pdf_path)
+    except (OSError, subprocess.SubprocessError):
+        logger.exception("Text extraction failed for %s", magazine)
+        return
+    index_pages(magazine, texts)
+
+
+def search(query, limit=SEARCH_MAX_RESULTS):
+    """
+    Page hits for `query` in published issues, best match first.
+    Returns dicts with magazine_id, page and an HTML snippet (matches wrapped in <mark>).
+    """
+    if not re.search(r"\w", query):
+        return []
+    backend = {"postgresql": _search_postgres, "sqlite": _search_sqlite}.get(connection.vendor, _search_fallback)
+    return backend(query, limit)
+
+
+def _search_postgres(query, limit):
+    options = (
+        f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, "
+        f"MaxWords={SEARCH_SNIPPET_WORDS}, MinWords={SEARCH_SNIPPET_WORDS // 2}"
+    )
+    # Rank via the GIN index first, then build snippets for the top rows only
+    sql = f"""
+        SELECT hit.magazine_id, hit.page, ts_headline('english', hit.text, hit.query, %s)
+        FROM (
+            SELECT t.magazine_id, t.page, t.text, q.query, ts_rank(t.search_vector, q.query) AS rank
+            FROM {TABLE} t
+            JOIN woodtech_magazine m ON m.id = t.magazine_id,
+                 websearch_to_tsquery('english', %s) AS q(query)
+            WHERE m.is_published AND t.search_vector @@ q.query
+            ORDER BY rank DESC, t.magazine_id DESC, t.page
+            LIMIT %s
+        ) hit
+        ORDER BY hit.rank DESC, hit.magazine_id DESC, hit.page
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [options, query, limit])
+        rows = cursor.fetchall()
+    # ts_headline returns raw document text; escape it around our markers
+    return [
+        {"magazine_id": magazine_id, "page": page, "snippet": _escape_snippet(snippet)}
+        for magazine_id, page, snippet in rows
+    ]
+
+
+def _search_sqlite(query, limit):
+    # Quote every term so user input can't be read as FTS5 syntax
+    match = " ".join('"{}"'.format(term.replace('"', '""')) for term in re.findall(r"\w+", query))
+    sql = f"""
+        SELECT t.magazine_id, t.page,
+               snippet({FTS_TABLE}, 0, %s, %s, '…', %s)
+        FROM {FTS_TABLE}
+        JOIN {TABLE} t ON t.id = {FTS_TABLE}.rowid
+        JOIN woodtech_magazine m ON m.id = t.magazine_id
+        WHERE {FTS_TABLE} MATCH %s AND m.is_published
+        ORDER BY bm25({FTS_TABLE}), t.magazine_id DESC, t.page
+        LIMIT %s
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [HIGHLIGHT_START, HIGHLIGHT_STOP, min(SEARCH_SNIPPET_WORDS, 64), match, limit])
+        rows = cursor.fetchall()
+    return [
+        {"magazine_id": magazine_id, "page": page, "snippet": _escape_snippet(snippet)}
+        for magazine_id, page, snippet in rows
+    ]
+
+
+def _search_fallback(query, limit):
+    from woodtech.models import MagazinePageText
+
+    rows = (
+        MagazinePageText.objects.filter(magazine__is_published=True, text__icontains=query)
+        .order_by("-magazine_id", "page")
+        .values_list("magazine_id", "page", "text")[:limit]
+    )
+    hits = []
+    for magazine_id, page, text in rows:
+        start = text.lower().find(query.lower())
+        words_before = text[:start].split()[-(SEARCH_SNIPPET_WORDS // 2):]
+        words_after = text[start + len(query):].split()[:SEARCH_SNIPPET_WORDS // 2]
+        snippet = " ".join(
+            [*words_before, f"{HIGHLIGHT_START}{text[start:start + len(query)]}{HIGHLIGHT_STOP}", *words_after]
+        )
+        hits.append({"magazine_id": magazine_id, "page": page, "snippet": _escape_snippet(snippet)})
+    return hits
+
+
+def _escape_snippet(snippet):
+    """HTML-escape a snippet while keeping the highlight markers."""
+    parts = re.split(f"({re.escape(HIGHLIGHT_START)}|{re.escape(HIGHLIGHT_STOP)})", snippet)
+    return "".join(part if part in (HIGHLIGHT_START, HIGHLIGHT_STOP) else escape(part) for part in parts)
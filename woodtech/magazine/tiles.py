@@ -0,0 +1,142 @@
+"""
+Deep-zoom (DZI-style) tile pyramids for magazine pages.
+
+When PAGE_TILES_ENABLED is on, each page is rendered once more at
+PAGE_TILE_DPI and cut into PAGE_TILE_SIZE tiles for every zoom level, so a
+zoomed-in reader only downloads the tiles in view. Tiles are stored under
+
+    magazines/pages/<year>_<season>/tiles/page_<n>_<fingerprint>/<level>/<col>_<row>.jpg
+
+Level L is the page scaled by 2 ** (L - max_level); the top level is full
+resolution and level 0 is a single pixel, as in the Deep Zoom format. The
+layout is fully determined by the page size, so the manifest only stores the
+dimensions and the base URL, and tile names are derived from them.
+"""
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from pdf2image import convert_from_path
+from PIL import Image
+
+from woodtech.magazine import rendering
+
+PAGE_TILES_ENABLED = getattr(settings, "PAGE_TILES_ENABLED", False)
+PAGE_TILE_DPI = getattr(settings, "PAGE_TILE_DPI", 300)
+PAGE_TILE_SIZE = getattr(settings, "PAGE_TILE_SIZE", 256)
+PAGE_TILE_OVERLAP = getattr(settings, "PAGE_TILE_OVERLAP", 1)
+PAGE_TILE_QUALITY = getattr(settings, "PAGE_TILE_QUALITY", 80)
+
+
+def pyramid_levels(width, height, tile_size=PAGE_TILE_SIZE):
+    """Dimensions and tile grid of every level, from level 0 (1x1) to full size."""
+    max_level = math.ceil(math.log2(max(width, height, 1)))
+    levels = []
+    for level in range(max_level + 1):
+        scale = 2 ** (max_level - level)
+        level_width = max(1, math.ceil(width / scale))
+        level_height = max(1, math.ceil(height / scale))
+        levels.append({
+            "level": level,
+            "width": level_width,
+            "height": level_height,
+            "columns": math.ceil(level_width / tile_size),
+            "rows": math.ceil(level_height / tile_size),
+        })
+    return levels
+
+
+def tile_box(column, row, level_width, level_height, tile_size, overlap):
+    left = column * tile_size - (overlap if column else 0)
+    top = row * tile_size - (overlap if row else 0)
+    right = min((column + 1) * tile_size + overlap, level_width)
+    bottom = min((row + 1) * tile_size + overlap, level_height)
+    return left, top, right, bottom
+
+
+def tile_urls(tiles):
+    """Every tile URL of a pyramid described by a manifest `tiles` entry."""
+    for level in pyramid_levels(tiles["width"], tiles["height"], tiles["tile_size"]):
+        for column in range(level["columns"]):
+            for row in range(level["rows"]):
+                yield f"{tiles['url']}/{level['level']}/{column}_{row}.jpg"
+
+
+def build_tiles(path, base, storage=None, tile_size=PAGE_TILE_SIZE, overlap=PAGE_TILE_OVERLAP):
+    """
+    Cut the page image at `path` into a tile pyramid stored under `base`.
+    Returns the manifest `tiles` entry.
+    """
+    storage = storage or default_storage
+    with Image.open(path) as page:
+        image = page.convert("RGB")
+    width, height = image.size
+    levels = pyramid_levels(width, height, tile_size)
+
+    def upload(name, tile):
+        storage.save(f"{base}/{name}", ContentFile(rendering.encode_image(tile, "jpeg", PAGE_TILE_QUALITY)))
+
+    with ThreadPoolExecutor(max_workers=rendering.PAGE_UPLOAD_CONCURRENCY, thread_name_prefix="page-tiles") as pool:
+        futures = []
+        # Walk from full resolution down, halving the previous level each time
+        for level in reversed(levels):
+            if (image.width, image.height) != (level["width"], level["height"]):
+                image = image.resize((level["width"], level["height"]), Image.LANCZOS)
+            for column in range(level["columns"]):
+                for row in range(level["rows"]):
+                    box = tile_box(column, row, level["width"], level["height"], tile_size, overlap)
+                    futures.append(pool.submit(upload, f"{level['level']}/{column}_{row}.jpg", image.crop(box)))
+            # Surface upload errors level by level instead of queueing the whole pyramid
+            for future in futures:
+                future.result()
+            futures = []
+
+    return {
+        "url": storage.url(base).rstrip("/"),
+        "width": width,
+        "height": height,
+        "tile_size": tile_size,
+        "overlap": overlap,
+        "format": "jpeg",
+    }
+
+
+def add_tiles(pdf_path, pages, folder, storage=None, dpi=PAGE_TILE_DPI, workdir=None):
+    """Render a tile pyramid for every manifest entry that does not have one yet."""
+    workdir = workdir or os.path.dirname(pdf_path)
+    for entry in pages:
+        if entry.get("tiles") or not entry.get("sha256"):
+            continue
+        paths = convert_from_path(
+            pdf_path,
+            dpi=dpi,
+            first_page=entry["page"],
+            last_page=entry["page"],
+            output_folder=workdir,
+            fmt="ppm",
+            paths_only=True,
+        )
+        try:
+            base = f"{folder}/tiles/page_{entry['page']}_{entry['sha256'][:12]}"
+            entry["tiles"] = build_tiles(paths[0], base, storage)
+        finally:
+            for path in paths:
+                os.remove(path)
+    return pages
+
+
+def dzi_descriptor(tiles):
+    """The pyramid as an inline Deep Zoom tile source (e.g. for OpenSeadragon)."""
+    return {
+        "Image": {
+            "xmlns": "http://schemas.microsoft.com/deepzoom/2008",
+            "Url": f"{tiles['url']}/",
+            "Format": "jpg",
+            "Overlap": str(tiles["overlap"]),
+            "TileSize": str(tiles["tile_size"]),
+            "Size": {"Width": str(tiles["width"]), "Height": str(tiles["height"])},
+        }
+    }
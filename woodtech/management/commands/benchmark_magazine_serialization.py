@@ -0,0 +1,97 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+
+from woodtech.magazine import representation
+from woodtech.models import Magazine
+from woodtech.serializers import MagazineSerializer
+
+
+def synthetic_rows(magazines, pages):
+    """values()-style rows for `magazines` issues of `pages` pages each, with every variant filled in."""
+    rows = []
+    for index in range(magazines):
+        folder = f"/media/magazines/images/{2000 + index}_Fall"
+        rows.append({
+            "id": index + 1,
+            "title": f"Issue {index}",
+            "date_uploaded": Magazine._meta.get_field("date_uploaded").get_default(),
+            "year": 2000 + index,
+            "season": "Fall",
+            "pdf_file": f"magazines/pdfs/{2000 + index}_Fall.pdf",
+            "cover_image": "",
+            "cover_images": {"source": "page:0", "variants": [
+                {"format": fmt, "url": f"{folder}/cover_{width}.{fmt}", "width": width, "height": width * 4 // 3,
+                 "bytes": 1000}
+                for width in (320, 640, 1280) for fmt in ("webp", "jpeg")
+            ]},
+            "description": "A synthetic issue.",
+            "is_published": True,
+            "page_images": [
+                {"page": page, "width": 1275, "height": 1650, "sha256": "0" * 64, "placeholder": None, "variants": [
+                    {"name": name, "format": fmt, "url": f"{folder}/page_{page}_{name}.{fmt}", "width": width,
+                     "height": width * 1650 // 1275, "bytes": 1000}
+                    for name, width in (("thumb", 320), ("medium", 960), ("full", 1275))
+                    for fmt in ("webp", "jpeg")
+                ]}
+                for page in range(1, pages + 1)
+            ],
+            "page_count": pages,
+            "page_images_status": "done",
+        })
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Time MagazineSerializer against the values()-based fast path for the magazine list, "
+        "and check that both render the same bytes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--synthetic-magazines", type=int, default=0,
+            help="Benchmark this many synthetic issues instead of the published magazines in the database.",
+        )
+        parser.add_argument("--pages", type=int, default=48, help="Pages per synthetic issue.")
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument(
+            "--host", default=next((host.lstrip(".") for host in settings.ALLOWED_HOSTS if host != "*"), "localhost"),
+            help="Host the absolute URLs are built for (must be allowed by ALLOWED_HOSTS).",
+        )
+
+    def handle(self, *args, **options):
+        request = RequestFactory().get("/api/magazines/", HTTP_HOST=options["host"])
+        fields = MagazineSerializer.field_names()
+
+        if options["synthetic_magazines"]:
+            rows = synthetic_rows(options["synthetic_magazines"], options["pages"])
+            instances = [Magazine(**row) for row in rows]
+        else:
+            queryset = Magazine.objects.filter(is_published=True).order_by("-date_uploaded", "-id")
+            rows = list(queryset.values(*representation.columns(fields)))
+            instances = list(queryset)
+        if not rows:
+            raise CommandError("No published magazines; use --synthetic-magazines.")
+
+        def serializer():
+            return MagazineSerializer(instances, many=True, context={"request": request}).data
+
+        def fast_path():
+            return representation.represent(rows, request, fields, Magazine)
+
+        renderer = JSONRenderer()
+        if renderer.render(serializer()) != renderer.render(fast_path()):
+            raise CommandError("The fast path's output differs from MagazineSerializer's.")
+
+        timings = {}
+        for label, build in (("serializer", serializer), ("fast path", fast_path)):
+            start = time.perf_counter()
+            for _ in range(options["iterations"]):
+                build()
+            timings[label] = (time.perf_counter() - start) / options["iterations"]
+            self.stdout.write(f"{label:>10}: {timings[label] * 1000:8.2f} ms per list of {len(rows)}")
+        self.stdout.write(f"   speedup: {timings['serializer'] / timings['fast path']:.1f}x")
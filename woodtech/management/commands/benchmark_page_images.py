@@ -0,0 +1,80 @@
+import itertools
+import os
+import shutil
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+from pdf2image.exceptions import PDFInfoNotInstalledError
+
+from woodtech.magazine import benchmark, rendering
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a local or synthetic PDF through the page-image pipeline and report wall time, "
+        "per-stage time and peak RSS. Options taking several values benchmark every combination, "
+        "each in a fresh process."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("pdf_path", nargs="?", help="Path to a PDF on local disk. Omit to use a synthetic PDF.")
+        parser.add_argument("--synthetic-pages", type=int, default=24, help="Page count of the synthetic PDF.")
+        parser.add_argument(
+            "--density", default="mixed",
+            help=f"Image density of the synthetic PDF: {', '.join(benchmark.DENSITIES)} or a 0-1 fraction.",
+        )
+        parser.add_argument("--pages", type=int, default=1000, help="Maximum number of pages to render.")
+        parser.add_argument("--dpi", type=int, nargs="+", default=[rendering.PAGE_IMAGE_DPI])
+        parser.add_argument("--quality", type=int, nargs="+", default=[rendering.PAGE_IMAGE_QUALITY])
+        parser.add_argument("--render-threads", type=int, nargs="+", default=[rendering.PAGE_RENDER_THREADS])
+        parser.add_argument("--upload-concurrency", type=int, nargs="+", default=[rendering.PAGE_UPLOAD_CONCURRENCY])
+
+    def handle(self, *args, **options):
+        density = options["density"]
+        if density not in benchmark.DENSITIES:
+            try:
+                density = float(density)
+            except ValueError:
+                raise CommandError(f"Unknown density {density!r}.")
+
+        tmpdir = tempfile.mkdtemp(prefix="page-bench-pdf-")
+        try:
+            pdf_path = options["pdf_path"]
+            if pdf_path is None:
+                pdf_path = benchmark.make_synthetic_pdf(
+                    os.path.join(tmpdir, "synthetic.pdf"), options["synthetic_pages"], density
+                )
+                self.stdout.write(f"synthetic PDF: {options['synthetic_pages']} pages, density {options['density']}")
+            elif not os.path.exists(pdf_path):
+                raise CommandError(f"No such file: {pdf_path}")
+
+            combinations = itertools.product(
+                options["dpi"], options["quality"], options["render_threads"], options["upload_concurrency"]
+            )
+            for dpi, quality, render_threads, upload_concurrency in combinations:
+                result = benchmark.in_fresh_process(
+                    benchmark.run_benchmark,
+                    pdf_path,
+                    pages=options["pages"],
+                    dpi=dpi,
+                    quality=quality,
+                    render_threads=render_threads,
+                    upload_concurrency=upload_concurrency,
+                )
+                self.report(dpi, quality, render_threads, upload_concurrency, result)
+        except PDFInfoNotInstalledError:
+            raise CommandError("poppler (pdfinfo/pdftoppm) must be installed to render pages.")
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+    def report(self, dpi, quality, render_threads, upload_concurrency, result):
+        pages = max(result["pages"], 1)
+        stages = ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in result["stages"].items())
+        self.stdout.write(
+            f"dpi={dpi} quality={quality} render_threads={render_threads} upload_concurrency={upload_concurrency}"
+        )
+        self.stdout.write(f"  pages:     {result['pages']}")
+        self.stdout.write(f"  wall time: {result['wall_time']:.2f}s ({result['wall_time'] / pages:.3f}s/page)")
+        self.stdout.write(f"  stages:    {stages} (encode/upload are summed over threads)")
+        self.stdout.write(f"  output:    {result['output_bytes'] / 1024 / 1024:.1f} MB")
+        self.stdout.write(f"  peak RSS:  {result['peak_rss_mb']:.1f} MB")
@@ -0,0 +1,29 @@
+import os
+import tempfile
+
+from django.core.management.base import BaseCommand
+
+from woodtech.magazine import rendering, search
+from woodtech.models import Magazine
+
+
+class Command(BaseCommand):
+    help = "Extract and index the page text of magazines for full-text search."
+
+    def add_arguments(self, parser):
+        parser.add_argument("magazine_ids", nargs="*", type=int, help="Magazines to index (default: all missing text).")
+        parser.add_argument("--all", action="store_true", help="Re-index every magazine, even those already indexed.")
+
+    def handle(self, *args, **options):
+        magazines = Magazine.objects.exclude(pdf_file="")
+        if options["magazine_ids"]:
+            magazines = magazines.filter(pk__in=options["magazine_ids"])
+        elif not options["all"]:
+            magazines = magazines.filter(page_texts__isnull=True)
+
+        for magazine in magazines.distinct():
+            with tempfile.TemporaryDirectory() as workdir:
+                pdf_path = os.path.join(workdir, "source.pdf")
+                rendering.fetch_pdf(magazine.pdf_file.name, pdf_path)
+                search.index_pdf(magazine, pdf_path)
+            self.stdout.write(f"Indexed {magazine} ({magazine.page_texts.count()} pages with text)")
@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from woodtech import checks, snapshots
+from woodtech.models import MagazinePageJob
+
+
+class Command(BaseCommand):
+    help = (
+        "Process queued magazine page-image jobs (run as a long-lived worker). "
+        "Between jobs, publishes the catalogue snapshot if it has changed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process every runnable job, then exit instead of polling.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=5.0,
+            help="Seconds to wait between polls when the queue is empty (default: 5).",
+        )
+
+    def handle(self, *args, **options):
+        once = options["once"]
+        sleep = options["sleep"]
+        # Reports a cache the web service can't see this worker's invalidations through
+        self.check(tags=[checks.PAGE_WORKER_TAG], include_deployment_checks=True)
+
+        while True:
+            if snapshots.publish_pending():
+                self.stdout.write("Published the catalogue snapshot")
+
+            job = MagazinePageJob.claim_next()
+            if job is None:
+                if once:
+                    break
+                time.sleep(sleep)
+                continue
+
+            self.stdout.write(f"Rendering pages for {job.magazine} (attempt {job.attempts}/{job.max_attempts})")
+            if job.run():
+                self.stdout.write(self.style.SUCCESS(f"Job {job.pk} done"))
+            else:
+                self.stdout.write(self.style.ERROR(f"Job {job.pk} {job.status}: {job.last_error}"))
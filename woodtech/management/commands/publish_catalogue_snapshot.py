@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from woodtech import snapshots
+
+
+class Command(BaseCommand):
+    help = "Publish static JSON snapshots of the public catalogue to storage (see woodtech/snapshots.py)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force", action="store_true",
+            help="Rewrite the snapshot even if the catalogue hasn't changed since the last one.",
+        )
+
+    def handle(self, *args, **options):
+        version = snapshots.publish(force=options["force"])
+        self.stdout.write(self.style.SUCCESS(f"Catalogue snapshot {version} is live."))
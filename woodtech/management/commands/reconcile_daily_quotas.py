@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from woodtech.models import Article, Collaborator, ContactMessage, DailyQuota, Magazine, Subscriber
+
+# Quota scope -> the model and creation timestamp it counts
+SOURCES = {
+    "magazine": (Magazine, "date_uploaded"),
+    "article": (Article, "submitted_at"),
+    "subscriber": (Subscriber, "subscribed_at"),
+    "collaborator": (Collaborator, "submitted_at"),
+    "contact_message": (ContactMessage, "submitted_at"),
+}
+
+
+class Command(BaseCommand):
+    help = "Recount the daily creation quotas (DailyQuota) from the rows actually created."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=2, help="Number of days to recount, ending today.")
+        parser.add_argument("--prune", action="store_true", help="Delete quota rows older than the recounted days.")
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        days = [today - timedelta(days=offset) for offset in range(options["days"])]
+        for day in days:
+            start = timezone.make_aware(datetime.combine(day, datetime.min.time()))
+            for scope, (model, field) in SOURCES.items():
+                # A range rather than __date, so an index on the timestamp can be used
+                count = model.objects.filter(**{f"{field}__gte": start, f"{field}__lt": start + timedelta(days=1)}).count()
+                quota, created = DailyQuota.objects.get_or_create(scope=scope, day=day, defaults={"count": count})
+                if not created and quota.count != count:
+                    self.stdout.write(f"{scope} {day}: {quota.count} -> {count}")
+                    DailyQuota.objects.filter(pk=quota.pk).update(count=count)
+
+        if options["prune"] and days:
+            deleted, _ = DailyQuota.objects.filter(day__lt=days[-1]).delete()
+            self.stdout.write(f"Pruned {deleted} old quota rows")
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.1 on 2026-10-16 23:14
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('woodtech', '0008_article_country'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='magazine',
+            name='page_images_status',
+            field=models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='done', help_text='State of the background job rendering the page images.', max_length=10),
+        ),
+        migrations.CreateModel(
+            name='MagazinePageJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('max_attempts', models.PositiveIntegerField(default=3)),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('magazine', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='page_jobs', to='woodtech.magazine')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'run_after'], name='woodtech_ma_status_03ed61_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-16 23:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('woodtech', '0009_magazine_page_images_status_magazinepagejob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='magazine',
+            name='pdf_sha256',
+            field=models.CharField(blank=True, editable=False, help_text='SHA-256 of the PDF the page images were rendered from.', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='magazinepagejob',
+            name='force',
+            field=models.BooleanField(default=False, help_text='Re-render even if the PDF is unchanged.'),
+        ),
+    ]
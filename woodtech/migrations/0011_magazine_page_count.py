@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-16 23:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('woodtech', '0010_magazine_pdf_sha256_magazinepagejob_force'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='magazine',
+            name='page_count',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Number of pages in the PDF. Pages past PAGE_IMAGE_LIMIT are rendered on demand.', null=True),
+        ),
+    ]
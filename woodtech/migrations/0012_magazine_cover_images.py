@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-16 23:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('woodtech', '0011_magazine_page_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='magazine',
+            name='cover_images',
+            field=models.JSONField(blank=True, editable=False, help_text='Resized WebP/JPEG cover variants, from the uploaded cover or the first page.', null=True),
+        ),
+    ]
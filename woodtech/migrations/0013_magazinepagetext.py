@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-16 23:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('woodtech', '0012_magazine_cover_images'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MagazinePageText',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('page', models.PositiveIntegerField()),
+                ('text', models.TextField(blank=True)),
+                ('magazine', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='page_texts', to='woodtech.magazine')),
+            ],
+            options={
+                'ordering': ['magazine', 'page'],
+                'unique_together': {('magazine', 'page')},
+            },
+        ),
+    ]
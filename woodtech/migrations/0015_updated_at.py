@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-16 23:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('woodtech', '0014_magazinepagetext_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='magazine',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='seasonalsubmissionconfig',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-16 23:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('woodtech', '0015_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='magazine',
+            index=models.Index(fields=['is_published', '-date_uploaded', '-id'], name='magazine_published_date_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-16 23:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('woodtech', '0016_magazine_published_date_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyQuota',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=50)),
+                ('day', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('scope', 'day')},
+            },
+        ),
+    ]
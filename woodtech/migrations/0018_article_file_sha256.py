@@ -0,0 +1,22 @@
+# Generated by Django 5.2.1 on 2026-10-16 23:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('woodtech', '0017_dailyquota'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='file_sha256',
+            field=models.CharField(blank=True, editable=False, help_text='SHA-256 of the uploaded file, used to spot resubmissions of the same file', max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['email', 'file_sha256'], name='article_email_sha256_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-16 23:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('woodtech', '0018_article_file_sha256'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='magazinepagejob',
+            name='render_pages',
+            field=models.BooleanField(default=True, help_text='Off for jobs that only rebuild the cover variants.'),
+        ),
+    ]
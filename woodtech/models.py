@@ -1,13 +1,11 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils.text import slugify
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from django.conf import settings
-from pdf2image import convert_from_path
 import uuid
 from PIL import Image
 import os
-import shutil
 import calendar
 from datetime import datetime
 from django.db import models
@@ -15,41 +13,42 @@ from django.utils.text import slugify
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from django.conf import settings
-from pdf2image import convert_from_path
 from PIL import Image
 import os
-import shutil
 import tempfile
 import requests
-from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
-from io import BytesIO
-from pdf2image import convert_from_path
-import tempfile
-import requests
-import os
 from datetime import timedelta
 
 from django.conf import settings
-from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 from django.db.models.signals import pre_save, post_save
 from django.dispatch import receiver
 from django_countries.fields import CountryField
+import logging
+
+from woodtech import response_cache, snapshots, storage
+from woodtech.magazine import covers, manifest, rendering, search, tiles
 
 from threading import Thread
-from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 from django.conf import settings
 
+logger = logging.getLogger(__name__)
+
 # Adjustable daily creation limit (change as needed)
 DAILY_CREATION_LIMIT = getattr(settings, "DAILY_CREATION_LIMIT", 100)
 
 # How many pages max to convert into images:
 PAGE_IMAGE_LIMIT = getattr(settings, "PAGE_IMAGE_LIMIT", 15)
 
+# Background page rendering jobs (see MagazinePageJob)
+PAGE_JOB_MAX_ATTEMPTS = getattr(settings, "PAGE_JOB_MAX_ATTEMPTS", 3)
+PAGE_JOB_RETRY_DELAY = getattr(settings, "PAGE_JOB_RETRY_DELAY", 60)  # seconds, doubled per attempt
+PAGE_JOB_LOCK_TIMEOUT = getattr(settings, "PAGE_JOB_LOCK_TIMEOUT", 30 * 60)  # seconds before a running job is considered lost
+
 PENDING_ARTICLE_LIMIT = 5
 
 # Upload paths
@@ -86,6 +85,62 @@ def validate_image(file):
         raise ValidationError("Invalid image file.")
 
 
+JOB_STATUS_CHOICES = [
+    ("queued", "Queued"),
+    ("running", "Running"),
+    ("done", "Done"),
+    ("failed", "Failed"),
+]
+
+
+class DailyQuota(models.Model):
+    """
+    Number of objects created per scope (e.g. "article") per day, for
+    DAILY_CREATION_LIMIT. Checking a quota is one conditional UPDATE on a
+    unique (scope, day) row rather than counting the day's rows in the
+    source table. The slot is taken in the same transaction as the insert,
+    so a failed insert gives it back. Deleted rows still count for their
+    day; the reconcile_daily_quotas command recounts from what is left.
+    """
+    scope = models.CharField(max_length=50)
+    day = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("scope", "day")
+
+    def __str__(self):
+        return f"{self.scope} {self.day}: {self.count}"
+
+    @classmethod
+    def consume(cls, scope, limit=None):
+        """Count one creation in today's quota for `scope`; False (and nothing counted) if it is used up."""
+        limit = DAILY_CREATION_LIMIT if limit is None else limit
+        day = timezone.localdate()
+        cls.objects.get_or_create(scope=scope, day=day)
+        # Check and increment in one statement, so concurrent creations can't both take the last slot
+        return bool(cls.objects.filter(scope=scope, day=day, count__lt=limit).update(count=models.F("count") + 1))
+
+    @classmethod
+    def available_for(cls, instance, scope, limit=None):
+        """Whether today's quota for `scope` has room for `instance`; counts nothing. Updates always fit."""
+        if not instance._state.adding:
+            return True
+        limit = DAILY_CREATION_LIMIT if limit is None else limit
+        return not cls.objects.filter(scope=scope, day=timezone.localdate(), count__gte=limit).exists()
+
+    @classmethod
+    def consume_for(cls, instance, scope):
+        """
+        consume() for a model instance about to be inserted; updates are not
+        counted. Call it inside the transaction.atomic() block that inserts the
+        instance, so a failed insert gives the slot back.
+        """
+        if not instance._state.adding:
+            return True
+        return cls.consume(scope)
+
+
 class Magazine(models.Model):
     # Season choices
     SEASON_CHOICES = [
@@ -115,18 +170,50 @@ class Magazine(models.Model):
         blank=True, null=True,
         validators=[validate_image]
     )
+    cover_images = models.JSONField(
+        blank=True,
+        null=True,
+        editable=False,
+        help_text="Resized WebP/JPEG cover variants, from the uploaded cover or the first page."
+    )
     description = models.TextField(blank=True, null=True)
     is_published = models.BooleanField(default=False)
     page_images = models.JSONField(blank=True, null=True)
+    page_count = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        editable=False,
+        help_text="Number of pages in the PDF. Pages past PAGE_IMAGE_LIMIT are rendered on demand."
+    )
+    pdf_sha256 = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        help_text="SHA-256 of the PDF the page images were rendered from."
+    )
+    page_images_status = models.CharField(
+        max_length=10,
+        choices=JOB_STATUS_CHOICES,
+        default="done",
+        help_text="State of the background job rendering the page images."
+    )
+    # Also set by the queryset updates below, since they skip auto_now
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ("year", "season")  # Updated unique constraint
+        indexes = [
+            # Serves the published archive listing, including cursor pagination
+            models.Index(fields=["is_published", "-date_uploaded", "-id"], name="magazine_published_date_idx"),
+        ]
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        # Store original file paths to handle updates
-        self._original_pdf_file = self.pdf_file.name if self.pdf_file else None
-        self._original_cover_image = self.cover_image.name if self.cover_image else None
+        # Store original file paths to handle updates.
+        # Skip deferred fields: touching them here would reload the row (and recurse).
+        deferred = self.get_deferred_fields()
+        self._original_pdf_file = self.pdf_file.name if "pdf_file" not in deferred and self.pdf_file else None
+        self._original_cover_image = self.cover_image.name if "cover_image" not in deferred and self.cover_image else None
 
     def clean(self):
         # 1) Ensure year + season combo is unique
@@ -138,128 +225,286 @@ class Magazine(models.Model):
                 "season": "This Year and Season combination already exists."
             })
 
-        # 2) Rate limiting remains the same
-        today = timezone.now().date()
-        existing_count = Magazine.objects.filter(date_uploaded__date=today).exclude(pk=self.pk).count()
-        if existing_count >= DAILY_CREATION_LIMIT:
-            raise ValidationError(
-                f"Daily magazine creation limit reached ({DAILY_CREATION_LIMIT} per day)."
-            )
+        # 2) Rate limiting: checked here for a friendly form error, counted in save()
+        if not DailyQuota.available_for(self, "magazine"):
+            raise self._daily_limit_error()
+
+    def _daily_limit_error(self):
+        return ValidationError(
+            f"Daily magazine creation limit reached ({DAILY_CREATION_LIMIT} per day)."
+        )
 
     def save(self, *args, **kwargs):
         self.full_clean()
         
         # Check if PDF file has been updated
         pdf_updated = False
-        if self.pdf_file and self._original_pdf_file != self.pdf_file.name:
+        if self.pdf_file and (self._state.adding or self._original_pdf_file != self.pdf_file.name):
             pdf_updated = True
-            # Delete old PDF file if it exists
-            if self._original_pdf_file and default_storage.exists(self._original_pdf_file):
-                default_storage.delete(self._original_pdf_file)
+            # Delete old PDF file
+            if not self._state.adding and self._original_pdf_file:
+                storage.delete_files([self._original_pdf_file])
         
         # Check if cover image has been updated
-        if self.cover_image and self._original_cover_image != self.cover_image.name:
-            # Delete old cover image if it exists
-            if self._original_cover_image and default_storage.exists(self._original_cover_image):
-                default_storage.delete(self._original_cover_image)
+        if self._state.adding:
+            cover_updated = bool(self.cover_image)
+        else:
+            cover_updated = self._original_cover_image != (self.cover_image.name or None)
+        if self.cover_image and cover_updated:
+            # Delete old cover image
+            if not self._state.adding and self._original_cover_image:
+                storage.delete_files([self._original_cover_image])
         
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            # Counted with the insert, so a failed insert gives the slot back
+            if not DailyQuota.consume_for(self, "magazine"):
+                raise self._daily_limit_error()
+            super().save(*args, **kwargs)
         
-        # Regenerate page images if PDF was updated
+        # Regenerate page images (and the cover variants) in the background if the PDF was updated
         if pdf_updated and self.pdf_file:
-            self.generate_page_images()
+            MagazinePageJob.enqueue(self)
+        elif cover_updated:
+            MagazinePageJob.enqueue(self, render_pages=False)
 
         # Update the stored original file names
         self._original_pdf_file = self.pdf_file.name if self.pdf_file else None
         self._original_cover_image = self.cover_image.name if self.cover_image else None
 
-    def delete(self, *args, **kwargs):
-        if self.pdf_file:
-            self.pdf_file.delete(save=False)
+    @property
+    def page_folder(self):
+        return f"magazines/pages/{self.year}_{self.season}"
 
-        if self.cover_image:
-            self.cover_image.delete(save=False)
-
-        # Delete page images
-        if self.page_images:
-            for page_url in self.page_images:
-                # Extract file path from URL
-                try:
-                    # Remove domain and media URL prefix to get relative path
-                    media_url = settings.MEDIA_URL
-                    if page_url.startswith(media_url):
-                        file_path = page_url[len(media_url):]
-                        if default_storage.exists(file_path):
-                            default_storage.delete(file_path)
-                except Exception as e:
-                    print(f"Error deleting page image {page_url}: {e}")
-
-        # Updated folder naming convention
-        folder_name = f"{self.year}_{self.season}"
-        pages_folder = os.path.join(settings.MEDIA_ROOT, "magazines", "pages", folder_name)
-        if os.path.isdir(pages_folder):
-            shutil.rmtree(pages_folder)
-
-        super().delete(*args, **kwargs)
-
-    def generate_page_images(self):
-        # First, delete existing page images
-        if self.page_images:
-            for page_url in self.page_images:
-                try:
-                    media_url = settings.MEDIA_URL
-                    if page_url.startswith(media_url):
-                        file_path = page_url[len(media_url):]
-                        if default_storage.exists(file_path):
-                            default_storage.delete(file_path)
-                except Exception as e:
-                    print(f"Error deleting old page image {page_url}: {e}")
-            self.page_images = None
-            self.save(update_fields=["page_images"])
-
-        # Download PDF to a temporary file
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-            response = requests.get(self.pdf_file.url, timeout=30)
-            tmp.write(response.content)
-            tmp_path = tmp.name
-
-        # Convert only a few pages with lower DPI
-        try:
-            images = convert_from_path(
-                tmp_path,
-                dpi=150,  # lower DPI to reduce RAM/CPU
-                first_page=1,
-                last_page=PAGE_IMAGE_LIMIT
+    def generate_page_images(self, force=False):
+        """
+        Render the PDF into page images. Skipped when the PDF is byte-identical to the
+        last render (unless `force`); otherwise only pages whose content changed are
+        re-uploaded, and the old manifest stays live until the new one is saved.
+        """
+        with tempfile.TemporaryDirectory() as workdir:
+            pdf_path = os.path.join(workdir, "source.pdf")
+            pdf_sha256 = rendering.fetch_pdf(self.pdf_file.name, pdf_path)
+            if not force and self.page_images and pdf_sha256 == self.pdf_sha256:
+                logger.info("PDF for %s unchanged, keeping existing page images", self)
+                return
+
+            # Only the first pages are rendered eagerly; the rest render on first request
+            previous = manifest.page_entries(self.page_images)
+            pages = rendering.render_page_images(
+                pdf_path, self.page_folder, last_page=PAGE_IMAGE_LIMIT, previous=previous
             )
-        except Exception as e:
-            print("PDF conversion failed:", e)
+            if tiles.PAGE_TILES_ENABLED:
+                tiles.add_tiles(pdf_path, pages, self.page_folder)
+            page_count = rendering.get_page_count(pdf_path)
+            search.index_pdf(self, pdf_path)
+
+        magazines = type(self).objects
+        with transaction.atomic():
+            # Re-read under the row lock lazy.py merges under: pages may have been rendered
+            # on demand while this render ran
+            current = magazines.select_for_update().only("page_images", "pdf_sha256").get(pk=self.pk)
+            latest = manifest.page_entries(current.page_images)
+            if current.pdf_sha256 == pdf_sha256:
+                # Same PDF, so pages rendered on demand meanwhile are still good
+                rendered = {entry["page"] for entry in pages}
+                pages = sorted(pages + [e for e in latest if e["page"] not in rendered], key=lambda e: e["page"])
+            # update() rather than save(): full_clean() would read the PDF back from storage to validate it
+            fields = {"page_images": pages, "page_count": page_count, "pdf_sha256": pdf_sha256}
+            magazines.filter(pk=self.pk).update(**fields, updated_at=timezone.now())
+        for name, value in fields.items():
+            setattr(self, name, value)
+        response_cache.invalidate()
+
+        # Remove objects only the replaced manifest referenced
+        kept = set(manifest.iter_urls(pages))
+        storage.delete_urls(url for url in manifest.iter_urls(latest) if url not in kept)
+
+    def generate_cover_images(self):
+        """
+        Build the optimized cover variants from the uploaded cover, or from the first
+        rendered page when there is none. Does nothing if the source hasn't changed.
+        """
+        pages = manifest.page_entries(self.page_images)
+        source_name = source = None
+        if self.cover_image:
+            # Identified by content once opened (see covers.content_source)
+            source_name = self.cover_image.name
+        elif pages and pages[0]["page"] == 1:
+            source_name = storage.name_from_url(manifest.page_url(pages[0]))
+            source = f"page:{pages[0].get('sha256') or source_name}"
+
+        previous = self.cover_images
+        cover_images = None
+        if source_name:
+            with default_storage.open(source_name, "rb") as source_file:
+                source = source or covers.content_source(source_file)
+                if source == (previous or {}).get("source"):
+                    return
+                base = os.path.splitext(magazine_cover_upload_path(self, "cover.jpg"))[0]
+                cover_images = covers.build_cover_variants(source_file, base, source)
+        elif previous is None:
             return
 
-        # Folder structure
-        folder_name = f"magazines/pages/{self.year}_{self.season}"
-        page_urls = []
+        type(self).objects.filter(pk=self.pk).update(cover_images=cover_images, updated_at=timezone.now())
+        self.cover_images = cover_images
+        response_cache.invalidate()
 
-        for i, page in enumerate(images, start=1):
-            filename = f"{folder_name}/page_{i}.jpg"
-            buffer = BytesIO()
+        kept = set(covers.iter_urls(cover_images))
+        storage.delete_urls(url for url in covers.iter_urls(previous) if url not in kept)
 
-            try:
-                page.save(buffer, format="JPEG", optimize=True, quality=75)
-            except Exception:
-                # fallback to PNG if JPEG fails
-                buffer = BytesIO()
-                filename = filename.replace(".jpg", ".png")
-                page.save(buffer, format="PNG")
+    def __str__(self):
+        return f"{self.title} - {self.year} {self.season}"  # Updated string representation
+
+
+class MagazinePageText(models.Model):
+    """
+    Extracted text of one PDF page, for full-text search.
 
-            buffer.seek(0)
-            default_storage.save(filename, ContentFile(buffer.read()))
-            page_urls.append(default_storage.url(filename))
+    The search index itself lives in the database (see migration
+    0014_magazinepagetext_search_index): a generated tsvector column with a GIN
+    index on PostgreSQL, an FTS5 table kept in sync by triggers on SQLite.
+    """
+    magazine = models.ForeignKey(Magazine, on_delete=models.CASCADE, related_name="page_texts")
+    page = models.PositiveIntegerField()
+    text = models.TextField(blank=True)
 
-        self.page_images = page_urls
-        self.save(update_fields=["page_images"])
+    class Meta:
+        ordering = ["magazine", "page"]
+        unique_together = ("magazine", "page")
 
     def __str__(self):
-        return f"{self.title} - {self.year} {self.season}"  # Updated string representation
+        return f"{self.magazine} - page {self.page}"
+
+
+class MagazinePageJob(models.Model):
+    """
+    Durable queue entry for rendering a magazine's page images.
+
+    Jobs are created by Magazine.save() and processed outside the request
+    cycle by `python manage.py process_page_jobs`.
+    """
+    magazine = models.ForeignKey(Magazine, on_delete=models.CASCADE, related_name="page_jobs")
+    status = models.CharField(max_length=10, choices=JOB_STATUS_CHOICES, default="queued")
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=PAGE_JOB_MAX_ATTEMPTS)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    force = models.BooleanField(default=False, help_text="Re-render even if the PDF is unchanged.")
+    render_pages = models.BooleanField(
+        default=True,
+        help_text="Off for jobs that only rebuild the cover variants."
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["status", "run_after"])]
+
+    def __str__(self):
+        return f"Pages for {self.magazine} ({self.get_status_display()})"
+
+    @classmethod
+    def enqueue(cls, magazine, force=False, render_pages=True):
+        """
+        Queue a render for this magazine, reusing a job that is still waiting. Every job
+        also refreshes the cover variants; with `render_pages` off that is all it does.
+        """
+        job = cls.objects.filter(magazine=magazine, status="queued").first()
+        if job is None:
+            job = cls.objects.create(magazine=magazine, force=force, render_pages=render_pages)
+        else:
+            fields = {}
+            if force and not job.force:
+                fields["force"] = True
+            if render_pages and not job.render_pages:
+                fields["render_pages"] = True
+            if fields:
+                cls.objects.filter(pk=job.pk).update(**fields)
+                for name, value in fields.items():
+                    setattr(job, name, value)
+        if job.render_pages:
+            cls._set_magazine_status(magazine.pk, "queued")
+            magazine.page_images_status = "queued"
+        return job
+
+    @classmethod
+    def claim_next(cls):
+        """
+        Atomically take the next runnable job and mark it running.
+        Jobs whose worker died (locked longer than PAGE_JOB_LOCK_TIMEOUT) are picked up again.
+        """
+        now = timezone.now()
+        stale = now - timedelta(seconds=PAGE_JOB_LOCK_TIMEOUT)
+
+        lost = cls.objects.filter(status="running", locked_at__lt=stale, attempts__gte=models.F("max_attempts"))
+        for job in lost:
+            job._finish("failed", "Worker stopped before the job finished.")
+
+        runnable = (
+            models.Q(status="queued", run_after__lte=now)
+            | models.Q(status="running", locked_at__lt=stale)
+        )
+        candidates = cls.objects.filter(runnable).order_by("run_after", "created_at").values_list("pk", flat=True)[:10]
+        for pk in candidates:
+            # The conditional update is the lock: only one worker can move the row.
+            claimed = cls.objects.filter(runnable, pk=pk).update(
+                status="running",
+                locked_at=now,
+                attempts=models.F("attempts") + 1,
+            )
+            if claimed:
+                job = cls.objects.select_related("magazine").get(pk=pk)
+                if job.render_pages:
+                    cls._set_magazine_status(job.magazine_id, "running")
+                return job
+        return None
+
+    def run(self):
+        """Render the pages. Returns True on success, False if the job failed or will be retried."""
+        try:
+            if self.render_pages:
+                self.magazine.generate_page_images(force=self.force)
+            self.magazine.generate_cover_images()
+        except Exception as e:
+            logger.exception("Page rendering failed for magazine %s", self.magazine_id)
+            if self.attempts < self.max_attempts:
+                delay = PAGE_JOB_RETRY_DELAY * (2 ** (self.attempts - 1))
+                self._finish("queued", repr(e), run_after=timezone.now() + timedelta(seconds=delay))
+            else:
+                self._finish("failed", repr(e))
+            return False
+
+        self._finish("done", "")
+        # Once per job, for the new pages, cover and status
+        snapshots.schedule()
+        return True
+
+    def _finish(self, status, error, run_after=None):
+        fields = {"status": status, "last_error": error, "locked_at": None, "updated_at": timezone.now()}
+        if run_after is not None:
+            fields["run_after"] = run_after
+        # Queryset updates so a magazine deleted mid-render doesn't raise here
+        type(self).objects.filter(pk=self.pk).update(**fields)
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+        if not self.render_pages:
+            return  # page_images_status is about the pages
+        # A newer upload may have queued another render while this one ran
+        pending = type(self).objects.filter(
+            magazine_id=self.magazine_id, status="queued", render_pages=True
+        ).exclude(pk=self.pk)
+        if status in ("done", "failed") and pending.exists():
+            status = "queued"
+        self._set_magazine_status(self.magazine_id, status)
+
+    @staticmethod
+    def _set_magazine_status(magazine_id, status):
+        # update() skips Magazine.save(), which would re-validate and re-enqueue
+        Magazine.objects.filter(pk=magazine_id).update(page_images_status=status, updated_at=timezone.now())
+        response_cache.invalidate()
 
 
 # upload path now uses the model's custom filename
@@ -280,13 +525,10 @@ def validate_docx(value):
     if not value.name.endswith(".docx"):
         raise ValidationError("Only .docx files are allowed.")
     
-    # Read up to 10MB in memory
+    # .size comes from the upload, or from storage metadata for a file already
+    # stored (direct uploads), so the file itself is never read here
     max_size = 10 * 1024 * 1024
-    value.seek(0, os.SEEK_END)
-    file_size = value.tell()
-    value.seek(0)
-
-    if file_size > max_size:
+    if value.size > max_size:
         raise ValidationError("File size must be under 10MB.")
 
 
@@ -334,6 +576,17 @@ class Article(models.Model):
     user_bio = models.TextField(blank=True, null=True)
     admin_note = models.TextField(blank=True, null=True)
     submitted_at = models.DateTimeField(auto_now_add=True)
+    file_sha256 = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        help_text="SHA-256 of the uploaded file, used to spot resubmissions of the same file",
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["email", "file_sha256"], name="article_email_sha256_idx"),
+        ]
 
     def clean(self):
         # 1) Prevent more than PENDING_ARTICLE_LIMIT 'pending' articles per email
@@ -346,18 +599,23 @@ class Article(models.Model):
                     f"You can only have {PENDING_ARTICLE_LIMIT} pending article(s) at a time for this email."
                 )
 
-        # 2) Rate limiting: max DAILY_CREATION_LIMIT articles per day
-        today = timezone.now().date()
-        existing_count = Article.objects.filter(submitted_at__date=today).exclude(pk=self.pk).count()
-        if existing_count >= DAILY_CREATION_LIMIT:
-            raise ValidationError(
-                f"Daily article creation limit reached ({DAILY_CREATION_LIMIT} per day)."
-            )
+        # 2) Rate limiting: max DAILY_CREATION_LIMIT articles per day (counted in save())
+        if not DailyQuota.available_for(self, "article"):
+            raise self._daily_limit_error()
+
+    def _daily_limit_error(self):
+        return ValidationError(
+            f"Daily article creation limit reached ({DAILY_CREATION_LIMIT} per day)."
+        )
 
     def save(self, *args, **kwargs):
         # Run clean() before saving to enforce both pending-limit and daily-limit
         self.full_clean()
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            # Counted with the insert, so a failed insert gives the slot back
+            if not DailyQuota.consume_for(self, "article"):
+                raise self._daily_limit_error()
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.title} by {self.first_name} {self.last_name}"
@@ -367,6 +625,16 @@ class Article(models.Model):
         unique_str = uuid.uuid4().hex[:8]  # short unique ID
         return f"article_{title_snake}_{self.first_name}_{unique_str}.docx"
 
+def _email_cover_url(magazine):
+    """Optimized JPEG cover for emails, falling back to the original upload."""
+    if magazine is None:
+        return None
+    url = covers.cover_url(magazine.cover_images)
+    if url:
+        return url
+    return magazine.cover_image.url if magazine.cover_image else None
+
+
 def _send_article_email_async(article, template_name, subject):
     """
     Sends the email via ZeptoMail API asynchronously.
@@ -384,7 +652,7 @@ def _send_article_email_async(article, template_name, subject):
             "author_name": f"{article.first_name} {article.last_name}",
             "article_title": article.title,
             "article": article,
-            "latest_cover_url": latest_magazine.cover_image.url if latest_magazine and latest_magazine.cover_image else None,
+            "latest_cover_url": _email_cover_url(latest_magazine),
             "publication_date": active_config.publication_date if active_config else None,
             "current_issue_label": active_config.current_issue_label_1 if active_config else "Current Issue",
         }
@@ -473,36 +741,42 @@ class Subscriber(models.Model):
           • there is no existing Subscriber with the same email on this date.
         Otherwise (updating the same email today), skip the rate-limit check.
         """
-        today = timezone.now().date()
+        # Check there is room in today's new subscriptions (counted in save())
+        if self._is_new_subscription() and not DailyQuota.available_for(self, "subscriber"):
+            raise self._daily_limit_error()
 
+    def _is_new_subscription(self):
         # If updating an existing record, skip the rate-limit entirely
         if self.pk is not None:
-            return
+            return False
 
         # If an entry with this same email already exists today, treat it as an update—skip limit
-        already_today = Subscriber.objects.filter(
+        # (a range on subscribed_at rather than __date, which would rule out an index)
+        start = timezone.make_aware(datetime.combine(timezone.localdate(), datetime.min.time()))
+        return not Subscriber.objects.filter(
             email=self.email,
-            subscribed_at__date=today
+            subscribed_at__gte=start,
+            subscribed_at__lt=start + timedelta(days=1),
         ).exists()
-        if already_today:
-            return
 
-        # Otherwise, count how many new subscribers there have been today
-        total_today = Subscriber.objects.filter(subscribed_at__date=today).count()
-        if total_today >= DAILY_CREATION_LIMIT:
-            raise ValidationError(
-                f"Daily subscription limit reached ({DAILY_CREATION_LIMIT} per day)."
-            )
+    def _daily_limit_error(self):
+        return ValidationError(
+            f"Daily subscription limit reached ({DAILY_CREATION_LIMIT} per day)."
+        )
 
     def save(self, *args, **kwargs):
         # Validate first (rate limit, etc.)
         self.full_clean()
 
-        # Only delete older entries if this is a new record (pk is None)
-        if self.pk is None:
-            Subscriber.objects.filter(email=self.email).delete()
+        with transaction.atomic():
+            # Only delete older entries if this is a new record (pk is None)
+            if self.pk is None:
+                # Counted with the insert, so a failed insert gives the slot back
+                if self._is_new_subscription() and not DailyQuota.consume_for(self, "subscriber"):
+                    raise self._daily_limit_error()
+                Subscriber.objects.filter(email=self.email).delete()
 
-        super().save(*args, **kwargs)
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return self.email
@@ -545,18 +819,23 @@ class Collaborator(models.Model):
                     f"You cannot have more than 3 'new' submissions with the same email ({self.email})."
                 )
 
-        # 2) Rate limiting: max DAILY_CREATION_LIMIT collaborators per day
-        today = timezone.now().date()
-        existing_count = Collaborator.objects.filter(submitted_at__date=today).exclude(pk=self.pk).count()
-        if existing_count >= DAILY_CREATION_LIMIT:
-            raise ValidationError(
-                f"Daily collaborator creation limit reached ({DAILY_CREATION_LIMIT} per day)."
-            )
+        # 2) Rate limiting: max DAILY_CREATION_LIMIT collaborators per day (counted in save())
+        if not DailyQuota.available_for(self, "collaborator"):
+            raise self._daily_limit_error()
+
+    def _daily_limit_error(self):
+        return ValidationError(
+            f"Daily collaborator creation limit reached ({DAILY_CREATION_LIMIT} per day)."
+        )
 
     def save(self, *args, **kwargs):
         # Ensure clean() is called (validations + rate-limit) before save
         self.full_clean()
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            # Counted with the insert, so a failed insert gives the slot back
+            if not DailyQuota.consume_for(self, "collaborator"):
+                raise self._daily_limit_error()
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.name} - {self.email}"
@@ -596,20 +875,23 @@ class ContactMessage(models.Model):
                     "status": "You can only have up to 3 new contact messages for this email address."
                 })
 
-        # 2) Rate limiting: max DAILY_CREATION_LIMIT messages per day
-        today = timezone.now().date()
-        qs_today = ContactMessage.objects.filter(submitted_at__date=today)
-        if self.pk:
-            qs_today = qs_today.exclude(pk=self.pk)
-        if qs_today.count() >= DAILY_CREATION_LIMIT:
-            raise ValidationError({
-                "__all__": f"Daily contact message creation limit reached ({DAILY_CREATION_LIMIT} per day)."
-            })
+        # 2) Rate limiting: max DAILY_CREATION_LIMIT messages per day (counted in save())
+        if not DailyQuota.available_for(self, "contact_message"):
+            raise self._daily_limit_error()
+
+    def _daily_limit_error(self):
+        return ValidationError({
+            "__all__": f"Daily contact message creation limit reached ({DAILY_CREATION_LIMIT} per day)."
+        })
 
     def save(self, *args, **kwargs):
         # Enforce validations
         self.full_clean()
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            # Counted with the insert, so a failed insert gives the slot back
+            if not DailyQuota.consume_for(self, "contact_message"):
+                raise self._daily_limit_error()
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return f"Contact from {self.name} <{self.email}> ({self.get_status_display()})"
@@ -738,6 +1020,8 @@ class SeasonalSubmissionConfig(models.Model):
         help_text="Alternative/short issue label, e.g. 'Year 1 - Fall Issue'. Auto-generated."
     )
 
+    updated_at = models.DateTimeField(auto_now=True)
+
     def __str__(self):
         return f"{self.season} {self.year} - {self.theme_title}"
 
@@ -0,0 +1,123 @@
+"""
+reCAPTCHA verification for the public write endpoints.
+
+Every submission is checked with Google before anything else runs, so the
+check has to be cheap. The Google backend keeps one pooled keep-alive
+session per process, which means repeat checks skip the TCP and TLS
+handshakes. The request runs on a small thread pool and the caller waits
+at most RECAPTCHA_TIMEOUT for it, however slowly Google trickles its answer
+in, so a slow Google can't hold a worker for long; a timeout counts as a
+failure. The socket timeouts still bound the pool thread itself.
+
+Tokens are single-use. The verifier remembers every token it has seen
+for RECAPTCHA_REPLAY_TIMEOUT (longer than Google keeps a token valid), and
+rejects a repeat locally without asking Google. A token that could not be
+checked (network error, timeout) is forgotten again, so the visitor can
+retry it.
+
+The backend is chosen with RECAPTCHA_BACKEND. FakeRecaptchaBackend never
+touches the network, for tests and load runs: it accepts any token except
+those starting with "fail".
+"""
+import hashlib
+import logging
+from concurrent import futures
+from functools import lru_cache
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+RECAPTCHA_BACKEND = getattr(settings, "RECAPTCHA_BACKEND", "woodtech.recaptcha.GoogleRecaptchaBackend")
+RECAPTCHA_VERIFY_URL = getattr(settings, "RECAPTCHA_VERIFY_URL", "https://www.google.com/recaptcha/api/siteverify")
+# Seconds the caller waits for a verification; the socket timeouts split it between connecting and reading
+RECAPTCHA_TIMEOUT = getattr(settings, "RECAPTCHA_TIMEOUT", 3.0)
+RECAPTCHA_CONNECT_TIMEOUT = getattr(settings, "RECAPTCHA_CONNECT_TIMEOUT", 1.0)
+RECAPTCHA_POOL_SIZE = getattr(settings, "RECAPTCHA_POOL_SIZE", 10)
+# Google accepts a token for two minutes; remember it a little longer
+RECAPTCHA_REPLAY_TIMEOUT = getattr(settings, "RECAPTCHA_REPLAY_TIMEOUT", 180)
+
+
+class GoogleRecaptchaBackend:
+    """Checks tokens with Google's siteverify API over a pooled keep-alive session."""
+
+    def __init__(self, secret=None, url=RECAPTCHA_VERIFY_URL, timeout=RECAPTCHA_TIMEOUT,
+                 connect_timeout=RECAPTCHA_CONNECT_TIMEOUT, pool_size=RECAPTCHA_POOL_SIZE):
+        self.secret = secret if secret is not None else settings.RECAPTCHA_SECRET_KEY
+        self.url = url
+        self.deadline = timeout
+        connect_timeout = min(connect_timeout, timeout)
+        self.timeout = (connect_timeout, max(timeout - connect_timeout, 0.1))
+        self.session = requests.Session()
+        # No retries: a second attempt would blow the deadline
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.executor = futures.ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="recaptcha")
+
+    def verify(self, token, remote_ip=None):
+        """
+        Google's verdict as a dict; raises requests.RequestException on network
+        errors, and requests.Timeout if there is no answer within the deadline.
+        """
+        payload = {"secret": self.secret, "response": token}
+        if remote_ip:
+            payload["remoteip"] = remote_ip
+        future = self.executor.submit(self._post, payload)
+        try:
+            return future.result(timeout=self.deadline)
+        except futures.TimeoutError:
+            future.cancel()
+            raise requests.Timeout(f"no answer from reCAPTCHA within {self.deadline}s")
+
+    def _post(self, payload):
+        response = self.session.post(self.url, data=payload, timeout=self.timeout)
+        return response.json()
+
+
+class FakeRecaptchaBackend:
+    """Offline stand-in: accepts every token except those starting with "fail"."""
+
+    def verify(self, token, remote_ip=None):
+        if token.startswith("fail"):
+            return {"success": False, "error-codes": ["invalid-input-response"]}
+        return {"success": True, "hostname": "localhost"}
+
+
+class RecaptchaVerifier:
+    def __init__(self, backend, replay_timeout=RECAPTCHA_REPLAY_TIMEOUT):
+        self.backend = backend
+        self.replay_timeout = replay_timeout
+
+    def verify(self, token, remote_ip=None):
+        """Whether `token` is a valid, unused reCAPTCHA token."""
+        if not token:
+            return False
+
+        key = f"recaptcha:{hashlib.sha256(token.encode()).hexdigest()}"
+        if not cache.add(key, True, self.replay_timeout):
+            logger.warning("reCAPTCHA token replayed")
+            return False
+
+        try:
+            result = self.backend.verify(token, remote_ip)
+        except (requests.RequestException, ValueError) as e:
+            # Not a verdict on the token, so don't use it up
+            cache.delete(key)
+            logger.warning("reCAPTCHA verification failed: %s", e)
+            return False
+
+        if not result.get("success", False):
+            logger.info("reCAPTCHA token rejected: %s", result.get("error-codes"))
+            return False
+        return True
+
+
+@lru_cache(maxsize=None)
+def get_verifier():
+    """The process-wide verifier, so its backend's connection pool is shared."""
+    return RecaptchaVerifier(import_string(RECAPTCHA_BACKEND)())
@@ -0,0 +1,97 @@
+"""
+Cache of serialized magazine API responses.
+
+Magazines change a few times a year but the list and latest endpoints are
+the busiest in the API. Their serialized data is cached under keys that
+embed a version number; any change to a magazine bumps the version (see
+signals.py and the places that update magazines with queryset.update()),
+which orphans every cached response at once instead of deleting keys.
+
+On a miss only one request rebuilds a given response: it takes a short lock
+with cache.add(), and concurrent requests wait for its result instead of
+all querying and serializing at the same time. Stale entries also expire
+after MAGAZINE_CACHE_TIMEOUT, which bounds staleness when each worker
+process has its own local-memory cache (no REDIS_URL). Deployments need the
+shared cache anyway: the page worker invalidates from its own process, and
+checks.py warns when it can't reach the web service's cache.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+MAGAZINE_CACHE_TIMEOUT = getattr(settings, "MAGAZINE_CACHE_TIMEOUT", 300)
+# How long a rebuild may hold its lock, and how long other requests wait on it
+MAGAZINE_CACHE_LOCK_TIMEOUT = getattr(settings, "MAGAZINE_CACHE_LOCK_TIMEOUT", 30)
+MAGAZINE_CACHE_WAIT = getattr(settings, "MAGAZINE_CACHE_WAIT", 5)
+
+VERSION_KEY = "magazine-api:version"
+
+
+def version():
+    current = cache.get(VERSION_KEY)
+    if current is None:
+        # Start from the clock so a flushed cache never reuses an old version's keys
+        cache.add(VERSION_KEY, int(time.time()), None)
+        current = cache.get(VERSION_KEY)
+    return current
+
+
+def validator():
+    """
+    Changes whenever the cached responses may have, for ETags. With a process-local cache
+    (no REDIS_URL) version bumps aren't shared between workers, so it also changes every
+    MAGAZINE_CACHE_TIMEOUT: the same bound on staleness the cached responses have.
+    """
+    if isinstance(caches["default"], LocMemCache):
+        return f"{version()}:{int(time.time() // MAGAZINE_CACHE_TIMEOUT)}"
+    return str(version())
+
+
+def _bump():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, int(time.time()), None)
+
+
+def invalidate():
+    """Drop every cached magazine response once the current transaction commits."""
+    transaction.on_commit(_bump)
+
+
+def request_key(request, name, params=()):
+    """Cache name for a response that depends on the host (absolute URLs) and some query params."""
+    parts = [request.build_absolute_uri("/")]
+    parts += [f"{param}={request.query_params.get(param, '')}" for param in params]
+    return f"{name}:{hashlib.sha256('&'.join(parts).encode()).hexdigest()[:32]}"
+
+
+def get_or_build(name, build):
+    """Cached value for `name`, calling `build()` on a miss (once, even under concurrent misses)."""
+    key = f"magazine-api:{version()}:{name}"
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    lock_key = f"{key}:lock"
+    if cache.add(lock_key, 1, MAGAZINE_CACHE_LOCK_TIMEOUT):
+        try:
+            value = build()
+            cache.set(key, value, MAGAZINE_CACHE_TIMEOUT)
+            return value
+        finally:
+            cache.delete(lock_key)
+
+    deadline = time.monotonic() + MAGAZINE_CACHE_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        value = cache.get(key)
+        if value is not None:
+            return value
+        if cache.get(lock_key) is None:
+            break  # the rebuild failed; don't wait for it
+    return build()
@@ -1,47 +1,154 @@
 from rest_framework import serializers
 from .models import Magazine, Article, Subscriber, Collaborator, ContactMessage
+from woodtech import storage, uploads
+from woodtech.magazine import covers, manifest
 
 
 class MagazineSerializer(serializers.ModelSerializer):
+    """
+    Full magazine representation. Pass `fields=[...]` to keep only some fields
+    (sparse fieldsets). The read-only API renders the same output faster with
+    woodtech.magazine.representation; keep the two in step.
+    """
     publish_date = serializers.DateTimeField(
         source='date_uploaded',
         format="%Y-%m-%d",
         read_only=False  # Changed to allow writes
     )
     page_images = serializers.SerializerMethodField()
+    pages = serializers.SerializerMethodField()
+    cover_images = serializers.SerializerMethodField()
     season_display = serializers.CharField(source='get_season_display', read_only=True)
 
     class Meta:
         model = Magazine
         fields = [
             'id', 'title', 'publish_date', 'year', 'season', 'season_display',
-            'pdf_file', 'cover_image', 'description', 'is_published', 'page_images'
+            'pdf_file', 'cover_image', 'cover_images', 'description', 'is_published', 'page_images',
+            'pages', 'page_count', 'page_images_status'
         ]
+        read_only_fields = ['page_count', 'page_images_status']
         extra_kwargs = {
             'season': {'read_only': False}  # Ensure season is writable
         }
 
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = fields or getattr(self, 'default_fields', None)
+        if fields:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def field_names(cls, fields=None):
+        """The fields serialized for `fields` (or the defaults), in output order."""
+        fields = fields or getattr(cls, 'default_fields', None) or cls.Meta.fields
+        return [name for name in cls.Meta.fields if name in fields]
+
     def get_page_images(self, obj):
+        # Full-size JPEG per page, kept for clients that predate `pages`
+        request = self.context.get('request')
+        return [
+            request.build_absolute_uri(manifest.page_url(entry))
+            for entry in manifest.page_entries(obj.page_images)
+        ]
+
+    def get_pages(self, obj):
+        """
+        Per-page size, placeholder and variants (width, height, bytes, url), so clients can lay
+        out the issue before any image loads and pick the smallest adequate image.
+        """
+        request = self.context.get('request')
+        pages = []
+        for entry in manifest.page_entries(obj.page_images):
+            pages.append({
+                # Pages rendered before these were recorded have none
+                'width': None,
+                'height': None,
+                'placeholder': None,
+                **entry,
+                'variants': [
+                    {**variant, 'url': request.build_absolute_uri(variant['url'])}
+                    for variant in entry['variants']
+                ],
+            })
+        return pages
+
+    def get_cover_images(self, obj):
+        """Resized WebP/JPEG covers; prefer these over the original `cover_image` upload."""
         request = self.context.get('request')
-        if obj.page_images:
-            return [request.build_absolute_uri(url) for url in obj.page_images]
-        return []
+        return [
+            {**variant, 'url': request.build_absolute_uri(variant['url'])}
+            for variant in covers.cover_variants(obj.cover_images)
+        ]
+
+class MagazineListSerializer(MagazineSerializer):
+    """Compact archive-grid representation: no page manifest, PDF or description."""
+    default_fields = [
+        'id', 'title', 'publish_date', 'year', 'season', 'season_display',
+        'cover_image', 'cover_images', 'is_published', 'page_count',
+    ]
+
 
 PENDING_ARTICLE_LIMIT = 5
 
-class ArticleSerializer(serializers.ModelSerializer):
+class DirectUploadMixin:
+    """
+    Lets a create serializer take `upload_token` (from /api/uploads/, see woodtech/uploads.py)
+    in place of a multipart file for `upload_field`.
+    """
+    upload_kind = None
+    upload_field = None
+    upload_required = True
+
+    def validate_direct_upload(self, data):
+        token = data.pop('upload_token', None)
+        if token and data.get(self.upload_field):
+            raise serializers.ValidationError({'upload_token': "Send either a file or an upload token, not both."})
+        if token:
+            try:
+                data['direct_upload'] = uploads.finalize(token, self.upload_kind)
+            except uploads.UploadError as e:
+                raise serializers.ValidationError({'upload_token': str(e)})
+        elif self.upload_required and not data.get(self.upload_field):
+            raise serializers.ValidationError({self.upload_field: "No file was submitted."})
+        return data
+
+    def create(self, validated_data):
+        name = validated_data.pop('direct_upload', None)
+        if name is None:
+            return super().create(validated_data)
+        instance = self.Meta.model(**validated_data)
+        uploads.claim(name, instance, self.upload_field)
+        try:
+            instance.save()
+        except Exception:
+            storage.delete_files([getattr(instance, self.upload_field).name])
+            raise
+        return instance
+
+
+class ArticleSerializer(DirectUploadMixin, serializers.ModelSerializer):
     recaptcha_token = serializers.CharField(write_only=True)
+    upload_token = serializers.CharField(write_only=True, required=False)
+
+    upload_kind = 'article'
+    upload_field = 'file'
 
     class Meta:
         model = Article
         fields = [
             'id', 'first_name', 'last_name', 'title',
             'email', 'file', 'user_bio', 'user_note', 'country',
-            'submitted_at', 'status', 'recaptcha_token'
+            'submitted_at', 'status', 'recaptcha_token', 'upload_token'
         ]
         read_only_fields = ['submitted_at', 'status']
+        extra_kwargs = {
+            'file': {'required': False}  # Or an upload_token
+        }
 
     def validate(self, data):
+        data = self.validate_direct_upload(data)
         email = data.get('email')
         status = data.get('status', 'pending')
 
@@ -53,6 +160,24 @@ class ArticleSerializer(serializers.ModelSerializer):
                 })
         return data
 
+    def create(self, validated_data):
+        # A resubmission of a file this email already sent (same SHA-256) points at
+        # the stored copy instead of uploading the file again
+        digest = validated_data.get('file_sha256')
+        if digest and validated_data.get('file'):
+            existing = (
+                Article.objects.filter(email=validated_data['email'], file_sha256=digest)
+                .exclude(file='').only('file').first()
+            )
+            if existing:
+                validated_data['file'] = existing.file.name
+        return super().create(validated_data)
+
+
+
+class DirectUploadSerializer(serializers.Serializer):
+    kind = serializers.ChoiceField(choices=sorted(uploads.KINDS))
+    filename = serializers.CharField(max_length=255)
 
 
 class SubscriberSerializer(serializers.ModelSerializer):
@@ -63,17 +188,23 @@ class SubscriberSerializer(serializers.ModelSerializer):
         fields = ['name', 'email', 'recaptcha_token']  # Added token to fields
 
 
-class CollaboratorCreateSerializer(serializers.ModelSerializer):
+class CollaboratorCreateSerializer(DirectUploadMixin, serializers.ModelSerializer):
     recaptcha_token = serializers.CharField(write_only=True, required=True)  # Added reCAPTCHA token
+    upload_token = serializers.CharField(write_only=True, required=False)
+
+    upload_kind = 'collaborator'
+    upload_field = 'logo_or_sample'
+    upload_required = False
 
     class Meta:
         model = Collaborator
         fields = [
             'name', 'email', 'brand_or_organization', 'message', 
-            'logo_or_sample', 'recaptcha_token'  # Added token to fields
+            'logo_or_sample', 'recaptcha_token', 'upload_token'  # Added token to fields
         ]
 
     def validate(self, data):
+        data = self.validate_direct_upload(data)
         data['status'] = 'new'
         email = data['email']
         if Collaborator.objects.filter(email=email, status='new').count() >= 3:
@@ -146,7 +277,7 @@ class SeasonalSubmissionConfigSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = SeasonalSubmissionConfig
-        fields = '__all__'
+        exclude = ['updated_at']  # bookkeeping for conditional GETs only
 
 # serializers.py
 from rest_framework import serializers
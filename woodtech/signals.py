@@ -1,25 +1,31 @@
-from django.db.models.signals import post_delete
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from django.core.files.storage import default_storage
-from .models import Magazine
+from .models import Banner, Magazine, SeasonalSubmissionConfig
+from woodtech import response_cache, snapshots, storage
+from woodtech.magazine import covers, manifest
 
+@receiver(post_save, sender=Magazine)
 @receiver(post_delete, sender=Magazine)
-def auto_delete_files_on_delete(sender, instance, **kwargs):
-    # Delete PDF file from storage
-    if instance.pdf_file:
-        instance.pdf_file.delete(save=False)
+def invalidate_magazine_responses(sender, **kwargs):
+    response_cache.invalidate()
+    snapshots.schedule()
+
 
-    # Delete cover image from storage
-    if instance.cover_image:
-        instance.cover_image.delete(save=False)
+@receiver(post_save, sender=Banner)
+@receiver(post_delete, sender=Banner)
+@receiver(post_save, sender=SeasonalSubmissionConfig)
+@receiver(post_delete, sender=SeasonalSubmissionConfig)
+def publish_catalogue_snapshot(sender, **kwargs):
+    snapshots.schedule()
 
-    # Delete each page image from S3
-    if instance.page_images:
-        for url in instance.page_images:
-            # Get the relative path from the full S3 URL
-            relative_path = url.split(f'/{default_storage.location}/')[-1]
-            if default_storage.exists(relative_path):
-                default_storage.delete(relative_path)
+
+@receiver(post_delete, sender=Magazine)
+def auto_delete_files_on_delete(sender, instance, **kwargs):
+    # PDF, cover and every page image/tile go out in one batched delete
+    names = [instance.pdf_file.name, instance.cover_image.name]
+    names += [storage.name_from_url(url) for url in covers.iter_urls(instance.cover_images)]
+    names += [storage.name_from_url(url) for url in manifest.iter_urls(instance.page_images)]
+    storage.delete_files(names)
 
 
 # myapp/signals.py
@@ -31,7 +37,7 @@ from .models import Collaborator, Article
 @receiver(post_delete, sender=Collaborator)
 def auto_delete_file_on_delete(sender, instance, **kwargs):
     if instance.logo_or_sample:
-        instance.logo_or_sample.delete(save=False)
+        storage.delete_files([instance.logo_or_sample.name])
 
 @receiver(pre_save, sender=Collaborator)
 def auto_delete_old_file_on_change(sender, instance, **kwargs):
@@ -45,13 +51,19 @@ def auto_delete_old_file_on_change(sender, instance, **kwargs):
 
     new_file = instance.logo_or_sample
     if old_file and old_file != new_file:
-        old_file.delete(save=False)
+        storage.delete_files([old_file.name])
+
+
+def _delete_article_file(instance, name):
+    # Resubmissions of the same file share one stored copy (see ArticleSerializer.create)
+    if not Article.objects.filter(file=name).exclude(pk=instance.pk).exists():
+        storage.delete_files([name])
 
 
 @receiver(post_delete, sender=Article)
 def auto_delete_article_file_on_delete(sender, instance, **kwargs):
     if instance.file:
-        instance.file.delete(save=False)
+        _delete_article_file(instance, instance.file.name)
 
 @receiver(pre_save, sender=Article)
 def auto_delete_old_article_file_on_change(sender, instance, **kwargs):
@@ -65,4 +77,5 @@ def auto_delete_old_article_file_on_change(sender, instance, **kwargs):
 
     new_file = instance.file
     if old_file and old_file != new_file:
-        old_file.delete(save=False)
+        instance.file_sha256 = ""  # No longer the hash of the file
+        _delete_article_file(instance, old_file.name)
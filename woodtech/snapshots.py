@@ -0,0 +1,291 @@
+"""
+Static JSON snapshots of the public catalogue, published to storage.
+
+The magazine list, latest issue, active season and active banner change a
+few times a year, so they are written out as JSON objects that a CDN can
+serve without reaching Django. Each publish writes a new version:
+
+    catalogue/<version>/magazines/page-1.json   (same pages as /api/magazines/?page=N)
+    catalogue/<version>/magazines/latest.json
+    catalogue/<version>/seasonal/active.json
+    catalogue/<version>/banner/active.json
+    catalogue/current.json                      (which version is live, and its URLs)
+
+The version is a hash of the content, so an unchanged catalogue is not
+rewritten, and versioned objects can be cached forever. Only current.json
+is short-lived. The last CATALOGUE_SNAPSHOT_KEEP versions are kept so
+clients holding an older current.json can still load it.
+
+With CATALOGUE_SNAPSHOTS set, saving or deleting a magazine, banner or
+season (see signals.py), and every finished page job, mark the catalogue as
+changed once the transaction commits. The page worker (process_page_jobs)
+then publishes between jobs, so requests never do, and a burst of changes
+is published once. The mark lives in the default cache, so the worker must
+share it with the web processes (REDIS_URL); checks.py flags a process-local
+cache. Pages rendered on demand (see lazy.py) are picked up by the next
+publish. Publishing can also be run with the publish_catalogue_snapshot
+command. The API views use the snapshots
+through `redirect_to_snapshot`: with CATALOGUE_SNAPSHOT_REDIRECT set they
+redirect to them, and either way they fall back to them when the database
+is unavailable.
+"""
+import hashlib
+import json
+import logging
+from datetime import datetime, time as datetime_time, timedelta
+from functools import wraps
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, transaction
+from django.http import HttpResponseRedirect
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.encoding import iri_to_uri
+
+from woodtech import storage
+
+logger = logging.getLogger(__name__)
+
+CATALOGUE_SNAPSHOTS = getattr(settings, "CATALOGUE_SNAPSHOTS", False)
+CATALOGUE_SNAPSHOT_REDIRECT = getattr(settings, "CATALOGUE_SNAPSHOT_REDIRECT", False)
+CATALOGUE_SNAPSHOT_PREFIX = getattr(settings, "CATALOGUE_SNAPSHOT_PREFIX", "catalogue")
+# Origin for media URLs that the storage returns without one (e.g. "/media/..." on local disk)
+CATALOGUE_SNAPSHOT_BASE_URL = getattr(settings, "CATALOGUE_SNAPSHOT_BASE_URL", "")
+CATALOGUE_SNAPSHOT_KEEP = getattr(settings, "CATALOGUE_SNAPSHOT_KEEP", 3)
+CATALOGUE_SNAPSHOT_CACHE_CONTROL = "public, max-age=31536000, immutable"
+CATALOGUE_POINTER_CACHE_CONTROL = getattr(settings, "CATALOGUE_POINTER_CACHE_CONTROL", "public, max-age=60")
+# How long each process trusts its copy of current.json
+CATALOGUE_POINTER_TIMEOUT = getattr(settings, "CATALOGUE_POINTER_TIMEOUT", 60)
+
+POINTER_KEY = "catalogue-snapshot:current"
+LOCK_KEY = "catalogue-snapshot:lock"
+PENDING_KEY = "catalogue-snapshot:pending"
+LOCK_TIMEOUT = 300
+
+
+class BaseURL:
+    """Stands in for a request when making URLs absolute outside of one."""
+
+    def __init__(self, base):
+        self.base = base
+
+    def build_absolute_uri(self, location="/"):
+        return iri_to_uri(urljoin(self.base, location))
+
+
+def pointer_name():
+    return f"{CATALOGUE_SNAPSHOT_PREFIX}/current.json"
+
+
+def _encode(data):
+    return json.dumps(data, cls=DjangoJSONEncoder, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def _end_of_day():
+    today = timezone.localdate()
+    return timezone.make_aware(datetime.combine(today + timedelta(days=1), datetime_time.min))
+
+
+def build_documents():
+    """
+    {name: (data, expires)} for every snapshot document. `expires` is when the
+    document stops matching the API even if nothing is saved (or None).
+    """
+    from woodtech.magazine import representation
+    from woodtech.models import Banner, Magazine, SeasonalSubmissionConfig
+    from woodtech.serializers import ActiveBannerSerializer, MagazineSerializer, SeasonalSubmissionConfigSerializer
+    from woodtech.views import MagazinePagination
+
+    base = BaseURL(CATALOGUE_SNAPSHOT_BASE_URL)
+    fields = MagazineSerializer.field_names()
+    rows = list(
+        Magazine.objects.filter(is_published=True).order_by("-date_uploaded", "-id")
+        .values(*representation.columns(fields))
+    )
+    magazines = representation.represent(rows, base, fields, Magazine)
+
+    documents = {}
+    page_size = MagazinePagination.page_size
+    page_count = max((len(magazines) + page_size - 1) // page_size, 1)
+    for number in range(1, page_count + 1):
+        documents[f"magazines/page-{number}"] = ({
+            "count": len(magazines),
+            # Filled in with the neighbouring pages' URLs once the version is known
+            "next": number + 1 if number < page_count else None,
+            "previous": number - 1 if number > 1 else None,
+            "results": magazines[(number - 1) * page_size:number * page_size],
+        }, None)
+    if magazines:
+        documents["magazines/latest"] = (magazines[0], None)
+
+    season = SeasonalSubmissionConfig.objects.filter(is_active=True).first()
+    if season:
+        # is_submissions_open depends on today's date
+        documents["seasonal/active"] = (SeasonalSubmissionConfigSerializer(season).data, _end_of_day())
+
+    banner = Banner.objects.filter(is_active=True).first()
+    if banner and not banner.is_expired():
+        documents["banner/active"] = (
+            {"has_active_banner": True, "banner": ActiveBannerSerializer(banner).data}, banner.auto_deactivate_at
+        )
+    elif not banner:
+        documents["banner/active"] = ({"has_active_banner": False, "banner": None}, None)
+    # An expired banner is deactivated by the next API request; leave it to the API until then
+    return documents
+
+
+def read_pointer():
+    """The live current.json as a dict, or None if nothing has been published."""
+    try:
+        with default_storage.open(pointer_name(), "rb") as f:
+            return json.loads(f.read())
+    except (FileNotFoundError, OSError, ValueError):
+        return None
+    except Exception:
+        # S3 reports a missing key as a botocore ClientError
+        logger.warning("Could not read the catalogue snapshot pointer", exc_info=True)
+        return None
+
+
+def publish(force=False):
+    """
+    Write a new snapshot version if the catalogue changed (or `force`), point
+    current.json at it and prune old versions. Returns the live version.
+    """
+    documents = build_documents()
+    encoded = {name: _encode(data) for name, (data, _) in documents.items()}
+    digest = hashlib.sha256()
+    for name in sorted(encoded):
+        digest.update(name.encode() + b"\0" + encoded[name] + b"\0")
+    version = digest.hexdigest()[:16]
+
+    previous = read_pointer() or {}
+    if previous.get("version") == version and not force:
+        return version
+
+    def name_for(document):
+        return f"{CATALOGUE_SNAPSHOT_PREFIX}/{version}/{document}.json"
+
+    base = BaseURL(CATALOGUE_SNAPSHOT_BASE_URL)
+    urls = {document: base.build_absolute_uri(default_storage.url(name_for(document))) for document in documents}
+    for document, (data, _) in documents.items():
+        if document.startswith("magazines/page-"):
+            for link in ("next", "previous"):
+                if data[link] is not None:
+                    data[link] = urls[f"magazines/page-{data[link]}"]
+            encoded[document] = _encode(data)
+        storage.put(name_for(document), encoded[document], "application/json", CATALOGUE_SNAPSHOT_CACHE_CONTROL)
+
+    history = [version] + [v for v in [previous.get("version")] + previous.get("history", []) if v and v != version]
+    pointer = {
+        "version": version,
+        "published_at": timezone.now(),
+        "documents": {
+            document: {"url": urls[document], "expires": expires}
+            for document, (_, expires) in documents.items()
+        },
+        "history": history[1:CATALOGUE_SNAPSHOT_KEEP],
+    }
+    storage.put(pointer_name(), _encode(pointer), "application/json", CATALOGUE_POINTER_CACHE_CONTROL)
+    cache.set(POINTER_KEY, json.loads(_encode(pointer)), CATALOGUE_POINTER_TIMEOUT)
+    prune(history[:CATALOGUE_SNAPSHOT_KEEP])
+    logger.info("Published catalogue snapshot %s", version)
+    return version
+
+
+def prune(keep):
+    """Delete every snapshot version not in `keep`."""
+    try:
+        versions, _ = default_storage.listdir(CATALOGUE_SNAPSHOT_PREFIX)
+    except FileNotFoundError:
+        return
+    for version in set(versions) - set(keep):
+        storage.delete_files(storage.walk(f"{CATALOGUE_SNAPSHOT_PREFIX}/{version}"))
+
+
+def mark_changed():
+    cache.set(PENDING_KEY, True, None)
+
+
+def publish_pending():
+    """
+    publish() if the catalogue was marked as changed, one process at a time; a change
+    marked during a publish is picked up by the running one. Returns whether it published.
+    """
+    if not cache.get(PENDING_KEY) or not cache.add(LOCK_KEY, 1, LOCK_TIMEOUT):
+        return False
+    try:
+        while cache.get(PENDING_KEY):
+            cache.delete(PENDING_KEY)
+            publish()
+    except Exception:
+        logger.exception("Could not publish the catalogue snapshot")
+        mark_changed()  # retried on the worker's next poll
+        return False
+    finally:
+        cache.delete(LOCK_KEY)
+    return True
+
+
+def schedule():
+    """Mark the catalogue as changed once the current transaction commits, if CATALOGUE_SNAPSHOTS is set."""
+    if CATALOGUE_SNAPSHOTS:
+        transaction.on_commit(mark_changed)
+
+
+def current_pointer():
+    pointer = cache.get(POINTER_KEY)
+    if pointer is None:
+        # Cache "nothing published" too, so the storage isn't asked on every request
+        pointer = read_pointer() or {}
+        cache.set(POINTER_KEY, pointer, CATALOGUE_POINTER_TIMEOUT)
+    return pointer
+
+
+def snapshot_url(document):
+    """URL of the live snapshot of `document`, or None if there is none (or it has expired)."""
+    entry = current_pointer().get("documents", {}).get(document)
+    if not entry:
+        return None
+    expires = entry.get("expires") and parse_datetime(entry["expires"])
+    if expires and timezone.now() >= expires:
+        return None
+    return entry["url"]
+
+
+def list_document(request):
+    """Snapshot document matching a magazine list request, or None if it has other parameters."""
+    if set(request.GET) - {"page"}:
+        return None
+    page = request.GET.get("page", "1")
+    return f"magazines/page-{page}" if page.isdigit() else None
+
+
+def redirect_to_snapshot(document):
+    """
+    View decorator: with CATALOGUE_SNAPSHOT_REDIRECT set, redirect to the snapshot of
+    `document` (a name, or a function of the request returning one or None). Without it,
+    redirect only when the view fails with a database error.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            name = document(request) if callable(document) else document
+            if CATALOGUE_SNAPSHOT_REDIRECT and name:
+                url = snapshot_url(name)
+                if url:
+                    return HttpResponseRedirect(url)
+            try:
+                return view(request, *args, **kwargs)
+            except DatabaseError:
+                url = name and snapshot_url(name)
+                if not url:
+                    raise
+                logger.exception("Database error; redirecting to the catalogue snapshot")
+                return HttpResponseRedirect(url)
+        return wrapper
+    return decorator
@@ -0,0 +1,183 @@
+"""
+Helpers for working with stored media.
+
+Cleanup used to check `exists()` and then `delete()` each object, two round
+trips per file. `delete_files` batches keys instead: on S3 it sends one
+DeleteObjects request per DELETE_BATCH_SIZE keys (deleting a missing key is
+not an error there), and on other storages it falls back to `delete()`,
+which already ignores missing files.
+
+`stat` and `iter_range` back byte-range downloads: on S3 they map to a
+single HEAD and a ranged GET, so only the requested bytes are transferred.
+`iter_object` streams a whole object the same way. Opening an S3 file
+through the storage instead buffers all of it (in memory with
+AWS_S3_MAX_MEMORY_SIZE=0), which large PDFs can't afford.
+
+`put` writes an object under exactly the given name, replacing any existing
+one, with HTTP headers for the CDN where the storage supports them. `move`
+renames an object; on S3 it is a server-side copy, so the bytes never pass
+through Django.
+"""
+import logging
+from typing import NamedTuple
+from urllib.parse import unquote
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from storages.backends.s3 import S3Storage
+from storages.utils import clean_name
+
+logger = logging.getLogger(__name__)
+
+# DeleteObjects accepts at most 1000 keys per request
+DELETE_BATCH_SIZE = 1000
+STREAM_CHUNK_SIZE = getattr(settings, "STREAM_CHUNK_SIZE", 64 * 1024)
+
+
+class ObjectInfo(NamedTuple):
+    size: int
+    etag: str
+    last_modified: object  # aware datetime
+
+
+def object_key(name, storage):
+    """Bucket key of a stored name (the storage's `location` prefix applied)."""
+    return storage._normalize_name(clean_name(name))
+
+
+def name_from_url(url, storage=None):
+    """Storage name of an object URL built by `storage.url()`, or None if it isn't one."""
+    storage = storage or default_storage
+    path = url.split("?", 1)[0]
+    media_url = settings.MEDIA_URL
+    if media_url and path.startswith(media_url):
+        return unquote(path[len(media_url):])
+    location = getattr(storage, "location", "")
+    if isinstance(storage, S3Storage) and location and f"/{location}/" in path:
+        return unquote(path.split(f"/{location}/", 1)[1])
+    return None
+
+
+def delete_files(names, storage=None):
+    """Delete every named object, without existence checks, in as few requests as possible."""
+    storage = storage or default_storage
+    # Keep order, drop blanks and duplicates
+    names = [name for name in dict.fromkeys(names) if name]
+    if not names:
+        return
+
+    if not isinstance(storage, S3Storage):
+        for name in names:
+            storage.delete(name)
+        return
+
+    for start in range(0, len(names), DELETE_BATCH_SIZE):
+        batch = names[start:start + DELETE_BATCH_SIZE]
+        response = storage.bucket.delete_objects(Delete={
+            "Objects": [{"Key": object_key(name, storage)} for name in batch],
+            "Quiet": True,
+        })
+        for error in response.get("Errors", []):
+            logger.warning("Could not delete %s: %s", error.get("Key"), error.get("Message"))
+
+
+def delete_urls(urls, storage=None):
+    """Delete the objects behind stored URLs; URLs outside the storage are ignored."""
+    storage = storage or default_storage
+    delete_files((name_from_url(url, storage) for url in urls), storage)
+
+
+def stat(name, storage=None):
+    """Size, ETag and modification time of a stored object, in one request on S3."""
+    storage = storage or default_storage
+    if isinstance(storage, S3Storage):
+        obj = storage.bucket.Object(object_key(name, storage))
+        obj.load()
+        return ObjectInfo(obj.content_length, obj.e_tag, obj.last_modified)
+    size = storage.size(name)
+    modified = storage.get_modified_time(name)
+    return ObjectInfo(size, f'"{size:x}-{int(modified.timestamp() * 1000):x}"', modified)
+
+
+def iter_range(name, start, end, storage=None, chunk_size=STREAM_CHUNK_SIZE):
+    """Yield bytes start..end (inclusive) of a stored object without reading the rest of it."""
+    storage = storage or default_storage
+    if isinstance(storage, S3Storage):
+        # A ranged GET, so S3 only sends the requested bytes
+        body = storage.bucket.Object(object_key(name, storage)).get(Range=f"bytes={start}-{end}")["Body"]
+        try:
+            yield from body.iter_chunks(chunk_size)
+        finally:
+            body.close()
+        return
+
+    with storage.open(name, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def iter_object(name, storage=None, chunk_size=STREAM_CHUNK_SIZE):
+    """Yield a stored object's bytes in chunks, never holding the whole object."""
+    storage = storage or default_storage
+    if isinstance(storage, S3Storage):
+        body = storage.bucket.Object(object_key(name, storage)).get()["Body"]
+        try:
+            yield from body.iter_chunks(chunk_size)
+        finally:
+            body.close()
+        return
+
+    with storage.open(name, "rb") as f:
+        yield from iter(lambda: f.read(chunk_size), b"")
+
+
+def put(name, content, content_type, cache_control=None, storage=None):
+    """
+    Store bytes under exactly `name` (overwriting), with Content-Type and Cache-Control
+    on S3. Other storages keep the bytes only; their server decides the headers.
+    """
+    storage = storage or default_storage
+    if isinstance(storage, S3Storage):
+        params = {"Body": content, "ContentType": content_type}
+        if cache_control:
+            params["CacheControl"] = cache_control
+        storage.bucket.Object(object_key(name, storage)).put(**params)
+        return
+    # save() would pick a new name rather than overwrite
+    storage.delete(name)
+    storage.save(name, ContentFile(content))
+
+
+def walk(path, storage=None):
+    """Names of every object under the directory `path`."""
+    storage = storage or default_storage
+    try:
+        directories, files = storage.listdir(path)
+    except FileNotFoundError:
+        return
+    for filename in files:
+        yield f"{path}/{filename}"
+    for directory in directories:
+        yield from walk(f"{path}/{directory}", storage)
+
+
+def move(name, new_name, storage=None):
+    """Move a stored object to `new_name`. Returns the name it was stored under."""
+    storage = storage or default_storage
+    if isinstance(storage, S3Storage):
+        new_name = storage.generate_filename(new_name)
+        storage.bucket.Object(object_key(new_name, storage)).copy_from(
+            CopySource={"Bucket": storage.bucket_name, "Key": object_key(name, storage)}
+        )
+    else:
+        with storage.open(name, "rb") as f:
+            new_name = storage.save(new_name, f)
+    delete_files([name], storage)
+    return new_name
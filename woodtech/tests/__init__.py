@@ -0,0 +1,48 @@
+"""
+Shared fixtures for the woodtech tests.
+
+Tests that store files use MediaStorageMixin, which points the default
+storage at a throwaway directory on local disk for the test class, so
+nothing reaches S3. MEDIA_URL is left as configured (an absolute S3 URL);
+override it with override_settings(MEDIA_URL=...) where a test needs to.
+"""
+import shutil
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+
+from ..models import Magazine
+
+PDF = b"%PDF-1.4\n%%EOF\n"
+
+LOCAL_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+
+class MediaStorageMixin:
+    """TestCase mixin: file storage in a temporary MEDIA_ROOT (`cls.media_root`), removed afterwards."""
+
+    @classmethod
+    def setUpClass(cls):
+        # Enabled before super().setUpClass() so setUpTestData() already stores locally
+        cls.media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.media_root, ignore_errors=True)
+        media_settings = override_settings(MEDIA_ROOT=cls.media_root, STORAGES=LOCAL_STORAGES)
+        media_settings.enable()
+        cls.addClassCleanup(media_settings.disable)
+        super().setUpClass()
+
+
+def create_magazine(**kwargs):
+    """A Magazine with a minimal PDF; keyword arguments override the defaults."""
+    fields = {
+        "title": "Test Issue",
+        "year": 2025,
+        "season": "Fall",
+        "pdf_file": SimpleUploadedFile("issue.pdf", PDF, content_type="application/pdf"),
+    }
+    fields.update(kwargs)
+    return Magazine.objects.create(**fields)
@@ -0,0 +1,46 @@
+import hashlib
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework.test import APITestCase
+
+from . import MediaStorageMixin
+from ..models import Article
+
+DOCX = b"PK\x03\x04" + b"\0" * 100
+
+
+@mock.patch("woodtech.views.verify_recaptcha", return_value=True)
+@mock.patch("woodtech.models._send_article_email_async")
+class ArticleDeduplicationTests(MediaStorageMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+
+    def submit(self, content=DOCX, email="ada@example.com"):
+        response = self.client.post("/api/submit/", {
+            "first_name": "Ada", "last_name": "Wood", "title": "On Joinery", "email": email,
+            "recaptcha_token": "token", "file": SimpleUploadedFile("essay.docx", content),
+        }, format="multipart")
+        self.assertEqual(response.status_code, 201, response.content)
+        return Article.objects.get(pk=response.json()["id"])
+
+    def test_resubmission_reuses_file(self, send_email, verify):
+        first = self.submit()
+        second = self.submit()
+        self.assertEqual(first.file_sha256, hashlib.sha256(DOCX).hexdigest())
+        self.assertEqual(second.file_sha256, first.file_sha256)
+        self.assertEqual(second.file.name, first.file.name)
+
+        # Other content, or another author's identical file, is stored separately
+        self.assertNotEqual(self.submit(DOCX + b"\0").file.name, first.file.name)
+        self.assertNotEqual(self.submit(email="bo@example.com").file.name, first.file.name)
+
+    def test_shared_file_outlives_one_article(self, send_email, verify):
+        first = self.submit()
+        second = self.submit()
+        first.delete()
+        self.assertTrue(default_storage.exists(second.file.name))
+        second.delete()
+        self.assertFalse(default_storage.exists(second.file.name))
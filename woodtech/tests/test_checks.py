@@ -0,0 +1,38 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from ..checks import check_response_cache, check_snapshot_cache
+
+REDIS_CACHES = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://cache:6379/0"}}
+
+
+class SnapshotCacheCheckTests(SimpleTestCase):
+    def ids(self):
+        return [message.id for message in check_snapshot_cache(None)]
+
+    def test_process_local_cache_is_flagged(self):
+        with override_settings(CATALOGUE_SNAPSHOTS=True):
+            self.assertEqual(self.ids(), ["woodtech.W001"])
+        with override_settings(CATALOGUE_SNAPSHOTS=True, CATALOGUE_SNAPSHOT_REDIRECT=True):
+            self.assertEqual(self.ids(), ["woodtech.E001"])
+
+    @override_settings(CACHES=REDIS_CACHES, CATALOGUE_SNAPSHOTS=True, CATALOGUE_SNAPSHOT_REDIRECT=True)
+    def test_shared_cache_passes(self):
+        self.assertEqual(self.ids(), [])
+
+    def test_snapshots_off(self):
+        self.assertEqual(self.ids(), [])
+
+
+class ResponseCacheCheckTests(TestCase):
+    def test_process_local_cache_is_flagged(self):
+        self.assertEqual([message.id for message in check_response_cache(None)], ["woodtech.W002"])
+        with override_settings(CACHES=REDIS_CACHES):
+            self.assertEqual(check_response_cache(None), [])
+
+    def test_page_worker_reports_it(self):
+        stderr = StringIO()
+        call_command("process_page_jobs", "--once", stdout=StringIO(), stderr=stderr)
+        self.assertIn("woodtech.W002", stderr.getvalue())
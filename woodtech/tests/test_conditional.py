@@ -0,0 +1,62 @@
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.test import APITestCase
+
+from . import MediaStorageMixin, create_magazine
+from ..models import Banner
+
+
+class ConditionalGetTests(MediaStorageMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.magazine = create_magazine(is_published=True)
+
+    def test_magazine_list_not_modified(self):
+        response = self.client.get("/api/magazines/")
+        etag = response["ETag"]
+        self.assertNotIn("Last-Modified", response)
+
+        # Answered from the cache version, without a query
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/magazines/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_unpublishing_is_not_hidden_by_if_modified_since(self):
+        create_magazine(title="Second Issue", season="Winter", is_published=True)
+        self.assertEqual(self.client.get("/api/magazines/").json()["count"], 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.magazine.is_published = False
+            self.magazine.save()
+
+        response = self.client.get("/api/magazines/", HTTP_IF_MODIFIED_SINCE=http_date(timezone.now().timestamp()))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 1)
+
+    def test_change_produces_new_etag(self):
+        etag = self.client.get("/api/magazines/latest/")["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.magazine.title = "Renamed Issue"
+            self.magazine.save()
+
+        response = self.client.get("/api/magazines/latest/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+        # Deleting an issue changes the list even though no updated_at moved forward
+        etag = self.client.get("/api/magazines/")["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.magazine.delete()
+        self.assertEqual(self.client.get("/api/magazines/", HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_banner_and_countries(self):
+        Banner.objects.create(
+            banner_title="Call for submissions",
+            is_active=True,
+            desktop_main_text="Submit now",
+            desktop_link_text="Submit",
+            mobile_main_text="Submit now",
+        )
+        for url in ("/api/banner/active/", "/api/countries/"):
+            etag = self.client.get(url)["ETag"]
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
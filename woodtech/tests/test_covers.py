@@ -0,0 +1,89 @@
+import hashlib
+from io import BytesIO
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from . import MediaStorageMixin, create_magazine
+from ..magazine import covers
+from ..models import Magazine, MagazinePageJob, _email_cover_url
+
+
+def image_bytes(size, fmt="PNG", mode="RGB", color=(120, 80, 40, 255), **save_kwargs):
+    buffer = BytesIO()
+    Image.new(mode, size, color[:len(mode)]).save(buffer, format=fmt, **save_kwargs)
+    return buffer.getvalue()
+
+
+@override_settings(MEDIA_URL="/media/")
+class CoverImageTests(MediaStorageMixin, TestCase):
+    def test_variants_are_resized_and_stripped(self):
+        exif = Image.Exif()
+        exif[0x010F] = "Camera Maker"
+        source = BytesIO(image_bytes((1000, 1500), fmt="JPEG", exif=exif.tobytes()))
+
+        cover = covers.build_cover_variants(
+            source, "magazines/covers/test", "upload", widths=(320, 1280), formats=("webp", "jpeg")
+        )
+
+        sizes = sorted((v["format"], v["width"], v["height"]) for v in cover["variants"])
+        self.assertEqual(sizes, [("jpeg", 320, 480), ("jpeg", 1000, 1500), ("webp", 320, 480), ("webp", 1000, 1500)])
+        for variant in cover["variants"]:
+            with default_storage.open(variant["url"][len("/media/"):]) as stored, Image.open(stored) as image:
+                self.assertNotIn("exif", image.info)
+
+    def run_jobs(self):
+        with mock.patch.object(Magazine, "generate_page_images"):
+            while job := MagazinePageJob.claim_next():
+                self.assertTrue(job.run())
+
+    def test_uploaded_cover_is_processed_by_page_job(self):
+        cover = image_bytes((800, 1200), mode="RGBA")
+        magazine = create_magazine(cover_image=SimpleUploadedFile("cover.png", cover))
+        # Nothing is encoded in the request that uploaded the cover
+        magazine.refresh_from_db()
+        self.assertIsNone(magazine.cover_images)
+
+        self.run_jobs()
+        magazine.refresh_from_db()
+        self.assertEqual(magazine.cover_images["source"], f"upload:{hashlib.sha256(cover).hexdigest()}")
+        self.assertEqual({v["format"] for v in magazine.cover_images["variants"]}, set(covers.COVER_IMAGE_FORMATS))
+        self.assertIn("_640.jpg", _email_cover_url(magazine))
+
+    def test_replaced_cover_is_rebuilt(self):
+        magazine = create_magazine(cover_image=SimpleUploadedFile("cover.png", image_bytes((400, 600), color=(255, 0, 0))))
+        self.run_jobs()
+        magazine.refresh_from_db()
+        stored_name = magazine.cover_image.name
+
+        magazine.cover_image = SimpleUploadedFile("cover.png", image_bytes((400, 600), color=(0, 0, 255)))
+        magazine.save()
+        job = MagazinePageJob.objects.get(status="queued")
+        self.assertFalse(job.render_pages)
+        self.assertEqual(Magazine.objects.get(pk=magazine.pk).page_images_status, "done")
+        self.run_jobs()
+
+        magazine.refresh_from_db()
+        # Same storage name, new content
+        self.assertEqual(magazine.cover_image.name, stored_name)
+        webp = next(v for v in magazine.cover_images["variants"] if v["format"] == "webp")
+        with default_storage.open(webp["url"][len("/media/"):]) as stored, Image.open(stored) as image:
+            red, green, blue = image.convert("RGB").getpixel((0, 0))
+        self.assertGreater(blue, 200)
+        self.assertLess(red, 50)
+
+    def test_cover_derived_from_first_page(self):
+        magazine = create_magazine()
+        self.assertIsNone(magazine.cover_images)
+        page = default_storage.save("magazines/pages/2025_Fall/page_1.jpg", ContentFile(image_bytes((900, 1200), fmt="JPEG")))
+        magazine.page_images = [default_storage.url(page)]
+
+        magazine.generate_cover_images()
+
+        self.assertTrue(magazine.cover_images["source"].startswith("page:"))
+        magazine.refresh_from_db()
+        self.assertEqual(max(v["width"] for v in magazine.cover_images["variants"]), 900)
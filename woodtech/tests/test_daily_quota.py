@@ -0,0 +1,63 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import TestCase
+from django.utils import timezone
+
+from .. import models
+from ..models import ContactMessage, DailyQuota
+
+
+@mock.patch.object(models, "DAILY_CREATION_LIMIT", 2)
+class DailyQuotaTests(TestCase):
+    def message(self, email):
+        return ContactMessage(name="Reader", email=email, message="Hello")
+
+    def test_limit_enforced(self):
+        self.message("a@example.com").save()
+        self.message("b@example.com").save()
+        with self.assertRaises(ValidationError):
+            self.message("c@example.com").save()
+        self.assertEqual(ContactMessage.objects.count(), 2)
+        self.assertEqual(DailyQuota.objects.get(scope="contact_message", day=timezone.localdate()).count, 2)
+
+    def test_updates_and_repeated_validation_not_counted(self):
+        message = self.message("a@example.com")
+        # The admin validates the form, then save() validates again
+        message.full_clean()
+        message.save()
+        message.status = "read"
+        message.save()
+        self.assertEqual(DailyQuota.objects.get(scope="contact_message").count, 1)
+
+    def test_validation_alone_not_counted(self):
+        self.message("a@example.com").full_clean()
+        self.assertFalse(DailyQuota.objects.filter(scope="contact_message").exists())
+
+    def test_failed_insert_gives_slot_back(self):
+        message = self.message("a@example.com")
+        with mock.patch.object(ContactMessage, "save_base", side_effect=IntegrityError):
+            with self.assertRaises(IntegrityError):
+                message.save()
+        self.assertFalse(DailyQuota.objects.filter(scope="contact_message", count__gt=0).exists())
+        self.message("b@example.com").save()
+        self.message("c@example.com").save()
+        self.assertEqual(ContactMessage.objects.count(), 2)
+
+    def test_consume_is_atomic_check_and_increment(self):
+        self.assertTrue(DailyQuota.consume("test", limit=1))
+        self.assertFalse(DailyQuota.consume("test", limit=1))
+        self.assertEqual(DailyQuota.objects.get(scope="test").count, 1)
+
+    def test_reconcile(self):
+        self.message("a@example.com").save()
+        DailyQuota.objects.filter(scope="contact_message").update(count=2)
+        out = StringIO()
+        call_command("reconcile_daily_quotas", stdout=out)
+        today = timezone.localdate()
+        self.assertEqual(DailyQuota.objects.get(scope="contact_message", day=today).count, 1)
+        self.assertEqual(DailyQuota.objects.get(scope="article", day=today).count, 0)
+        self.assertIn("contact_message", out.getvalue())
@@ -0,0 +1,75 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core import signing
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+from storages.backends.s3 import S3Storage
+
+from . import MediaStorageMixin
+from .. import uploads
+from ..models import Article
+
+DOCX = b"PK\x03\x04" + b"\0" * 100
+
+
+class PresignTests(SimpleTestCase):
+    def test_presigned_post_is_scoped(self):
+        s3 = S3Storage(bucket_name="bucket", location="media")
+        with mock.patch.object(S3Storage, "bucket", new_callable=mock.PropertyMock) as bucket:
+            client = bucket.return_value.meta.client
+            client.generate_presigned_post.return_value = {"url": "https://bucket.s3.amazonaws.com/", "fields": {}}
+            data = uploads.presign("article", "My Essay.docx", s3)
+
+        (bucket_name, key), kwargs = client.generate_presigned_post.call_args
+        self.assertEqual(bucket_name, "bucket")
+        self.assertRegex(key, r"^media/articles/pending/[0-9a-f]{32}\.docx$")
+        self.assertIn(["content-length-range", 1, uploads.DIRECT_UPLOAD_MAX_SIZE], kwargs["Conditions"])
+        self.assertEqual(signing.loads(data["upload_token"], salt=uploads.TOKEN_SALT)["name"], key[len("media/"):])
+
+        with self.assertRaises(uploads.UploadError):
+            uploads.presign("article", "essay.exe", s3)
+
+
+@mock.patch("woodtech.views.verify_recaptcha", return_value=True)
+@mock.patch("woodtech.models._send_article_email_async")
+class FinalizeTests(MediaStorageMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+
+    def upload(self, content, kind="article", name="articles/pending/abc.docx"):
+        name = default_storage.save(name, ContentFile(content))
+        return name, signing.dumps({"kind": kind, "name": name}, salt=uploads.TOKEN_SALT)
+
+    def submit(self, token):
+        return self.client.post("/api/submit/", {
+            "first_name": "Ada", "last_name": "Wood", "title": "On Joinery", "email": "ada@example.com",
+            "recaptcha_token": "token", "upload_token": token,
+        })
+
+    def test_submit_with_upload_token(self, send_email, verify):
+        pending, token = self.upload(DOCX)
+        response = self.submit(token)
+        self.assertEqual(response.status_code, 201, response.content)
+
+        article = Article.objects.get()
+        self.assertRegex(article.file.name, r"^articles/\d{4}/\d{2}/\w+/article_on-joinery_Ada_\w+\.docx$")
+        self.assertEqual(article.file.read(), DOCX)
+        self.assertFalse(default_storage.exists(pending))
+
+        # The token can't be used again
+        self.assertEqual(self.submit(token).status_code, 400)
+
+    def test_rejected_uploads(self, send_email, verify):
+        _, token = self.upload(b"not a docx")
+        self.assertIn("upload_token", self.submit(token).json())
+        _, token = self.upload(DOCX, kind="collaborator")
+        self.assertIn("upload_token", self.submit(token).json())
+        self.assertEqual(self.submit("forged").status_code, 400)
+        self.assertFalse(Article.objects.exists())
+
+    def test_presign_needs_s3(self, send_email, verify):
+        response = self.client.post("/api/uploads/", {"kind": "article", "filename": "essay.docx"})
+        self.assertEqual(response.status_code, 501)
@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from . import MediaStorageMixin, create_magazine
+from ..models import Magazine
+
+
+class MagazineListTests(MediaStorageMixin, APITestCase):
+    url = "/api/magazines/"
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        for index in range(12):
+            create_magazine(
+                title=f"Issue {index}",
+                year=2000 + index,
+                is_published=True,
+                # Pairs share an upload date, so ties must be broken by id
+                date_uploaded=now - timedelta(days=index // 2),
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_page_numbers_by_default(self):
+        data = self.client.get(self.url, {"page_size": 5}).json()
+        self.assertEqual(data["count"], 12)
+        self.assertEqual(len(data["results"]), 5)
+
+    def test_cursor_pagination_walks_every_issue_once(self):
+        titles = []
+        url, params = self.url, {"pagination": "cursor", "page_size": 5}
+        with CaptureQueriesContext(connection) as queries:
+            while url:
+                data = self.client.get(url, params).json()
+                self.assertNotIn("count", data)
+                titles += [magazine["title"] for magazine in data["results"]]
+                url, params = data["next"], None
+
+        expected = list(Magazine.objects.order_by("-date_uploaded", "-id").values_list("title", flat=True))
+        self.assertEqual(titles, expected)
+        # No paginator COUNT(*); any OFFSET only skips rows sharing the cursor's date
+        self.assertFalse(any('"__count"' in query["sql"] for query in queries.captured_queries))
+
+    def test_compact_representation(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get(self.url, {"compact": "true", "page_size": 5}).json()
+        self.assertNotIn("page_images", data["results"][0])
+        self.assertNotIn("description", data["results"][0])
+        self.assertIn("cover_images", data["results"][0])
+        # The page manifest and description are not even loaded
+        select = next(query["sql"] for query in queries.captured_queries if "LIMIT" in query["sql"])
+        self.assertNotIn('"page_images"', select)
+        self.assertNotIn('"description"', select)
+
+    def test_sparse_fieldsets(self):
+        data = self.client.get(self.url, {"fields": "title,season_display", "pagination": "cursor"}).json()
+        self.assertEqual(data["results"][0], {"title": "Issue 1", "season_display": "Fall"})
+        self.assertIsNotNone(data["next"])
+
+        response = self.client.get(self.url, {"fields": "title,secret"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"detail": "Unknown fields: secret."})
+
+    def test_default_representation_unchanged(self):
+        data = self.client.get(self.url).json()
+        self.assertIn("page_images", data["results"][0])
+        self.assertIn("pages", data["results"][0])
+
+    def test_detail(self):
+        data = self.client.get("/api/magazines/2003/fall/").json()
+        self.assertEqual(data["title"], "Issue 3")
+        self.assertIn("pages", data)
+        self.assertEqual(self.client.get("/api/magazines/2003/Winter/").status_code, 404)
+
+        Magazine.objects.filter(year=2003).update(is_published=False)
+        cache.clear()
+        self.assertEqual(self.client.get("/api/magazines/2003/Fall/").status_code, 404)
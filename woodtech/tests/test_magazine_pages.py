@@ -0,0 +1,51 @@
+from unittest import mock
+
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from . import MediaStorageMixin, create_magazine
+from ..magazine import lazy
+from ..models import Magazine
+
+
+PAGE = {
+    "page": 1, "width": 1200, "height": 1600, "sha256": "abc",
+    "variants": [
+        {"name": "thumb", "format": "webp", "url": "/media/p1_thumb.webp", "width": 320, "height": 427, "bytes": 10},
+        {"name": "full", "format": "jpeg", "url": "/media/p1_full.jpg", "width": 1200, "height": 1600, "bytes": 90},
+    ],
+}
+
+
+class MagazinePageAPITests(MediaStorageMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.magazine = create_magazine(is_published=True)
+        Magazine.objects.filter(pk=self.magazine.pk).update(page_images=[PAGE], page_count=40)
+
+    def url(self, page_number):
+        return f"/api/magazines/{self.magazine.pk}/pages/{page_number}/"
+
+    def test_rendered_page_redirects(self):
+        response = self.client.get(self.url(1))
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response["Location"], "http://testserver/media/p1_full.jpg")
+
+        response = self.client.get(self.url(1), {"variant": "thumb", "image_format": "webp"})
+        self.assertEqual(response["Location"], "http://testserver/media/p1_thumb.webp")
+
+    def test_page_out_of_range(self):
+        self.assertEqual(self.client.get(self.url(41)).status_code, 404)
+
+    def test_unpublished_magazine(self):
+        Magazine.objects.filter(pk=self.magazine.pk).update(is_published=False)
+        self.assertEqual(self.client.get(self.url(1)).status_code, 404)
+
+    def test_concurrent_render_is_not_duplicated(self):
+        cache.add(f"magazine-page-render:{self.magazine.pk}:20", 1, 60)
+        with mock.patch.object(lazy, "PAGE_RENDER_WAIT", 0.5), \
+                mock.patch.object(lazy, "_render_and_store") as render:
+            response = self.client.get(self.url(20))
+        render.assert_not_called()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "2")
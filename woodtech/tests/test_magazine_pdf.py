@@ -0,0 +1,77 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+from storages.backends.s3 import S3Storage
+
+from . import MediaStorageMixin, create_magazine
+from .. import storage
+from ..magazine.delivery import RangeNotSatisfiable, parse_range
+from ..models import Magazine
+
+PDF = b"%PDF-1.4\n" + bytes(range(256)) * 4 + b"\n%%EOF\n"
+
+
+class ParseRangeTests(SimpleTestCase):
+    def test_ranges(self):
+        self.assertEqual(parse_range("bytes=0-99", 1000), (0, 99))
+        self.assertEqual(parse_range("bytes=900-", 1000), (900, 999))
+        self.assertEqual(parse_range("bytes=-100", 1000), (900, 999))
+        self.assertEqual(parse_range("bytes=990-2000", 1000), (990, 999))
+        # Multiple ranges and other units fall back to the whole file
+        self.assertIsNone(parse_range("bytes=0-1,5-6", 1000))
+        self.assertIsNone(parse_range("items=0-1", 1000))
+        with self.assertRaises(RangeNotSatisfiable):
+            parse_range("bytes=1000-", 1000)
+
+    def test_s3_range_is_fetched_remotely(self):
+        s3 = S3Storage(bucket_name="bucket", location="media")
+        with mock.patch.object(S3Storage, "bucket", new_callable=mock.PropertyMock) as bucket:
+            body = bucket.return_value.Object.return_value.get.return_value["Body"]
+            body.iter_chunks.return_value = iter([b"abc"])
+            self.assertEqual(b"".join(storage.iter_range("magazines/issue.pdf", 10, 12, s3)), b"abc")
+        bucket.return_value.Object.assert_called_once_with("media/magazines/issue.pdf")
+        bucket.return_value.Object.return_value.get.assert_called_once_with(Range="bytes=10-12")
+
+
+class MagazinePdfAPITests(MediaStorageMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.magazine = create_magazine(is_published=True, pdf_file=SimpleUploadedFile("issue.pdf", PDF))
+        self.url = f"/api/magazines/{self.magazine.pk}/pdf/"
+
+    def test_full_download(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), PDF)
+        self.assertEqual(response["Content-Length"], str(len(PDF)))
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+
+    def test_range_request(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=0-8")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), b"%PDF-1.4\n")
+        self.assertEqual(response["Content-Range"], f"bytes 0-8/{len(PDF)}")
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=-6")
+        self.assertEqual(b"".join(response.streaming_content), b"%%EOF\n")
+
+        response = self.client.get(self.url, HTTP_RANGE=f"bytes={len(PDF)}-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], f"bytes */{len(PDF)}")
+
+    def test_conditional_requests(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # A stale If-Range validator gets the whole, current file
+        response = self.client.get(self.url, HTTP_RANGE="bytes=0-8", HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(self.url, HTTP_RANGE="bytes=0-8", HTTP_IF_RANGE=etag)
+        self.assertEqual(response.status_code, 206)
+
+    def test_unpublished_magazine(self):
+        Magazine.objects.filter(pk=self.magazine.pk).update(is_published=False)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
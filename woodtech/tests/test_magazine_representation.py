@@ -0,0 +1,72 @@
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+
+from . import MediaStorageMixin, create_magazine
+from ..magazine import representation
+from ..models import Magazine
+from ..serializers import MagazineListSerializer, MagazineSerializer
+
+
+def variants(base):
+    return [
+        {"name": name, "format": fmt, "url": f"{base}_{name}.{fmt}", "width": width, "height": width, "bytes": 10}
+        for name, width in (("thumb", 320), ("full", 1275))
+        for fmt in ("webp", "jpeg")
+    ]
+
+
+class RepresentationTests(MediaStorageMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        pages = [
+            {"page": 1, "width": 100, "height": 130, "sha256": "a" * 64, "placeholder": "data:image/webp;base64,AA==",
+             "variants": variants("/media/magazines/images/2024_Fall/page_1"),
+             "tiles": {"tile_size": 256, "levels": []}},
+            # Rendered before dimensions and placeholders were recorded
+            {"page": 2, "variants": variants("/media/magazines/images/2024_Fall/page_2")},
+            # Absolute (S3) and awkward URLs
+            {"page": 3, "variants": variants("https://bucket.s3.amazonaws.com/media/page_3")},
+            {"page": 4, "variants": variants("/media/magazines/images/2024_Fall/pagé 4")},
+            {"page": 5, "variants": variants("/media/magazines/images/../2024_Fall/page_5")},
+        ]
+        cls.magazines = [
+            create_magazine(title="Full Issue", year=2024, is_published=True, description="Wood & more"),
+            create_magazine(title="Legacy Issue", year=2023, season="Winter", is_published=True, description=None),
+        ]
+        Magazine.objects.filter(pk=cls.magazines[0].pk).update(
+            page_images=pages, page_count=5,
+            cover_images={"source": "page:a", "variants": [
+                {"format": "webp", "url": "/media/magazines/covers/c_320.webp", "width": 320, "height": 400, "bytes": 5},
+            ]},
+        )
+        Magazine.objects.filter(pk=cls.magazines[1].pk).update(
+            page_images=["/media/magazines/images/2023_Winter/page_1.jpg"], cover_image="magazines/covers/c.png",
+        )
+
+    def assertSameBytes(self, serializer_class, fields=None, request=None):
+        request = request or RequestFactory().get("/api/magazines/")
+        field_names = serializer_class.field_names(fields)
+        queryset = Magazine.objects.order_by("-year")
+        expected = serializer_class(queryset, many=True, fields=fields, context={"request": request}).data
+        actual = representation.represent(
+            queryset.values(*representation.columns(field_names)), request, field_names, Magazine
+        )
+        self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
+
+    def test_full_representation(self):
+        self.assertSameBytes(MagazineSerializer)
+
+    def test_compact_and_sparse_representations(self):
+        self.assertSameBytes(MagazineListSerializer)
+        self.assertSameBytes(MagazineSerializer, fields=["season_display", "title", "pages"])
+
+    @override_settings(ALLOWED_HOSTS=["example.org"])
+    def test_other_hosts(self):
+        request = RequestFactory().get("/", secure=True, HTTP_HOST="example.org:8443")
+        self.assertSameBytes(MagazineSerializer, request=request)
+
+    def test_absolute_url_builder(self):
+        request = RequestFactory().get("/api/magazines/")
+        absolute_url = representation.absolute_url_builder(request)
+        for url in ("/media/a.jpg", "https://cdn.example.com/a.jpg?x=1", "/media/é.jpg", "//evil/a.jpg", "a.jpg"):
+            self.assertEqual(absolute_url(url), request.build_absolute_uri(url))
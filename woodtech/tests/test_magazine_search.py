@@ -0,0 +1,62 @@
+from unittest import mock
+
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from . import MediaStorageMixin, create_magazine
+from ..magazine import search
+from ..models import MagazinePageText
+
+
+class MagazineSearchTests(MediaStorageMixin, APITestCase):
+    url = "/api/magazines/search/"
+
+    def setUp(self):
+        cache.clear()
+        self.fall = create_magazine(title="Fall Issue", is_published=True)
+        self.winter = create_magazine(title="Winter Issue", season="Winter", is_published=False)
+        search.index_pages(self.fall, [
+            "Cover page",
+            "Building a walnut dining table with hand tools",
+            "",
+            "Finishing walnut: oil versus <lacquer>",
+        ])
+        search.index_pages(self.winter, ["A walnut cabinet"])
+
+    def test_page_hits_with_snippets(self):
+        response = self.client.get(self.url, {"q": "walnut"})
+        self.assertEqual(response.status_code, 200)
+
+        results = response.json()["results"]
+        self.assertEqual([issue["id"] for issue in results], [self.fall.pk])
+        pages = {hit["page"]: hit for hit in results[0]["pages"]}
+        self.assertEqual(set(pages), {2, 4})
+        self.assertIn("<mark>walnut</mark>", pages[2]["snippet"])
+        self.assertIn("&lt;lacquer&gt;", pages[4]["snippet"])
+        self.assertTrue(pages[2]["url"].endswith(f"/api/magazines/{self.fall.pk}/pages/2/"))
+
+    def test_issue_gone_after_search_is_skipped(self):
+        hits = search.search("walnut")
+
+        def search_then_unpublish(query):
+            # Unpublished between the search and loading the issues
+            type(self.fall).objects.filter(pk=self.fall.pk).update(is_published=False)
+            return hits
+
+        with mock.patch.object(search, "search", side_effect=search_then_unpublish):
+            response = self.client.get(self.url, {"q": "walnut"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"], [])
+
+    def test_reindex_replaces_text(self):
+        search.index_pages(self.fall, ["Oak only"])
+        self.assertEqual(MagazinePageText.objects.filter(magazine=self.fall).count(), 1)
+        self.assertEqual(self.client.get(self.url, {"q": "walnut"}).json()["results"], [])
+        self.assertEqual(len(self.client.get(self.url, {"q": "oak"}).json()["results"]), 1)
+
+    def test_query_syntax_is_not_interpreted(self):
+        response = self.client.get(self.url, {"q": '"walnut AND (table'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_missing_query(self):
+        self.assertEqual(self.client.get(self.url).status_code, 400)
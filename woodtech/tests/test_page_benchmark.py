@@ -0,0 +1,48 @@
+import os
+import re
+import shutil
+import tempfile
+import unittest
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from ..magazine import benchmark
+
+HAS_POPPLER = shutil.which("pdftoppm") is not None
+
+
+class SyntheticPdfTests(SimpleTestCase):
+    def test_page_count_and_density(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            text = benchmark.make_synthetic_pdf(os.path.join(workdir, "text.pdf"), 3, "text")
+            photo = benchmark.make_synthetic_pdf(os.path.join(workdir, "photo.pdf"), 3, "photo")
+            with open(text, "rb") as f:
+                data = f.read()
+            self.assertTrue(data.startswith(b"%PDF-"))
+            self.assertEqual(re.search(rb"/Count (\d+)", data).group(1), b"3")
+            # Photo-like pages are what makes real issues heavy
+            self.assertGreater(os.path.getsize(photo), os.path.getsize(text) * 2)
+
+    def test_fresh_process(self):
+        self.assertNotEqual(benchmark.in_fresh_process(os.getpid), os.getpid())
+
+
+@unittest.skipUnless(HAS_POPPLER, "poppler (pdftoppm) is not installed")
+class PipelineBenchmarkTests(SimpleTestCase):
+    def test_reports_stage_timings(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            pdf_path = benchmark.make_synthetic_pdf(os.path.join(workdir, "issue.pdf"), 6, "mixed")
+            result = benchmark.run_benchmark(pdf_path, dpi=72, render_threads=2, upload_concurrency=2)
+
+        self.assertEqual(result["pages"], 6)
+        self.assertEqual(set(result["stages"]), {"download", "render", "encode", "upload"})
+        self.assertTrue(all(seconds > 0 for seconds in result["stages"].values()))
+        self.assertGreater(result["output_bytes"], 0)
+        self.assertGreater(result["peak_rss_mb"], 0)
+
+    def test_command_compares_settings(self):
+        out = StringIO()
+        call_command("benchmark_page_images", "--synthetic-pages", "2", "--dpi", "50", "72", stdout=out)
+        self.assertEqual(out.getvalue().count("wall time:"), 2)
@@ -0,0 +1,149 @@
+import hashlib
+import os
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from storages.backends.s3 import S3Storage
+
+from . import PDF, MediaStorageMixin, create_magazine
+from .. import storage as woodtech_storage
+from ..magazine import rendering, search
+from ..models import Magazine, MagazinePageJob
+
+
+class FetchPdfTests(SimpleTestCase):
+    def test_s3_object_is_streamed_to_disk(self):
+        s3 = S3Storage(bucket_name="bucket", location="media")
+        with mock.patch.object(S3Storage, "bucket", new_callable=mock.PropertyMock) as bucket, \
+                mock.patch.object(S3Storage, "open") as storage_open, \
+                tempfile.TemporaryDirectory() as workdir:
+            body = bucket.return_value.Object.return_value.get.return_value["Body"]
+            body.iter_chunks.return_value = iter([b"%PDF-", b"1.4"])
+            path = os.path.join(workdir, "source.pdf")
+
+            self.assertEqual(rendering.fetch_pdf("magazines/issue.pdf", path, s3), hashlib.sha256(b"%PDF-1.4").hexdigest())
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), b"%PDF-1.4")
+        # Never through S3File, which buffers the whole object
+        storage_open.assert_not_called()
+        body.iter_chunks.assert_called_once_with(rendering.DOWNLOAD_CHUNK_SIZE)
+        body.close.assert_called_once_with()
+
+
+class MagazinePageJobTests(MediaStorageMixin, TestCase):
+    def test_save_enqueues_instead_of_rendering(self):
+        with mock.patch.object(Magazine, "generate_page_images") as render:
+            magazine = create_magazine()
+        render.assert_not_called()
+
+        magazine.refresh_from_db()
+        self.assertEqual(magazine.page_images_status, "queued")
+        self.assertEqual(MagazinePageJob.objects.filter(magazine=magazine, status="queued").count(), 1)
+
+    def test_enqueue_reuses_waiting_job(self):
+        magazine = create_magazine()
+        MagazinePageJob.enqueue(magazine)
+        self.assertEqual(MagazinePageJob.objects.filter(magazine=magazine).count(), 1)
+
+    def test_claim_and_run_marks_done(self):
+        magazine = create_magazine()
+        job = MagazinePageJob.claim_next()
+        self.assertEqual(job.status, "running")
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNone(MagazinePageJob.claim_next())
+
+        with mock.patch.object(Magazine, "generate_page_images"):
+            self.assertTrue(job.run())
+
+        job.refresh_from_db()
+        magazine.refresh_from_db()
+        self.assertEqual(job.status, "done")
+        self.assertEqual(magazine.page_images_status, "done")
+
+    def test_failure_is_retried_then_failed(self):
+        magazine = create_magazine()
+        with mock.patch.object(Magazine, "generate_page_images", side_effect=RuntimeError("boom")):
+            for attempt in range(1, MagazinePageJob.objects.get().max_attempts + 1):
+                MagazinePageJob.objects.update(run_after=timezone.now())
+                job = MagazinePageJob.claim_next()
+                self.assertEqual(job.attempts, attempt)
+                self.assertFalse(job.run())
+
+        job.refresh_from_db()
+        magazine.refresh_from_db()
+        self.assertEqual(job.status, "failed")
+        self.assertIn("boom", job.last_error)
+        self.assertEqual(magazine.page_images_status, "failed")
+
+    def test_retry_waits_for_backoff(self):
+        create_magazine()
+        job = MagazinePageJob.claim_next()
+        with mock.patch.object(Magazine, "generate_page_images", side_effect=RuntimeError("boom")):
+            job.run()
+        self.assertEqual(job.status, "queued")
+        self.assertIsNone(MagazinePageJob.claim_next())
+
+    def test_stale_running_job_is_reclaimed(self):
+        create_magazine()
+        job = MagazinePageJob.claim_next()
+        MagazinePageJob.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(days=1))
+
+        reclaimed = MagazinePageJob.claim_next()
+        self.assertEqual(reclaimed.pk, job.pk)
+        self.assertEqual(reclaimed.attempts, 2)
+
+    def test_pdf_is_read_once_per_render(self):
+        magazine = create_magazine()
+        storage = magazine.pdf_file.storage
+        with mock.patch.object(storage, "open", wraps=storage.open) as storage_open, \
+                mock.patch.object(rendering, "render_page_images", return_value=[]), \
+                mock.patch.object(rendering, "get_page_count", return_value=1), \
+                mock.patch.object(search, "index_pdf"):
+            magazine.generate_page_images()
+
+        # Only the download; saving the manifest doesn't validate (and re-read) the PDF
+        storage_open.assert_called_once_with(magazine.pdf_file.name, "rb")
+        magazine.refresh_from_db()
+        self.assertEqual((magazine.page_images, magazine.page_count), ([], 1))
+        self.assertEqual(magazine.pdf_sha256, hashlib.sha256(PDF).hexdigest())
+
+    def render_with_lazy_page_meanwhile(self, magazine):
+        """generate_page_images(force=True), with page 20 rendered on demand while the job renders."""
+        eager = [self.page(1, "new-1")]
+        lazy = self.page(20, "lazy-20")
+
+        def render(*args, **kwargs):
+            # What lazy._render_and_store does from a web request in the meantime
+            Magazine.objects.filter(pk=magazine.pk).update(page_images=[self.page(1, "old-1"), lazy])
+            return eager
+
+        with mock.patch.object(rendering, "render_page_images", side_effect=render), \
+                mock.patch.object(rendering, "get_page_count", return_value=40), \
+                mock.patch.object(search, "index_pdf"), \
+                mock.patch.object(woodtech_storage, "delete_urls") as delete_urls:
+            magazine.generate_page_images(force=True)
+        magazine.refresh_from_db()
+        return magazine.page_images, set(delete_urls.call_args.args[0])
+
+    @staticmethod
+    def page(number, name):
+        return {"page": number, "variants": [{"name": "full", "format": "jpeg", "url": f"/media/{name}.jpg"}]}
+
+    def test_lazy_page_rendered_during_job_is_kept(self):
+        magazine = create_magazine()
+        Magazine.objects.filter(pk=magazine.pk).update(pdf_sha256=hashlib.sha256(PDF).hexdigest())
+        magazine.refresh_from_db()
+        pages, deleted = self.render_with_lazy_page_meanwhile(magazine)
+        self.assertEqual([entry["page"] for entry in pages], [1, 20])
+        self.assertEqual(deleted, {"/media/old-1.jpg"})
+
+    def test_lazy_page_of_replaced_pdf_is_dropped(self):
+        magazine = create_magazine()
+        Magazine.objects.filter(pk=magazine.pk).update(pdf_sha256="0" * 64)
+        magazine.refresh_from_db()
+        pages, deleted = self.render_with_lazy_page_meanwhile(magazine)
+        self.assertEqual([entry["page"] for entry in pages], [1])
+        self.assertEqual(deleted, {"/media/old-1.jpg", "/media/lazy-20.jpg"})
@@ -0,0 +1,123 @@
+import base64
+import os
+import tempfile
+from io import BytesIO
+from unittest import mock
+
+from django.core.files.storage import FileSystemStorage
+from django.test import SimpleTestCase
+from PIL import Image
+from rest_framework.test import APIRequestFactory
+
+from ..magazine import manifest, tiles
+from ..magazine import rendering
+from ..magazine.rendering import encode_variants
+from ..models import Magazine
+from ..serializers import MagazineSerializer
+
+
+class EncodeVariantsTests(SimpleTestCase):
+    def test_widths_and_formats(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            path = os.path.join(workdir, "page.ppm")
+            Image.new("RGB", (1200, 1600), (200, 180, 160)).save(path)
+
+            width, height, encoded = encode_variants(
+                path, variants={"thumb": 300, "full": None}, formats=("webp", "jpeg")
+            )
+
+        self.assertEqual((width, height), (1200, 1600))
+        sizes = {(name, fmt): (w, h) for name, fmt, w, h, _ in encoded}
+        self.assertEqual(sizes[("thumb", "webp")], (300, 400))
+        self.assertEqual(sizes[("thumb", "jpeg")], (300, 400))
+        self.assertEqual(sizes[("full", "jpeg")], (1200, 1600))
+        self.assertTrue(all(data for *_, data in encoded))
+
+    def test_variant_wider_than_page_keeps_rendered_size(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            path = os.path.join(workdir, "page.ppm")
+            Image.new("RGB", (200, 300)).save(path)
+            _, _, encoded = encode_variants(path, variants={"medium": 960}, formats=("jpeg",))
+        self.assertEqual(encoded[0][2:4], (200, 300))
+
+
+class PlaceholderTests(SimpleTestCase):
+    def render_page(self, workdir):
+        path = os.path.join(workdir, "page.ppm")
+        Image.new("RGB", (1200, 1600), (200, 180, 160)).save(path)
+        return path
+
+    def test_placeholder_is_tiny_data_uri(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            placeholder = rendering.make_placeholder(self.render_page(workdir))
+
+        prefix = "data:image/webp;base64,"
+        self.assertTrue(placeholder.startswith(prefix))
+        self.assertLess(len(placeholder), 1024)
+        with Image.open(BytesIO(base64.b64decode(placeholder[len(prefix):]))) as image:
+            self.assertEqual(image.size, (16, 21))
+
+    def test_store_page_records_size_and_placeholder(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            storage = FileSystemStorage(location=os.path.join(workdir, "media"), base_url="/media/")
+            entry = rendering.store_page(self.render_page(workdir), 1, "pages", storage, "sig")
+            self.assertEqual((entry["width"], entry["height"]), (1200, 1600))
+            self.assertTrue(entry["placeholder"].startswith("data:image/"))
+
+            # An unchanged page from an older manifest gains a placeholder without re-uploading
+            previous = {key: value for key, value in entry.items() if key != "placeholder"}
+            with mock.patch.object(storage, "save") as save:
+                reused = rendering.store_page(self.render_page(workdir), 1, "pages", storage, "sig", previous_entry=previous)
+            save.assert_not_called()
+            self.assertEqual(reused["placeholder"], entry["placeholder"])
+
+
+class PageManifestSerializerTests(SimpleTestCase):
+    def setUp(self):
+        self.request = APIRequestFactory().get("/api/magazines/")
+
+    def serialize(self, page_images):
+        magazine = Magazine(title="Issue", year=2025, season="Fall", page_images=page_images)
+        return MagazineSerializer(magazine, context={"request": self.request}).data
+
+    def test_legacy_url_list(self):
+        data = self.serialize(["/media/magazines/pages/2025_Fall/page_1.jpg"])
+        self.assertEqual(data["page_images"], ["http://testserver/media/magazines/pages/2025_Fall/page_1.jpg"])
+        self.assertEqual(data["pages"][0]["page"], 1)
+        self.assertEqual(data["pages"][0]["variants"][0]["name"], "full")
+        self.assertIsNone(data["pages"][0]["placeholder"])
+
+    def test_variant_manifest(self):
+        entry = {
+            "page": 1, "width": 1200, "height": 1600,
+            "variants": [
+                {"name": "thumb", "format": "webp", "url": "/media/p_thumb.webp", "width": 320, "height": 427, "bytes": 10},
+                {"name": "full", "format": "jpeg", "url": "/media/p_full.jpg", "width": 1200, "height": 1600, "bytes": 90},
+            ],
+        }
+        data = self.serialize([entry])
+        self.assertEqual(data["page_images"], ["http://testserver/media/p_full.jpg"])
+        self.assertEqual(data["pages"][0]["variants"][0]["url"], "http://testserver/media/p_thumb.webp")
+        self.assertEqual(list(manifest.iter_urls([entry])), ["/media/p_thumb.webp", "/media/p_full.jpg"])
+
+
+class TilePyramidTests(SimpleTestCase):
+    def test_levels(self):
+        levels = tiles.pyramid_levels(1000, 600, tile_size=256)
+        self.assertEqual(levels[0], {"level": 0, "width": 1, "height": 1, "columns": 1, "rows": 1})
+        self.assertEqual(levels[-1], {"level": 10, "width": 1000, "height": 600, "columns": 4, "rows": 3})
+        self.assertEqual(levels[-2]["width"], 500)
+
+    def test_build_tiles_matches_derived_urls(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            path = os.path.join(workdir, "page.ppm")
+            Image.new("RGB", (600, 300), (10, 20, 30)).save(path)
+            storage = FileSystemStorage(location=os.path.join(workdir, "media"), base_url="/media/")
+
+            info = tiles.build_tiles(path, "magazines/pages/2025_Fall/tiles/page_1_abc", storage, tile_size=256)
+
+            names = sorted(url[len("/media/"):] for url in tiles.tile_urls(info))
+            self.assertTrue(all(storage.exists(name) for name in names))
+            with Image.open(storage.path("magazines/pages/2025_Fall/tiles/page_1_abc/10/2_1.jpg")) as corner:
+                # Bottom-right tile at full resolution: 600 - 512 + 1 overlap, 300 - 256 + 1 overlap
+                self.assertEqual(corner.size, (89, 45))
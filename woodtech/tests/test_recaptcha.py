@@ -0,0 +1,68 @@
+import threading
+import time
+from unittest import mock
+
+import requests
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from ..recaptcha import FakeRecaptchaBackend, GoogleRecaptchaBackend, RecaptchaVerifier
+
+
+class RecaptchaVerifierTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_fake_backend(self):
+        verifier = RecaptchaVerifier(FakeRecaptchaBackend())
+        self.assertTrue(verifier.verify("token-1"))
+        self.assertFalse(verifier.verify("fail-1"))
+        self.assertFalse(verifier.verify(""))
+
+    def test_replayed_token_rejected_locally(self):
+        backend = mock.Mock(wraps=FakeRecaptchaBackend())
+        verifier = RecaptchaVerifier(backend)
+        self.assertTrue(verifier.verify("token-1"))
+        self.assertFalse(verifier.verify("token-1"))
+        backend.verify.assert_called_once_with("token-1", None)
+
+    def test_google_backend_reuses_session_within_deadline(self):
+        backend = GoogleRecaptchaBackend(secret="secret", timeout=2.0, connect_timeout=0.5)
+        with mock.patch.object(backend.session, "post") as post:
+            post.return_value.json.return_value = {"success": True}
+            verifier = RecaptchaVerifier(backend)
+            self.assertTrue(verifier.verify("token-1", "203.0.113.7"))
+            self.assertTrue(verifier.verify("token-2"))
+        self.assertEqual(post.call_count, 2)
+        _, kwargs = post.call_args_list[0]
+        self.assertEqual(kwargs["timeout"], (0.5, 1.5))
+        self.assertEqual(kwargs["data"], {"secret": "secret", "response": "token-1", "remoteip": "203.0.113.7"})
+
+    def test_network_errors_fail_closed(self):
+        backend = GoogleRecaptchaBackend(secret="secret")
+        with mock.patch.object(backend.session, "post", side_effect=requests.Timeout):
+            self.assertFalse(RecaptchaVerifier(backend).verify("token-1"))
+
+    def test_network_error_does_not_use_up_token(self):
+        backend = GoogleRecaptchaBackend(secret="secret")
+        verifier = RecaptchaVerifier(backend)
+        with mock.patch.object(backend.session, "post", side_effect=requests.ConnectionError):
+            self.assertFalse(verifier.verify("token-1"))
+        with mock.patch.object(backend.session, "post") as post:
+            post.return_value.json.return_value = {"success": True}
+            self.assertTrue(verifier.verify("token-1"))
+
+    def test_slow_answer_times_out_at_deadline(self):
+        backend = GoogleRecaptchaBackend(secret="secret", timeout=0.2)
+        released = threading.Event()
+        self.addCleanup(released.set)
+
+        def trickle(*args, **kwargs):
+            # Never trips a socket timeout, but never finishes in time either
+            released.wait(5)
+            return mock.Mock(json=mock.Mock(return_value={"success": True}))
+
+        with mock.patch.object(backend.session, "post", side_effect=trickle):
+            started = time.monotonic()
+            self.assertFalse(RecaptchaVerifier(backend).verify("token-1"))
+            self.assertLess(time.monotonic() - started, 1)
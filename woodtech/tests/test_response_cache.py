@@ -0,0 +1,74 @@
+import threading
+import time
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+
+from . import MediaStorageMixin, create_magazine
+from .. import response_cache
+from ..models import Magazine
+
+
+class GetOrBuildTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_concurrent_misses_build_once(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"value": 1}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(response_cache.get_or_build("stampede", build)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"value": 1}] * 8)
+
+    def test_version_bump_orphans_entries(self):
+        response_cache.get_or_build("entry", lambda: "old")
+        response_cache._bump()
+        self.assertEqual(response_cache.get_or_build("entry", lambda: "new"), "new")
+
+
+class MagazineResponseCacheTests(MediaStorageMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.magazine = create_magazine(is_published=True)
+
+    def test_list_is_served_from_cache(self):
+        first = self.client.get("/api/magazines/")
+        with self.assertNumQueries(0):
+            second = self.client.get("/api/magazines/")
+        self.assertEqual(first.json(), second.json())
+        # Pagination parameters are part of the key
+        with self.assertNumQueries(2):
+            self.client.get("/api/magazines/", {"page_size": 5})
+
+    def test_save_invalidates(self):
+        self.assertEqual(self.client.get("/api/magazines/latest/").json()["title"], "Test Issue")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.magazine.title = "Renamed Issue"
+            self.magazine.save()
+
+        self.assertEqual(self.client.get("/api/magazines/latest/").json()["title"], "Renamed Issue")
+        self.assertEqual(self.client.get("/api/magazines/").json()["results"][0]["title"], "Renamed Issue")
+
+    def test_no_magazines(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Magazine.objects.filter(pk=self.magazine.pk).update(is_published=False)
+            response_cache.invalidate()
+        self.assertEqual(self.client.get("/api/magazines/latest/").status_code, 404)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get("/api/magazines/latest/").status_code, 404)
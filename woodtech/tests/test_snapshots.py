@@ -0,0 +1,98 @@
+import json
+import shutil
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import OperationalError
+from django.db.models.query import QuerySet
+from rest_framework.test import APITestCase
+
+from . import MediaStorageMixin, create_magazine
+from .. import snapshots, storage
+from ..magazine import lazy
+from ..models import Magazine
+
+
+def read(url):
+    with default_storage.open(storage.name_from_url(url), "rb") as f:
+        return json.loads(f.read())
+
+
+class CatalogueSnapshotTests(MediaStorageMixin, APITestCase):
+    def setUp(self):
+        cache.clear()
+        shutil.rmtree(f"{self.media_root}/catalogue", ignore_errors=True)
+        self.magazine = create_magazine(is_published=True)
+
+    def test_publish_matches_api(self):
+        snapshots.publish()
+        documents = snapshots.read_pointer()["documents"]
+        self.assertEqual(
+            read(documents["magazines/page-1"]["url"])["results"],
+            self.client.get("/api/magazines/").json()["results"],
+        )
+        self.assertEqual(read(documents["magazines/latest"]["url"]), self.client.get("/api/magazines/latest/").json())
+        self.assertEqual(read(documents["banner/active"]["url"]), {"has_active_banner": False, "banner": None})
+        self.assertNotIn("seasonal/active", documents)
+
+    def test_versions(self):
+        first = snapshots.publish()
+        self.assertEqual(snapshots.publish(), first)
+
+        with mock.patch.object(snapshots, "CATALOGUE_SNAPSHOT_KEEP", 2):
+            versions = [first]
+            for title in ("Second", "Third"):
+                Magazine.objects.filter(pk=self.magazine.pk).update(title=title)
+                versions.append(snapshots.publish())
+        self.assertEqual(len(set(versions)), 3)
+        self.assertEqual(snapshots.read_pointer()["history"], [versions[1]])
+        self.assertEqual(list(storage.walk(f"catalogue/{versions[0]}")), [])
+        self.assertTrue(list(storage.walk(f"catalogue/{versions[1]}")))
+
+    def test_published_by_worker_on_change(self):
+        with mock.patch.object(snapshots, "CATALOGUE_SNAPSHOTS", True), \
+                mock.patch.object(snapshots, "publish", wraps=snapshots.publish) as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.magazine.title = "Renamed Issue"
+                self.magazine.save()
+                self.magazine.description = "Edited twice"
+                self.magazine.save()
+            # Nothing is published in the request that made the change
+            publish.assert_not_called()
+
+            call_command("process_page_jobs", "--once", stdout=StringIO(), stderr=StringIO())
+            publish.assert_called_once_with()
+            call_command("process_page_jobs", "--once", stdout=StringIO(), stderr=StringIO())
+            publish.assert_called_once_with()
+
+        latest = snapshots.read_pointer()["documents"]["magazines/latest"]
+        self.assertEqual(read(latest["url"])["title"], "Renamed Issue")
+
+    def test_lazy_page_render_does_not_publish(self):
+        Magazine.objects.filter(pk=self.magazine.pk).update(page_count=40)
+        self.magazine.refresh_from_db()
+        with mock.patch.object(snapshots, "CATALOGUE_SNAPSHOTS", True), \
+                mock.patch.object(lazy.rendering, "render_single_page", return_value={"page": 20, "variants": []}), \
+                mock.patch.object(lazy, "local_pdf", return_value="issue.pdf"), \
+                self.captureOnCommitCallbacks(execute=True):
+            lazy.get_or_render_page(self.magazine, 20)
+        self.assertFalse(snapshots.publish_pending())
+
+    def test_redirect(self):
+        snapshots.publish()
+        documents = snapshots.read_pointer()["documents"]
+        with mock.patch.object(snapshots, "CATALOGUE_SNAPSHOT_REDIRECT", True):
+            response = self.client.get("/api/magazines/")
+            self.assertRedirects(response, documents["magazines/page-1"]["url"], fetch_redirect_response=False)
+            # Requests the snapshot doesn't cover still reach the API
+            self.assertEqual(self.client.get("/api/magazines/", {"compact": "true"}).status_code, 200)
+            self.assertEqual(self.client.get("/api/magazines/", {"page": 2}).status_code, 404)
+
+    def test_database_fallback(self):
+        snapshots.publish()
+        url = snapshots.read_pointer()["documents"]["magazines/latest"]["url"]
+        with mock.patch.object(QuerySet, "values", side_effect=OperationalError):
+            self.assertRedirects(self.client.get("/api/magazines/latest/"), url, fetch_redirect_response=False)
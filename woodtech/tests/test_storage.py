@@ -0,0 +1,50 @@
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import SimpleTestCase, TestCase, override_settings
+from storages.backends.s3 import S3Storage
+
+from . import MediaStorageMixin, create_magazine
+from .. import storage
+from ..models import Magazine
+
+
+class DeleteFilesS3Tests(SimpleTestCase):
+    def setUp(self):
+        self.storage = S3Storage(bucket_name="bucket", location="media", custom_domain="cdn.example.com")
+        patcher = mock.patch.object(S3Storage, "bucket", new_callable=mock.PropertyMock)
+        self.bucket = patcher.start().return_value
+        self.bucket.delete_objects.return_value = {}
+        self.addCleanup(patcher.stop)
+
+    def test_batches_keys(self):
+        names = [f"magazines/pages/2025_Fall/page_{n}.jpg" for n in range(2500)]
+        storage.delete_files(names + names[:10] + ["", None], self.storage)
+
+        calls = self.bucket.delete_objects.call_args_list
+        self.assertEqual([len(c.kwargs["Delete"]["Objects"]) for c in calls], [1000, 1000, 500])
+        self.assertEqual(calls[0].kwargs["Delete"]["Objects"][0], {"Key": "media/magazines/pages/2025_Fall/page_0.jpg"})
+        self.bucket.Object.assert_not_called()
+
+    def test_name_from_url(self):
+        url = self.storage.url("magazines/pages/2025_Fall/page_1.jpg")
+        self.assertEqual(storage.name_from_url(url, self.storage), "magazines/pages/2025_Fall/page_1.jpg")
+        self.assertIsNone(storage.name_from_url("https://elsewhere.example.com/x.jpg", self.storage))
+
+
+@override_settings(MEDIA_URL="/media/")
+class MagazineDeleteTests(MediaStorageMixin, TestCase):
+    def test_delete_removes_pdf_and_pages(self):
+        magazine = create_magazine()
+        page = default_storage.save("magazines/pages/2025_Fall/page_1.jpg", ContentFile(b"jpeg"))
+        Magazine.objects.filter(pk=magazine.pk).update(page_images=[default_storage.url(page)])
+        magazine.refresh_from_db()
+        pdf_name = magazine.pdf_file.name
+
+        with mock.patch.object(storage, "delete_files", wraps=storage.delete_files) as delete_files:
+            magazine.delete()
+
+        delete_files.assert_called_once()
+        self.assertFalse(default_storage.exists(pdf_name))
+        self.assertFalse(default_storage.exists(page))
@@ -0,0 +1,71 @@
+import hashlib
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from rest_framework.test import APITestCase
+
+from .. import uploads
+from ..upload_handlers import ValidatingUploadHandler
+
+DOCX = b"PK\x03\x04" + b"\0" * 5000
+
+
+def parse(content, name="essay.docx"):
+    request = RequestFactory().post("/api/submit/", {"file": SimpleUploadedFile(name, content), "title": "T"})
+    request.upload_handlers.insert(0, ValidatingUploadHandler(request, {"file": "article"}))
+    return request, request.FILES
+
+
+class ValidatingUploadHandlerTests(SimpleTestCase):
+    def test_valid_file_is_hashed(self):
+        request, files = parse(DOCX)
+        self.assertEqual(files["file"].read(), DOCX)
+        self.assertEqual(request.upload_digests, {"file": hashlib.sha256(DOCX).hexdigest()})
+        self.assertEqual(request.upload_errors, {})
+
+    def test_bad_signature_stops_the_upload(self):
+        request, files = parse(b"MZ" + b"\0" * 1024 * 1024)
+        self.assertNotIn("file", files)
+        self.assertEqual(request.upload_errors, {"file": "Unsupported file type."})
+        # The rest of the body (the file, then the title) is never read
+        self.assertNotIn("title", request.POST)
+        self.assertLess(request._stream._pos, 256 * 1024)
+
+    @override_settings(DATA_UPLOAD_MAX_MEMORY_SIZE=1024)
+    def test_oversized_request_refused_unread(self):
+        kinds = {**uploads.KINDS, "article": uploads.KINDS["article"]._replace(max_size=1024)}
+        with mock.patch.dict(uploads.KINDS, kinds):
+            request, files = parse(DOCX)
+        self.assertNotIn("file", files)
+        self.assertEqual(request.upload_errors, {"file": "File size must be under 1KB."})
+        self.assertEqual(request._stream._pos, 0)
+
+    def test_oversized_file_stops_the_upload(self):
+        kinds = {**uploads.KINDS, "article": uploads.KINDS["article"]._replace(max_size=1024)}
+        with mock.patch.dict(uploads.KINDS, kinds):
+            request, files = parse(DOCX)
+        self.assertNotIn("file", files)
+        self.assertEqual(request.upload_errors, {"file": "File size must be under 1KB."})
+
+    def test_extension_and_empty_files(self):
+        request, files = parse(DOCX, name="essay.pdf")
+        self.assertIn("Only .docx", request.upload_errors["file"])
+        request, files = parse(b"")
+        self.assertEqual(request.upload_errors, {"file": "The submitted file is empty."})
+
+
+@mock.patch("woodtech.views.verify_recaptcha", return_value=True)
+class SubmissionUploadTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_rejected_before_any_other_work(self, verify):
+        response = self.client.post("/api/submit/", {
+            "first_name": "Ada", "last_name": "Wood", "title": "On Joinery", "email": "ada@example.com",
+            "recaptcha_token": "token", "file": SimpleUploadedFile("essay.docx", b"<html>"),
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"file": ["Unsupported file type."]})
+        verify.assert_not_called()
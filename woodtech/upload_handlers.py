@@ -0,0 +1,123 @@
+"""
+Streaming validation of multipart submission uploads.
+
+Django normally receives a whole upload (spooling it to memory or disk)
+before any validator sees it. ValidatingUploadHandler sits in front of the
+default handlers and checks each file as its chunks arrive, using the rules
+in uploads.KINDS:
+
+- the declared size and the running size against the kind's limit,
+- the extension, and the leading bytes against the kind's file signatures,
+- a SHA-256 of the content, computed along the way.
+
+A file that fails stops the upload at once (StopUpload with
+connection_reset): nothing more of the request body is read, and the view
+answers 400 with the reason. The connection is closed afterwards, since the
+unread body is still on it. A request whose Content-Length already exceeds
+the view's file limits plus Django's allowance for the other fields
+(DATA_UPLOAD_MAX_MEMORY_SIZE) is refused before any of the body is read.
+Digests of accepted files end up in request.upload_digests, keyed by field
+name, so nothing has to read the file again to hash it.
+
+Views opt in with ValidatedUploadsMixin and an `upload_kinds` mapping of
+form field to upload kind.
+"""
+import hashlib
+import os
+
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+from django.http import QueryDict
+from django.utils.datastructures import MultiValueDict
+from rest_framework.exceptions import ValidationError
+
+from woodtech import uploads
+
+# Enough leading bytes to tell every signature in uploads.py apart
+SNIFF_SIZE = 16
+
+
+class ValidatingUploadHandler(FileUploadHandler):
+    def __init__(self, request, kinds):
+        super().__init__(request)
+        self.kinds = kinds
+        self.spec = None
+        request.upload_errors = {}
+        request.upload_digests = {}
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        specs = {field: uploads.KINDS[kind] for field, kind in self.kinds.items()}
+        max_length = sum(spec.max_size for spec in specs.values()) + (settings.DATA_UPLOAD_MAX_MEMORY_SIZE or 0)
+        if specs and content_length > max_length:
+            # Too big whatever it holds: refuse without reading any of it
+            for field, spec in specs.items():
+                self.request.upload_errors[field] = uploads.size_error(spec.max_size)
+            return QueryDict(encoding=encoding), MultiValueDict()
+        return None
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        kind = self.kinds.get(field_name)
+        self.spec = uploads.KINDS[kind] if kind else None
+        if self.spec is None:
+            return
+        self.size = 0
+        self.head = b""
+        self.sha256 = hashlib.sha256()
+        if self.spec.extensions and os.path.splitext(file_name)[1].lower() not in self.spec.extensions:
+            self.reject(f"Only {', '.join(self.spec.extensions)} files are allowed.")
+        if content_length and content_length > self.spec.max_size:
+            self.reject(uploads.size_error(self.spec.max_size))
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.spec is None:
+            return raw_data
+        self.size += len(raw_data)
+        if self.size > self.spec.max_size:
+            self.reject(uploads.size_error(self.spec.max_size))
+        if len(self.head) < SNIFF_SIZE:
+            self.head += raw_data[:SNIFF_SIZE - len(self.head)]
+            if len(self.head) >= SNIFF_SIZE:
+                self.check_signature()
+        self.sha256.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        if self.spec is None:
+            return None
+        # The whole file is in by now; recording the error still fails the request
+        if not self.size:
+            self.request.upload_errors[self.field_name] = "The submitted file is empty."
+        elif len(self.head) < SNIFF_SIZE and self.spec.signatures and not self.head.startswith(self.spec.signatures):
+            self.request.upload_errors[self.field_name] = "Unsupported file type."
+        else:
+            self.request.upload_digests[self.field_name] = self.sha256.hexdigest()
+        # Let the default handlers build the file object
+        return None
+
+    def check_signature(self):
+        if self.spec.signatures and not self.head.startswith(self.spec.signatures):
+            self.reject("Unsupported file type.")
+
+    def reject(self, message):
+        self.request.upload_errors[self.field_name] = message
+        self.spec = None
+        # Stop reading the body altogether; the request fails anyway
+        raise StopUpload(connection_reset=True)
+
+
+class ValidatedUploadsMixin:
+    """APIView mixin: validate `upload_kinds` ({field: uploads.KINDS key}) while the request streams in."""
+    upload_kinds = {}
+
+    def initialize_request(self, request, *args, **kwargs):
+        request.upload_handlers.insert(0, ValidatingUploadHandler(request, self.upload_kinds))
+        return super().initialize_request(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method == "POST":
+            request.data  # parse now, so a rejected file stops the request before any other work
+            errors = getattr(request, "upload_errors", None)
+            if errors:
+                raise ValidationError({field: [message] for field, message in errors.items()})
@@ -0,0 +1,142 @@
+"""
+Direct-to-storage uploads for article manuscripts and collaborator files.
+
+Multipart uploads through Django keep a sync worker busy for as long as a
+slow client takes to send up to 10 MB. Instead, the browser can upload
+straight to S3:
+
+1. POST /api/uploads/ {"kind": "article", "filename": "essay.docx"} returns
+   a presigned POST (`url` and form `fields`) for a pending key such as
+   articles/pending/<uuid>.docx, plus a signed `upload_token` naming that key.
+2. The browser POSTs the file to `url` with `fields`. S3 enforces the size
+   limit and content type.
+3. The form is submitted to /api/submit/ or /api/collaborate/ with
+   `upload_token` instead of `file`. `finalize()` checks the stored object's
+   size and file signature. `claim()` then moves it to the name the model's
+   upload_to gives it, with a server-side copy, and the row is created as usual.
+
+Pending objects that are never finalized are not cleaned up here; expire
+the */pending/ prefixes with a bucket lifecycle rule. The bucket's CORS
+configuration must allow POSTs from the site's origin.
+
+KINDS describes each kind of submission file (extensions, leading bytes,
+size limit); upload_handlers.py applies the same rules to multipart uploads.
+"""
+import mimetypes
+import os
+import uuid
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import default_storage
+from storages.backends.s3 import S3Storage
+
+from woodtech import storage
+
+DIRECT_UPLOAD_EXPIRES = getattr(settings, "DIRECT_UPLOAD_EXPIRES", 15 * 60)  # seconds
+DIRECT_UPLOAD_MAX_SIZE = getattr(settings, "DIRECT_UPLOAD_MAX_SIZE", 10 * 1024 * 1024)
+
+TOKEN_SALT = "woodtech.uploads"
+
+
+class UploadKind(NamedTuple):
+    prefix: str
+    extensions: tuple  # allowed extensions, or () for any
+    signatures: tuple  # allowed leading bytes, or () for any
+    max_size: int
+
+
+# Leading bytes of the file types submissions may contain
+DOCX_SIGNATURES = (b"PK\x03\x04",)  # .docx files are zip archives
+PDF_SIGNATURES = (b"%PDF-",)
+IMAGE_SIGNATURES = (
+    b"\xff\xd8\xff",  # JPEG
+    b"\x89PNG\r\n\x1a\n",
+    b"GIF87a", b"GIF89a",
+    b"BM",
+    b"RIFF",  # WebP (RIFF....WEBP)
+)
+
+KINDS = {
+    "article": UploadKind("articles/pending", (".docx",), DOCX_SIGNATURES, DIRECT_UPLOAD_MAX_SIZE),
+    # A logo or a writing sample. Collaborator.logo_or_sample has no validators of
+    # its own, so this 10 MB cap and the type check only apply to files submitted
+    # through the API (direct or multipart); the admin accepts anything.
+    "collaborator": UploadKind(
+        "collaborators/pending", (), IMAGE_SIGNATURES + PDF_SIGNATURES + DOCX_SIGNATURES, DIRECT_UPLOAD_MAX_SIZE
+    ),
+}
+
+
+def size_error(max_size):
+    if max_size >= 1024 * 1024:
+        return f"File size must be under {max_size // (1024 * 1024)}MB."
+    return f"File size must be under {max_size // 1024}KB."
+
+
+class UploadError(Exception):
+    pass
+
+
+class DirectUploadsUnavailable(UploadError):
+    pass
+
+
+def presign(kind, filename, storage_backend=None):
+    """Presigned POST for uploading one `kind` file straight to S3, and the token to finalize it with."""
+    storage_backend = storage_backend or default_storage
+    if not isinstance(storage_backend, S3Storage):
+        raise DirectUploadsUnavailable("Direct uploads need S3 storage.")
+    spec = KINDS[kind]
+    ext = os.path.splitext(filename)[1].lower()
+    if spec.extensions and ext not in spec.extensions:
+        raise UploadError(f"Only {', '.join(spec.extensions)} files are allowed.")
+
+    name = f"{spec.prefix}/{uuid.uuid4().hex}{ext}"
+    content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    post = storage_backend.bucket.meta.client.generate_presigned_post(
+        storage_backend.bucket_name,
+        storage.object_key(name, storage_backend),
+        Fields={"Content-Type": content_type},
+        Conditions=[{"Content-Type": content_type}, ["content-length-range", 1, spec.max_size]],
+        ExpiresIn=DIRECT_UPLOAD_EXPIRES,
+    )
+    return {
+        "url": post["url"],
+        "fields": post["fields"],
+        "upload_token": signing.dumps({"kind": kind, "name": name}, salt=TOKEN_SALT),
+        "expires_in": DIRECT_UPLOAD_EXPIRES,
+        "max_size": spec.max_size,
+    }
+
+
+def finalize(upload_token, kind, storage_backend=None):
+    """Storage name of the pending upload behind `upload_token`, once its size and signature check out."""
+    try:
+        # Allow for a client that starts its upload just before the presigned POST expires
+        payload = signing.loads(upload_token, salt=TOKEN_SALT, max_age=2 * DIRECT_UPLOAD_EXPIRES)
+    except signing.BadSignature:
+        raise UploadError("Invalid or expired upload token.")
+    if payload.get("kind") != kind:
+        raise UploadError("This upload token is for a different kind of file.")
+
+    spec, name = KINDS[kind], payload["name"]
+    try:
+        info = storage.stat(name, storage_backend)
+    except Exception:
+        raise UploadError("The file has not been uploaded (or was already used).")
+    if not 0 < info.size <= spec.max_size:
+        raise UploadError(size_error(spec.max_size))
+    if spec.signatures:
+        head = b"".join(storage.iter_range(name, 0, max(map(len, spec.signatures)) - 1, storage_backend))
+        if not head.startswith(spec.signatures):
+            raise UploadError("Unsupported file type.")
+    return name
+
+
+def claim(name, instance, field_name, storage_backend=None):
+    """Move the finalized upload `name` to where `instance`'s file field would store it, and assign it."""
+    field = instance._meta.get_field(field_name)
+    final_name = field.generate_filename(instance, os.path.basename(name))
+    setattr(instance, field_name, storage.move(name, final_name, storage_backend or field.storage))
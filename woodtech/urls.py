@@ -1,12 +1,18 @@
 from django.urls import path
-from .views import MagazineListListAPIView, ArticleCreateAPIView, SubscribeView, get_csrf_token, CollaboratorCreateAPIView, LatestMagazineAPIView, health_check, ContactMessageCreateAPIView, ping_view, ask_endpoint, active_season_api, ActiveBannerAPIView, country_list
+from .views import MagazineListListAPIView, MagazineDetailAPIView, MagazinePageAPIView, MagazinePageTilesAPIView, MagazineSearchAPIView, MagazinePdfAPIView, ArticleCreateAPIView, SubscribeView, get_csrf_token, CollaboratorCreateAPIView, DirectUploadAPIView, LatestMagazineAPIView, health_check, ContactMessageCreateAPIView, ping_view, ask_endpoint, active_season_api, ActiveBannerAPIView, country_list
 
 urlpatterns = [
     path('magazines/', MagazineListListAPIView.as_view(), name='magazine-list'),
     path('submit/', ArticleCreateAPIView.as_view(), name='article-submit'),
     path('subscribe/', SubscribeView.as_view(), name='subscribe'),
     path('collaborate/', CollaboratorCreateAPIView.as_view(), name='collaborator-create'),
+    path('uploads/', DirectUploadAPIView.as_view(), name='direct-upload'),
     path('magazines/latest/', LatestMagazineAPIView.as_view(), name='latest-magazine'),
+    path('magazines/search/', MagazineSearchAPIView.as_view(), name='magazine-search'),
+    path('magazines/<int:pk>/pdf/', MagazinePdfAPIView.as_view(), name='magazine-pdf'),
+    path('magazines/<int:pk>/pages/<int:page_number>/', MagazinePageAPIView.as_view(), name='magazine-page'),
+    path('magazines/<int:pk>/pages/<int:page_number>/tiles/', MagazinePageTilesAPIView.as_view(), name='magazine-page-tiles'),
+    path('magazines/<int:year>/<str:season>/', MagazineDetailAPIView.as_view(), name='magazine-detail'),
     path('contact/', ContactMessageCreateAPIView.as_view(), name='contact-message-create'),
 
     path('get-csrf/', get_csrf_token),
@@ -1,29 +1,37 @@
 import logging
+import os
 import requests
 from datetime import datetime
 
-from django.http import JsonResponse
+from django.http import JsonResponse, HttpResponseRedirect
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.views.decorators.csrf import ensure_csrf_cookie
+from django.views.decorators.http import condition
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django_ratelimit.decorators import ratelimit
 from django_ratelimit.exceptions import Ratelimited  
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
-from django.conf import settings
 
 from rest_framework import status, generics
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.permissions import AllowAny
 
 from .models import Magazine, Article, Subscriber, Collaborator, ContactMessage
+from woodtech import conditional, recaptcha, response_cache, snapshots, uploads
+from woodtech.upload_handlers import ValidatedUploadsMixin
+from woodtech.magazine import delivery, lazy, manifest, representation, search, tiles
 from .serializers import (
     MagazineSerializer,
+    MagazineListSerializer,
     ArticleSerializer,
     SubscriberSerializer,
     CollaboratorCreateSerializer,
     ContactMessageSerializer,
+    DirectUploadSerializer,
     AskSerializer
 )
 
@@ -33,29 +41,8 @@ logger = logging.getLogger(__name__)
 def ping_view(request):
     return JsonResponse({"message": "pong"})
 
-def verify_recaptcha(token):
-    payload = {
-        'secret': settings.RECAPTCHA_SECRET_KEY,
-        'response': token
-    }
-    try:
-        response = requests.post(
-            'https://www.google.com/recaptcha/api/siteverify',
-            data=payload,
-            timeout=5
-        )
-        result = response.json()
-
-        if result.get('success', False):
-            print("✅ reCAPTCHA verification successful:", result)
-            return True
-        else:
-            print("❌ reCAPTCHA verification failed:", result)
-            return False
-
-    except requests.RequestException as e:
-        print("⚠️ reCAPTCHA request failed:", e)
-        return False
+def verify_recaptcha(token, remote_ip=None):
+    return recaptcha.get_verifier().verify(token, remote_ip)
 
 # Custom mixin to handle rate limiting
 class RateLimitHandlerMixin:
@@ -94,14 +81,99 @@ class MagazinePagination(PageNumberPagination):
     page_size_query_param = 'page_size'
     max_page_size = 100
 
+
+class MagazineCursorPagination(CursorPagination):
+    """
+    Keyset pagination for infinite scroll: no COUNT(*) and no OFFSET, so deep
+    archive pages cost the same as the first. Uses the is_published/date index.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-date_uploaded', '-id')
+
+
+def magazine_paginator(request):
+    """Cursor pagination when asked for (?pagination=cursor or a ?cursor=), page numbers otherwise."""
+    if request.query_params.get('pagination') == 'cursor' or 'cursor' in request.query_params:
+        return MagazineCursorPagination()
+    return MagazinePagination()
+
+def requested_fields(request):
+    """
+    Field names from ?fields=a,b,c, or None when not given.
+    Raises ValueError naming any field the magazine serializer doesn't have.
+    """
+    value = request.query_params.get('fields')
+    if not value:
+        return None
+    fields = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in MagazineSerializer.Meta.fields]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}.")
+    return fields
+
+
 @method_decorator(ratelimit(key='ip', rate='100/m', block=True), name='dispatch')
 class MagazineListListAPIView(RateLimitHandlerMixin, APIView):
+    """
+    Published magazines, newest first.
+    ?compact=true gives the archive-grid representation (no pages, PDF or description)
+    and ?fields=a,b,c any subset of fields; only the columns those need are loaded.
+    Full issue data is at /api/magazines/<year>/<season>/.
+    """
+    @method_decorator(snapshots.redirect_to_snapshot(snapshots.list_document))
+    @method_decorator(condition(etag_func=conditional.magazines_etag))
     def get(self, request):
-        magazines = Magazine.objects.filter(is_published=True).order_by('-date_uploaded')
-        paginator = MagazinePagination()
-        result_page = paginator.paginate_queryset(magazines, request)
-        serializer = MagazineSerializer(result_page, many=True, context={'request': request})
-        return paginator.get_paginated_response(serializer.data)
+        try:
+            fields = requested_fields(request)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        compact = request.query_params.get('compact', '').lower() in ('1', 'true', 'yes')
+        serializer_class = MagazineListSerializer if compact else MagazineSerializer
+        fields = serializer_class.field_names(fields)
+
+        def build():
+            # Only the columns the fields need, so the page manifest and description are
+            # skipped unless asked for; date_uploaded is always read because cursors use it
+            magazines = Magazine.objects.filter(is_published=True).order_by('-date_uploaded', '-id').values(
+                'date_uploaded', *representation.columns(fields)
+            )
+            paginator = magazine_paginator(request)
+            result_page = paginator.paginate_queryset(magazines, request)
+            data = representation.represent(result_page, request, fields, Magazine)
+            return paginator.get_paginated_response(data).data
+
+        name = response_cache.request_key(
+            request, 'list', params=('page', 'page_size', 'pagination', 'cursor', 'fields', 'compact')
+        )
+        return Response(response_cache.get_or_build(name, build))
+
+
+@method_decorator(ratelimit(key='ip', rate='100/m', block=True), name='dispatch')
+class MagazineDetailAPIView(RateLimitHandlerMixin, APIView):
+    """One published issue by year and season (case-insensitive), with its pages."""
+    @method_decorator(condition(etag_func=conditional.magazines_etag))
+    def get(self, request, year, season):
+        try:
+            fields = requested_fields(request)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        fields = MagazineSerializer.field_names(fields)
+
+        def build():
+            rows = Magazine.objects.filter(is_published=True, year=year, season__iexact=season).values(
+                *representation.columns(fields)
+            )[:1]
+            # An empty dict (rather than None) so a missing issue is cached too
+            return next(iter(representation.represent(rows, request, fields, Magazine)), {})
+
+        name = response_cache.request_key(request, f'detail:{year}:{season.lower()}', params=('fields',))
+        data = response_cache.get_or_build(name, build)
+        if not data:
+            return Response({"detail": "Magazine not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(data)
 
     # def post(self, request):
     #     serializer = MagazineSerializer(data=request.data, context={'request': request})
@@ -117,9 +189,14 @@ class MagazineListListAPIView(RateLimitHandlerMixin, APIView):
     #         )
 
 @method_decorator(ratelimit(key='ip', rate='5/m', block=True), name='dispatch')
-class ArticleCreateAPIView(RateLimitHandlerMixin, generics.CreateAPIView):
+class ArticleCreateAPIView(RateLimitHandlerMixin, ValidatedUploadsMixin, generics.CreateAPIView):
     queryset = Article.objects.all()
     serializer_class = ArticleSerializer
+    upload_kinds = {'file': 'article'}
+
+    def perform_create(self, serializer):
+        # Hashed by ValidatingUploadHandler as the file streamed in; direct uploads aren't hashed
+        serializer.save(file_sha256=self.request.upload_digests.get('file', ''))
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -175,10 +252,29 @@ class SubscribeView(RateLimitHandlerMixin, APIView):
                 status=status.HTTP_429_TOO_MANY_REQUESTS
             )
 
+@method_decorator(ratelimit(key='ip', rate='10/m', block=True), name='dispatch')
+class DirectUploadAPIView(RateLimitHandlerMixin, APIView):
+    """
+    Presigned POST for uploading an article manuscript or collaborator file straight
+    to storage; submit the returned upload_token to /api/submit/ or /api/collaborate/.
+    """
+    def post(self, request):
+        serializer = DirectUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            data = uploads.presign(serializer.validated_data['kind'], serializer.validated_data['filename'])
+        except uploads.DirectUploadsUnavailable as e:
+            return Response({"detail": str(e)}, status=status.HTTP_501_NOT_IMPLEMENTED)
+        except uploads.UploadError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(data, status=status.HTTP_201_CREATED)
+
+
 @method_decorator(ratelimit(key='ip', rate='5/m', block=True), name='dispatch')
-class CollaboratorCreateAPIView(RateLimitHandlerMixin, generics.CreateAPIView):
+class CollaboratorCreateAPIView(RateLimitHandlerMixin, ValidatedUploadsMixin, generics.CreateAPIView):
     queryset = Collaborator.objects.all()
     serializer_class = CollaboratorCreateSerializer
+    upload_kinds = {'logo_or_sample': 'collaborator'}
     permission_classes = [AllowAny]
 
     def create(self, request, *args, **kwargs):
@@ -205,14 +301,136 @@ class CollaboratorCreateAPIView(RateLimitHandlerMixin, generics.CreateAPIView):
 
 @method_decorator(ratelimit(key='ip', rate='100/m', block=True), name='dispatch')
 class LatestMagazineAPIView(RateLimitHandlerMixin, APIView):
+    @method_decorator(snapshots.redirect_to_snapshot('magazines/latest'))
+    @method_decorator(condition(etag_func=conditional.magazines_etag))
     def get(self, request):
-        latest = Magazine.objects.filter(is_published=True).order_by('-date_uploaded').first()
-        if not latest:
+        def build():
+            fields = MagazineSerializer.field_names()
+            rows = Magazine.objects.filter(is_published=True).order_by('-date_uploaded', '-id').values(
+                *representation.columns(fields)
+            )[:1]
+            # An empty dict (rather than None) so "no magazines" is cached too
+            return next(iter(representation.represent(rows, request, fields, Magazine)), {})
+
+        data = response_cache.get_or_build(response_cache.request_key(request, 'latest'), build)
+        if not data:
             return Response({"detail": "No magazines found."}, status=status.HTTP_404_NOT_FOUND)
-        serializer = MagazineSerializer(latest, context={'request': request})
-        return Response(serializer.data)
+        return Response(data)
     
 
+@method_decorator(ratelimit(key='ip', rate='100/m', block=True), name='dispatch')
+class MagazinePageAPIView(RateLimitHandlerMixin, APIView):
+    """
+    Redirects to the image for one page of a published magazine.
+    Pages that were not rendered up front are rendered on the first request.
+    Optional ?variant=thumb|medium|full and ?image_format=webp|jpeg pick the image (default: full JPEG).
+    """
+    def get(self, request, pk, page_number):
+        magazine = get_object_or_404(Magazine, pk=pk, is_published=True)
+        if page_number < 1 or (magazine.page_count and page_number > magazine.page_count):
+            return Response({"detail": "Page not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            entry = lazy.get_or_render_page(magazine, page_number)
+        except lazy.PageNotFound:
+            return Response({"detail": "Page not found."}, status=status.HTTP_404_NOT_FOUND)
+        except lazy.PageRenderBusy:
+            return Response(
+                {"detail": "Page is being rendered. Please try again shortly."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": "2"}
+            )
+
+        url = manifest.page_url(
+            entry,
+            request.query_params.get('variant', 'full'),
+            request.query_params.get('image_format', 'jpeg')
+        )
+        response = HttpResponseRedirect(request.build_absolute_uri(url))
+        # The target changes if the PDF is replaced, so only cache briefly
+        response['Cache-Control'] = 'public, max-age=300'
+        return response
+
+
+@method_decorator(ratelimit(key='ip', rate='100/m', block=True), name='dispatch')
+class MagazinePageTilesAPIView(RateLimitHandlerMixin, APIView):
+    """
+    Deep-zoom manifest for one page: pyramid levels, tile URL template and an
+    inline DZI descriptor. Only available when page tiling is enabled.
+    """
+    def get(self, request, pk, page_number):
+        magazine = get_object_or_404(Magazine, pk=pk, is_published=True)
+        entry = lazy.find_page(magazine, page_number)
+        if not entry or not entry.get('tiles'):
+            return Response({"detail": "No tiles for this page."}, status=status.HTTP_404_NOT_FOUND)
+
+        page_tiles = {**entry['tiles'], 'url': request.build_absolute_uri(entry['tiles']['url'])}
+        return Response({
+            'page': page_number,
+            'width': page_tiles['width'],
+            'height': page_tiles['height'],
+            'tile_size': page_tiles['tile_size'],
+            'overlap': page_tiles['overlap'],
+            'format': page_tiles['format'],
+            'tile_url_template': page_tiles['url'] + '/{level}/{column}_{row}.jpg',
+            'levels': tiles.pyramid_levels(page_tiles['width'], page_tiles['height'], page_tiles['tile_size']),
+            'dzi': tiles.dzi_descriptor(page_tiles),
+        })
+
+
+# Readers fetch a PDF as many small ranges, so allow far more requests than elsewhere
+@method_decorator(ratelimit(key='ip', rate='1000/m', block=True), name='dispatch')
+class MagazinePdfAPIView(RateLimitHandlerMixin, APIView):
+    """
+    Streams a published magazine's PDF from storage. Supports single byte ranges
+    (206 Partial Content), If-Range, and ETag/Last-Modified conditional requests.
+    """
+    def get(self, request, pk):
+        magazine = get_object_or_404(Magazine, pk=pk, is_published=True)
+        if not magazine.pdf_file:
+            return Response({"detail": "PDF not found."}, status=status.HTTP_404_NOT_FOUND)
+        return delivery.serve(request, magazine.pdf_file.name, os.path.basename(magazine.pdf_file.name))
+
+
+@method_decorator(ratelimit(key='ip', rate='100/m', block=True), name='dispatch')
+class MagazineSearchAPIView(RateLimitHandlerMixin, APIView):
+    """
+    Full-text search over published issues: ?q=<terms>.
+    Hits are grouped per issue (best issue first); each page hit carries an
+    HTML snippet with the matches wrapped in <mark> and a link to the page image.
+    """
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"detail": "The q parameter is required."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(query) > 200:
+            return Response({"detail": "Search query is too long."}, status=status.HTTP_400_BAD_REQUEST)
+
+        hits = search.search(query)
+        magazines = Magazine.objects.filter(is_published=True).only('id', 'title', 'year', 'season').in_bulk(
+            {hit['magazine_id'] for hit in hits}
+        )
+
+        results = {}
+        for hit in hits:
+            magazine = magazines.get(hit['magazine_id'])
+            if magazine is None:
+                continue  # deleted or unpublished since the search ran
+            issue = results.setdefault(magazine.pk, {
+                'id': magazine.pk,
+                'title': magazine.title,
+                'year': magazine.year,
+                'season': magazine.season,
+                'pages': [],
+            })
+            issue['pages'].append({
+                'page': hit['page'],
+                'snippet': hit['snippet'],
+                'url': request.build_absolute_uri(reverse('magazine-page', args=[magazine.pk, hit['page']])),
+            })
+        return Response({'query': query, 'results': list(results.values())})
+
+
 @method_decorator(ratelimit(key='ip', rate='5/m', block=True), name='dispatch')
 class ContactMessageCreateAPIView(RateLimitHandlerMixin, generics.CreateAPIView):
     """
@@ -255,6 +473,8 @@ from .models import SeasonalSubmissionConfig
 from .serializers import SeasonalSubmissionConfigSerializer
 
 @api_view(['GET'])
+@snapshots.redirect_to_snapshot('seasonal/active')
+@condition(etag_func=conditional.active_season_etag, last_modified_func=conditional.active_season_last_modified)
 def active_season_api(request):
     """
     Get the active seasonal configuration
@@ -392,6 +612,8 @@ class ActiveBannerAPIView(APIView):
     """
     Simplified API endpoint to get only relevant banner display information
     """
+    @method_decorator(snapshots.redirect_to_snapshot('banner/active'))
+    @method_decorator(condition(etag_func=conditional.active_banner_etag))
     def get(self, request):
         try:
             active_banner = Banner.get_active_banner()
@@ -425,6 +647,7 @@ class ActiveBannerAPIView(APIView):
 from django.http import JsonResponse
 from django_countries import countries
 
+@condition(etag_func=conditional.countries_etag)
 def country_list(request):
     """
     API endpoint to return list of countries for dropdown